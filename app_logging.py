@@ -0,0 +1,258 @@
+import atexit # Write the queued messages before the program ends
+import collections # Ring buffer of the log console
+import logging # Levels & records
+import logging.handlers # Queue handler
+import os # Process id (forked worker processes log directly)
+import queue # Messages waiting for the sinks
+import re # Message tags like 'Info #7'
+import sys # Terminal output
+import threading # Dispatcher thread
+import time # Time stamps of the log file
+
+COLORS = {
+    "red": "\033[31m",          # red text
+    "green": "\033[32m",        # green text
+    "yellow": "\033[33m",       # yellow text
+    "blue": "\033[34m",         # blue text
+    "bg_red": "\033[41m",       # red background
+    "bg_yellow": "\033[43m",    # yellow background
+    "reset": "\033[0m"          # Reset to standard
+}
+LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+TAG_PATTERN = re.compile(r"^(Info|Warning|Error)\s*#\s*\d+")
+
+logger = logging.getLogger("genunit")
+logger.setLevel(logging.DEBUG)
+logger.propagate = False
+
+def message_level(msg, color):
+    ''' Returns the level of a message: by its tag ('Error #..', 'Warning #..', 'Info #..'), else by its color. '''
+    if msg.startswith("Error"):
+        return logging.ERROR
+    if msg.startswith("Warning"):
+        return logging.WARNING
+    if msg.startswith("Info"):
+        return logging.INFO
+    if color in ("bg_red", "red"):
+        return logging.ERROR
+    if color == "bg_yellow":
+        return logging.WARNING
+    return logging.INFO
+
+class RateLimiter:
+    '''
+    Limits repetitive messages: at most 'per_second' messages with the same tag (e.g. 'Info #7') per second.
+
+    Warnings & errors are never limited. Once per second the expired tags are removed and the number of
+    their suppressed messages is returned, so it is reported even if the tag does not appear again.
+    '''
+    def __init__(self, per_second=20):
+        self.per_second = per_second
+        self.windows = {} # Tag -> [start of the second, messages in it, suppressed messages]
+        self.last_expiry = 0.0
+
+    def check(self, record):
+        '''
+        Return:
+        - Tuple (bool, int, str): Whether the message is shown, the number of suppressed messages before it, its tag.
+        '''
+        if record.levelno >= logging.WARNING:
+            return True, 0, None
+        match = TAG_PATTERN.match(record.getMessage())
+        tag = match.group(0) if match else record.getMessage()
+        window = self.windows.get(tag)
+        if window is None or record.created - window[0] >= 1.0:
+            self.windows[tag] = [record.created, 1, 0]
+            return True, window[2] if window else 0, tag
+        if window[1] < self.per_second:
+            window[1] += 1
+            return True, 0, tag
+        window[2] += 1
+        return False, 0, tag
+
+    def expire(self, now, force=False):
+        '''
+        Removes the tags whose second has passed (at most once per second, unless 'force' is set).
+
+        Return:
+        - list: (tag, number of suppressed messages) of the removed tags that had suppressed messages.
+        '''
+        if not force and now - self.last_expiry < 1.0:
+            return []
+        self.last_expiry = now
+        reports = []
+        for tag, window in list(self.windows.items()):
+            if force or now - window[0] >= 1.0:
+                del self.windows[tag]
+                if window[2]:
+                    reports.append((tag, window[2]))
+        return reports
+
+class SinkHandler(logging.Handler):
+    ''' Base class of the log sinks: per-level filtering (handler level) and optional rate limiting. '''
+    def __init__(self, level=logging.INFO, rate_limit=None):
+        '''
+        Args:
+        - level (int): Lowest level written by the sink.
+        - rate_limit (int, optional): Maximum messages with the same tag per second (None = unlimited).
+        '''
+        super().__init__(level)
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def emit(self, record):
+        if self.rate_limiter:
+            self.report_suppressed(record.created)
+            allowed, suppressed, tag = self.rate_limiter.check(record)
+            if not allowed:
+                return
+            if suppressed:
+                self.write(logging.INFO, f"... {suppressed} more '{tag}' messages suppressed", "reset")
+        self.write(record.levelno, record.getMessage(), getattr(record, "color", "reset"))
+
+    def report_suppressed(self, now, force=False):
+        ''' Writes the number of suppressed messages of the expired tags. '''
+        if self.rate_limiter:
+            for tag, suppressed in self.rate_limiter.expire(now, force):
+                self.write(logging.INFO, f"... {suppressed} more '{tag}' messages suppressed", "reset")
+
+    def write(self, levelno, msg, color):
+        ''' Writes one message (implemented by the sinks). '''
+        raise NotImplementedError
+
+class TerminalSink(SinkHandler):
+    ''' Prints color-coded messages on the terminal. '''
+    def write(self, levelno, msg, color):
+        sys.stdout.write(f"{COLORS.get(color, COLORS['reset'])}{msg}{COLORS['reset']}\n") # One write, so lines of worker processes do not mix
+        sys.stdout.flush()
+
+class FileSink(SinkHandler):
+    ''' Appends the messages with time and level to a file (not rate limited by default). '''
+    def __init__(self, path, level=logging.DEBUG, rate_limit=None):
+        super().__init__(level, rate_limit)
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, levelno, msg, color):
+        self.file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {logging.getLevelName(levelno):<7} {msg}\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+class RingBufferSink(SinkHandler):
+    '''
+    Keeps the last 'capacity' messages for the log console of the GUI.
+
+    Every entry has a sequence number, so the console only renders the entries it has not shown yet.
+    '''
+    def __init__(self, capacity=5000, level=logging.DEBUG, rate_limit=20, on_emit=None):
+        '''
+        Args:
+        - capacity (int): Number of messages kept.
+        - on_emit (callable, optional): Called after a message was added (from the dispatcher thread).
+        '''
+        super().__init__(level, rate_limit)
+        self.entries = collections.deque(maxlen=capacity) # (sequence number, level, message)
+        self.sequence = 0
+        self.on_emit = on_emit
+
+    def write(self, levelno, msg, color):
+        self.sequence += 1
+        self.entries.append((self.sequence, levelno, msg))
+        if self.on_emit:
+            self.on_emit()
+
+    def since(self, sequence, level=logging.DEBUG):
+        ''' Returns the entries after a sequence number with at least the given level. '''
+        return [entry for entry in list(self.entries) if entry[0] > sequence and entry[1] >= level]
+
+# Dispatching
+state = {"pid": None, "queue": None, "thread": None, "sinks": []}
+state_lock = threading.Lock()
+
+def configure(terminal_level="INFO", log_file=None, file_level="DEBUG", rate_limit=20):
+    '''
+    Sets up the terminal sink and (optionally) the file sink; other sinks (e.g. the GUI console) are kept.
+
+    Args:
+    - terminal_level (str): Lowest level printed on the terminal ('DEBUG', 'INFO', 'WARNING', 'ERROR').
+    - log_file (str, optional): File receiving all messages from 'file_level' on.
+    - file_level (str): Lowest level written to the file.
+    - rate_limit (int, optional): Maximum terminal messages with the same tag per second (None = unlimited).
+    '''
+    with state_lock:
+        for sink in state["sinks"]:
+            if isinstance(sink, (TerminalSink, FileSink)):
+                sink.close()
+        sinks = [sink for sink in state["sinks"] if not isinstance(sink, (TerminalSink, FileSink))]
+        sinks.append(TerminalSink(LEVELS[terminal_level.upper()], rate_limit))
+        if log_file:
+            sinks.append(FileSink(log_file, LEVELS[file_level.upper()]))
+        state["sinks"] = sinks
+
+def add_sink(sink):
+    ''' Adds a sink (e.g. the ring buffer of the GUI console). '''
+    with state_lock:
+        state["sinks"] = state["sinks"] + [sink]
+
+def remove_sink(sink):
+    ''' Removes a sink. '''
+    with state_lock:
+        state["sinks"] = [other for other in state["sinks"] if other is not sink]
+
+def dispatch(record):
+    ''' Passes a record to every sink whose level it reaches. '''
+    for sink in state["sinks"]:
+        if record.levelno >= sink.level:
+            sink.handle(record)
+
+def dispatch_loop(messages):
+    ''' Dispatcher thread: writes the queued records (a record with a 'done' event marks a flush). '''
+    while True:
+        record = messages.get()
+        done = getattr(record, "done", None)
+        if done is not None:
+            for sink in state["sinks"]:
+                sink.report_suppressed(time.time(), force=True)
+            done.set()
+        else:
+            dispatch(record)
+
+def start():
+    ''' Starts the dispatcher thread of this process (the terminal sink is added if nothing was configured). '''
+    with state_lock:
+        if state["pid"] == os.getpid():
+            return
+        if not state["sinks"]:
+            state["sinks"] = [TerminalSink(logging.INFO, rate_limit=20)]
+        state["queue"] = queue.SimpleQueue()
+        logger.handlers = [logging.handlers.QueueHandler(state["queue"])]
+        state["thread"] = threading.Thread(target=dispatch_loop, args=(state["queue"],), name="log-dispatcher", daemon=True)
+        state["thread"].start()
+        first_start = state["pid"] is None
+        state["pid"] = os.getpid()
+    if first_start:
+        atexit.register(flush)
+
+def flush():
+    ''' Waits until all queued messages are written (e.g. before printing results to stdout). '''
+    if state["pid"] != os.getpid() or state["thread"] is None:
+        return
+    done = threading.Event()
+    state["queue"].put(logging.makeLogRecord({"done": done}))
+    done.wait(5)
+
+def log_message(msg, color="reset"):
+    '''
+    Logs a message without blocking: it is queued and written by the dispatcher thread.
+
+    Forked worker processes (e.g. 'ProcessPoolExecutor') write directly, because they may end without running 'atexit'.
+    '''
+    if state["pid"] is None:
+        start()
+    record = logger.makeRecord(logger.name, message_level(msg, color), "", 0, msg, None, None, extra={"color": color})
+    if state["pid"] != os.getpid():
+        dispatch(record)
+    else:
+        logger.handle(record)
@@ -0,0 +1,281 @@
+import argparse # Command line options
+import math # Nearest-rank percentile
+import json # Scenario configuration, results & baseline
+import os # File handling and folder operations
+import shutil # Remove the output of the previous scenario
+import subprocess # Run every scenario in its own process
+import sys # Python interpreter
+import tempfile # Synthetic repositories
+import threading # Resource sampler
+import time # Measure durations
+import psutil # Memory & thread count of the benchmark process
+from helpers import output_terminal # Print colored messages to the terminal
+
+# Simulated model latencies of the fake Ollama server
+LATENCY_PROFILES = {
+    "instant": {"time_to_first_token": 0.0, "tokens_per_second": 0.0},
+    "fast": {"time_to_first_token": 0.05, "tokens_per_second": 2000.0},
+    "slow": {"time_to_first_token": 0.5, "tokens_per_second": 100.0},
+}
+BENCHMARK_MODEL = "benchmark:latest"
+BENCHMARK_PROMPT = "Write unit tests for the following Python code using the 'unittest' framework."
+MODULES_PER_FOLDER = 100
+REGRESSION_METRICS = {"files_per_second": "higher", "latency_p95": "lower", "discovery_seconds": "lower", "save_seconds": "lower"}
+
+def create_synthetic_repository(root, file_count):
+    '''
+    Creates a repository with 'file_count' small Python modules (100 per package folder).
+
+    Return:
+    - str: Path of the repository.
+    '''
+    repository = os.path.join(root, f"repo_{file_count}")
+    if os.path.isdir(repository):
+        return repository
+
+    for index in range(file_count):
+        package = os.path.join(repository, f"package_{index // MODULES_PER_FOLDER:04d}")
+        os.makedirs(package, exist_ok=True)
+        with open(os.path.join(package, f"module_{index:05d}.py"), "w", encoding="utf-8") as module_file:
+            module_file.write(
+                f"def add_{index}(a, b):\n    '''Adds two numbers.'''\n    return a + b\n\n\n"
+                f"def is_even_{index}(number):\n    if number % 2 == 0:\n        return True\n    return False\n\n\n"
+                f"class Counter{index}:\n    def __init__(self):\n        self.count = 0\n\n"
+                f"    def increment(self, step=1):\n        self.count += step\n        return self.count\n"
+            )
+    return repository
+
+def percentile(values, share):
+    ''' Returns the percentile ('share' between 0 and 1) of a list of numbers (nearest rank). '''
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(share * len(ordered)) - 1))]
+
+class ResourceSampler:
+    ''' Samples the RSS and thread count of the current process in a background thread and keeps the peaks. '''
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_rss = 0
+        self.peak_threads = 0
+        self.running = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while self.running.is_set():
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+            self.peak_threads = max(self.peak_threads, self.process.num_threads())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.running.set()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.running.clear()
+        self.thread.join()
+
+def run_scenario(config):
+    '''
+    Runs one benchmark scenario inside the current process (called in the worker process).
+
+    This method:
+    - Runs discovery ('get_python_files') and 'generate_tests_for_folder' headless end to end.
+    - Measures the duration of every 'generate_test_for_file' call and of saving.
+    - Samples peak RSS and thread count during the run.
+
+    Args:
+    - config (dict): 'repository', 'concurrency' and the scenario labels.
+
+    Return:
+    - dict: The scenario labels with 'files', 'files_per_second', 'latency_p50/p95/p99',
+      'discovery_seconds', 'generation_seconds', 'save_seconds', 'peak_rss_mb', 'peak_threads' and 'errors'.
+    '''
+    from core import TestGenerator # Imported here so 'OLLAMA_HOST' of the worker process is used
+    from headless import HeadlessApp
+
+    class TimedTestGenerator(TestGenerator):
+        ''' TestGenerator that records the duration of every generation and of saving. '''
+        def __init__(self, gui):
+            super().__init__(gui)
+            self.latencies = []
+            self.save_seconds = 0.0
+
+        def generate_test_for_file(self, model_name, prompt_text, filename, cancel_event=None):
+            start = time.perf_counter()
+            result = super().generate_test_for_file(model_name, prompt_text, filename, cancel_event)
+            self.latencies.append(time.perf_counter() - start)
+            return result
+
+        def save_files(self, *args):
+            start = time.perf_counter()
+            result = super().save_files(*args)
+            self.save_seconds += time.perf_counter() - start
+            return result
+
+    repository = config["repository"]
+    app = HeadlessApp(repository, BENCHMARK_PROMPT, save_raw=True, create_log=True, quiet=True)
+    test_generator = TimedTestGenerator(app)
+    test_generator.max_workers = config["concurrency"]
+
+    with ResourceSampler() as sampler:
+        start = time.perf_counter()
+        py_files = test_generator.get_python_files(repository, None) or []
+        discovery_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        test_generator.generate_tests_for_folder(BENCHMARK_MODEL, len(py_files), py_files)
+        generation_seconds = time.perf_counter() - start
+
+    latencies = test_generator.latencies
+    return {
+        **{key: config[key] for key in ("files", "concurrency", "latency")},
+        "files_per_second": round(len(py_files) / generation_seconds, 3) if generation_seconds else None,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "discovery_seconds": round(discovery_seconds, 4),
+        "generation_seconds": round(generation_seconds, 4),
+        "save_seconds": round(test_generator.save_seconds, 4),
+        "peak_rss_mb": round(sampler.peak_rss / 2**20, 1),
+        "peak_threads": sampler.peak_threads,
+        "errors": test_generator.error,
+    }
+
+def run_scenario_process(config, server_url, timeout):
+    '''
+    Runs a scenario in a fresh Python process, so RSS and thread peaks are not shared between scenarios.
+
+    Return:
+    - dict: The scenario result (with 'error' if the process failed).
+    '''
+    with tempfile.TemporaryDirectory(prefix="genunit_bench_") as work_dir:
+        config_path = os.path.join(work_dir, "scenario.json")
+        result_path = os.path.join(work_dir, "result.json")
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump({**config, "result_path": result_path}, config_file)
+
+        try:
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", config_path],
+                env={**os.environ, "OLLAMA_HOST": server_url}, stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE, text=True, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return {**config, "error": f"timeout after {timeout}s"}
+
+        if not os.path.exists(result_path):
+            stderr_tail = (process.stderr or "").strip().splitlines()[-1:]
+            return {**config, "error": stderr_tail[0] if stderr_tail else f"exit code {process.returncode}"}
+        with open(result_path, "r", encoding="utf-8") as result_file:
+            return json.load(result_file)
+
+def estimated_seconds(file_count, concurrency, profile, tokens_per_response=600):
+    ''' Rough lower bound of the model time of a scenario, used to skip scenarios over the time budget. '''
+    per_file = profile["time_to_first_token"] + (tokens_per_response / profile["tokens_per_second"] if profile["tokens_per_second"] else 0.0)
+    return file_count * per_file / concurrency
+
+def compare_with_baseline(results, baseline, tolerance):
+    '''
+    Compares scenario results with a stored baseline.
+
+    Return:
+    - list: Messages of all metrics that are worse than the baseline by more than 'tolerance' (share).
+    '''
+    baseline_by_key = {(entry["files"], entry["concurrency"], entry["latency"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        reference = baseline_by_key.get((result["files"], result["concurrency"], result["latency"]))
+        if not reference or "error" in result or "error" in reference or result.get("skipped") or reference.get("skipped"):
+            continue
+        for metric, direction in REGRESSION_METRICS.items():
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (direction == "higher" and change < -tolerance) or (direction == "lower" and change > tolerance):
+                regressions.append(f"{result['files']} files, concurrency {result['concurrency']}, {result['latency']}: {metric} {old} -> {new} ({change * 100:+.1f}%)")
+    return regressions
+
+def main():
+    '''
+    Runs the benchmark sweep and writes the JSON report.
+
+    This method:
+    - Starts the fake Ollama server once per latency profile.
+    - Creates the synthetic repositories and runs every (size, concurrency, latency) scenario.
+    - Skips scenarios whose estimated model time exceeds the time budget.
+    - Optionally stores the results as baseline ('--save-baseline') or compares them with a baseline ('--baseline', opt-in).
+    '''
+    parser = argparse.ArgumentParser(description="End-to-end throughput benchmark of TestGenerator against the fake Ollama server.")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated numbers of synthetic modules")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated numbers of parallel model requests")
+    parser.add_argument("--latencies", default="instant,fast", help=f"Comma-separated latency profiles ({', '.join(LATENCY_PROFILES)})")
+    parser.add_argument("--recordings", default="Testcodes", help="Recorded responses for the fake server")
+    parser.add_argument("--max-seconds", type=float, default=600, help="Skip scenarios with a longer estimated model time")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON report")
+    parser.add_argument("--baseline", default=None, help="Compare the results with this baseline file (fails on regressions)")
+    parser.add_argument("--save-baseline", nargs="?", const=os.path.join("benchmarks", "baseline.json"), default=None, help="Store the results as new baseline (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed deterioration against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    from fake_ollama import FakeOllamaServer, load_recordings
+    recordings = load_recordings(args.recordings)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="genunit_repos_") as repositories_root:
+        for latency in args.latencies.split(","):
+            profile = LATENCY_PROFILES[latency]
+            with FakeOllamaServer(recordings, models=[BENCHMARK_MODEL], **profile) as server:
+                for size in sizes:
+                    for concurrency in concurrency_levels:
+                        config = {"files": size, "concurrency": concurrency, "latency": latency}
+                        estimate = estimated_seconds(size, concurrency, profile)
+                        if estimate > args.max_seconds:
+                            output_terminal(f"Info #110: Skipping {config} (estimated {estimate:.0f}s)", "yellow")
+                            results.append({**config, "skipped": True})
+                            continue
+
+                        repository = create_synthetic_repository(repositories_root, size)
+                        # Remove the output of the previous scenario so every run writes all files again
+                        shutil.rmtree(os.path.join(repository, "Tests"), ignore_errors=True)
+                        output_terminal(f"Info #111: Running {config}...", "yellow")
+                        result = run_scenario_process({**config, "repository": repository}, server.url, timeout=max(60, estimate * 10))
+                        results.append(result)
+                        output_terminal(f"Info #112: {json.dumps(result)}", "blue")
+
+    report = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "python": sys.version.split()[0], "cpu_count": os.cpu_count(), "results": results}
+    with open(args.output, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    output_terminal(f"Info #113: Benchmark report saved: {args.output}", "yellow")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or ".", exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        output_terminal(f"Info #114: Baseline saved: {args.save_baseline}", "yellow")
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            output_terminal(f"Error #110: Baseline not found: {args.baseline} (create it with --save-baseline)", "bg_red")
+            raise SystemExit(1)
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_with_baseline(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            output_terminal(f"Warning #110: Regression: {regression}", "bg_yellow")
+        if regressions:
+            raise SystemExit(1)
+        output_terminal("Info #115: No regressions against the baseline.", "green")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        with open(sys.argv[2], "r", encoding="utf-8") as scenario_file:
+            scenario = json.load(scenario_file)
+        scenario_result = run_scenario(scenario)
+        with open(scenario["result_path"], "w", encoding="utf-8") as scenario_result_file:
+            json.dump(scenario_result, scenario_result_file)
+    else:
+        main()
@@ -0,0 +1,176 @@
+import collections # Queue of recordings per request
+import gzip # Compact cassette files
+import hashlib # Key of a request
+import json # One interaction per line
+import threading # Several generations record at the same time
+import time # Chunk timings
+import ollama # Communicate with the AI model
+
+def request_key(model, messages):
+    ''' Returns the key of a chat request (hash of model and messages). '''
+    request = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+class CassetteMissError(LookupError):
+    ''' Raised when a replayed request was not recorded. '''
+
+class CassetteReplayError(RuntimeError):
+    ''' Raised when a replayed request failed while it was recorded. '''
+
+class CassetteRecorder:
+    '''
+    Records every 'chat()' request and its response stream with chunk timings.
+
+    Used in place of the 'ollama' module ('TestGenerator.model_client'); requests are
+    forwarded to the wrapped client. Every interaction is written as one JSON line
+    to a gzip-compressed cassette file ('.jsonl.gz') as soon as its stream ends, each line
+    as a complete gzip member, so an interrupted run keeps all finished interactions:
+    {"key", "model", "messages", "stream", "chunks": [[milliseconds since previous chunk, content], ...], "error"}
+    '''
+    def __init__(self, path, client=ollama):
+        '''
+        Initializes the CassetteRecorder class (interactions are appended to the cassette file).
+
+        Args:
+        - path (str): Cassette file ('.jsonl.gz').
+        - client (module/object, optional): Client with a 'chat()' function (default: the 'ollama' module).
+        '''
+        self.path = path
+        self.client = client
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        ''' Forwards the request to the client and records the response. '''
+        start = time.perf_counter()
+        try:
+            response = self.client.chat(model=model, messages=messages, stream=stream, **kwargs)
+        except Exception as e:
+            self.write(model, messages, stream, [], str(e))
+            raise
+        if stream:
+            return self.record_stream(model, messages, response, start)
+
+        content = response["message"]["content"]
+        self.write(model, messages, False, [[round((time.perf_counter() - start) * 1000, 2), content]], None)
+        return response
+
+    def record_stream(self, model, messages, response, start):
+        '''
+        Yields the chunks of a streamed response and records them with their timings.
+
+        Closing the returned stream (e.g. when a run is cancelled) also closes the stream of the client,
+        so the model stops generating.
+        '''
+        chunks = []
+        last = start
+        error = "Stream was not read to the end."
+        try:
+            for chunk in response:
+                now = time.perf_counter()
+                content = chunk["message"]["content"] if "message" in chunk and "content" in chunk["message"] else ""
+                chunks.append([round((now - last) * 1000, 2), content])
+                last = now
+                yield chunk
+            error = None
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            close = getattr(response, "close", None)
+            if close:
+                close()
+            self.write(model, messages, True, chunks, error)
+
+    def write(self, model, messages, stream, chunks, error):
+        ''' Appends one interaction to the cassette file. '''
+        line = json.dumps({
+            "key": request_key(model, messages),
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "chunks": chunks,
+            "error": error,
+        }, ensure_ascii=False, separators=(",", ":"))
+        with self.lock:
+            with gzip.open(self.path, "at", encoding="utf-8") as cassette_file: # One complete gzip member per interaction
+                cassette_file.write(line + "\n")
+            self.count += 1
+
+class CassettePlayer:
+    '''
+    Replays recorded chat interactions instead of calling the AI model.
+
+    Used in place of the 'ollama' module ('TestGenerator.model_client'). A request is
+    answered with the recording of the same model and messages; identical requests
+    are answered in recording order (the last recording is reused afterwards).
+    The chunks are returned with byte-identical content, either immediately or with
+    the recorded timings ('realtime'); a recorded error is raised again at the same point.
+    '''
+    def __init__(self, paths, realtime=False, speed=1.0):
+        '''
+        Loads one or more cassette files.
+
+        Args:
+        - paths (str/list): Cassette file(s) written by 'CassetteRecorder'.
+        - realtime (bool): Replays the recorded chunk timings.
+        - speed (float): Speed factor for 'realtime' (2.0 = twice as fast).
+        '''
+        self.realtime = realtime
+        self.speed = speed
+        self.recordings = collections.defaultdict(collections.deque)
+        self.lock = threading.Lock()
+
+        for path in [paths] if isinstance(paths, str) else paths:
+            for line in self.read_lines(path):
+                if line.strip():
+                    recording = json.loads(line)
+                    self.recordings[recording["key"]].append(recording)
+
+    @staticmethod
+    def read_lines(path):
+        ''' Returns the complete lines of a cassette file; a tail truncated by an interrupted recording is skipped. '''
+        lines = []
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+                for line in cassette_file:
+                    lines.append(line)
+        except (EOFError, gzip.BadGzipFile):
+            if lines and not lines[-1].endswith("\n"):
+                lines.pop()
+        return lines
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.recordings.values())
+
+    def next_recording(self, model, messages):
+        ''' Returns the next recording of a request or raises 'CassetteMissError'. '''
+        with self.lock:
+            queue = self.recordings.get(request_key(model, messages))
+            if not queue:
+                raise CassetteMissError(f"No recorded response for model '{model}' and this prompt.")
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        ''' Returns the recorded response (an iterator of chunks if 'stream' is set). '''
+        recording = self.next_recording(model, messages)
+        if stream:
+            if recording["error"] and not recording["chunks"]:
+                raise CassetteReplayError(recording["error"]) # Request failed before streaming
+            return self.replay_stream(model, recording)
+
+        if recording["error"]:
+            raise CassetteReplayError(recording["error"])
+        if self.realtime:
+            time.sleep(sum(delay for delay, _ in recording["chunks"]) / 1000 / self.speed)
+        return {"model": model, "message": {"role": "assistant", "content": "".join(content for _, content in recording["chunks"])}, "done": True}
+
+    def replay_stream(self, model, recording):
+        ''' Yields the recorded chunks in the format of the 'ollama' client. '''
+        chunks = recording["chunks"]
+        for index, (delay, content) in enumerate(chunks):
+            if self.realtime:
+                time.sleep(delay / 1000 / self.speed)
+            yield {"model": model, "message": {"role": "assistant", "content": content}, "done": not recording["error"] and index == len(chunks) - 1}
+        if recording["error"]:
+            raise CassetteReplayError(recording["error"])
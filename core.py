@@ -1,8 +1,16 @@
 import customtkinter as ctk # GUI framework (needed for accessing UI elements)
+import collections # Count the skip reasons
 import concurrent.futures # For parallel processing of test generation
 import ollama # Communicate with the AI model
 import os # File handling and folder operations
-from helpers import output_terminal # Print colored messages to the terminal
+import subprocess # Errors of the local 'git'
+import threading # Count the files found by parallel folder scans
+import time # Duration of the file discovery & of the spans
+from helpers import output_terminal, extract_python_code # Print colored messages & extract code from AI responses
+from source_selection import SourceSelector # Decide which files are sent to the model
+from git_changes import changed_python_lines, changed_functions # Files & functions changed in a git revision range
+from merge_tests import function_changes, merge_test_module, load_snapshot, save_snapshot # Function-level diff & merge of test modules
+from tracing import Tracer, RunProfiler, NO_SPAN # Spans of the pipeline stages & opt-in profiling
 from datetime import datetime # For timestamps in logs
 
 class TestGenerator:
@@ -26,6 +34,25 @@ class TestGenerator:
         self.gui = gui
 
         self.error = False
+        self.max_workers = None # Parallel model requests (None = default of 'ThreadPoolExecutor')
+        self.discovery_workers = None # Parallel folder scans in 'get_python_files()' (None = sequential)
+        self.discovery_time = 0.0 # Seconds spent in the last 'get_python_files()'
+        self.source_selector = SourceSelector() # Rules which files are sent to the model
+        self.skipped = [] # (path, reason) of the files & folders skipped by the last 'get_python_files()'
+        self.scanned_folders = {} # Folder -> (relative path, '.gitignore' rules) of the last 'get_python_files()'
+        self.focus_functions = {} # File -> functions the tests should cover in the current run (empty = whole file)
+        self.next_focus_functions = {} # 'focus_functions' of the next run (set by 'filter_changed_files()')
+        self.incremental = False # Only generate tests for changed functions & merge them into the existing test files
+        self.function_changes = {} # File -> added, changed & removed functions (incremental mode)
+        self.keep_alive = None # How long the model stays loaded after a request (None = Ollama default)
+        self.model_client = ollama # Object with a 'chat()' function ('ollama' module, cassette recorder/player)
+        self.stream_preview = None # 'StreamPreview' receiving the streamed output (live preview, None = off)
+        self.file_cancel_events = {} # File -> event to cancel its generation early (current run)
+        self.file_status = None # 'FileStatusTracker' receiving the state of every file (status table, None = off)
+        self.throughput = None # 'ThroughputEstimator' receiving the streamed tokens (ETA, None = off)
+        self.timeline = None # 'RunTimeline' receiving the stage of every file per worker (timeline view, None = off)
+        self.tracer = Tracer() if os.environ.get("GENUNIT_TRACE") == "1" else None # Spans of the pipeline stages (None = off)
+        self.profile_mode = os.environ.get("GENUNIT_PROFILE") or None # 'cprofile' or 'tracemalloc' around every run (None = off)
 
     # Test generation
     def generate_tests_for_folder(self, model_name, total_files, py_files):
@@ -43,6 +70,10 @@ class TestGenerator:
         - total_files (int): Total number of Python files.
         - py_files (list): List of Python files to be processed.
         '''
+        # Function filters only apply to the run they were prepared for
+        self.focus_functions, self.next_focus_functions = self.next_focus_functions, {}
+        self.function_changes = {}
+
         # Create the 'Tests' folder
         prompt_text = self.gui.tb_chosen_prompt_file.get("1.0", ctk.END).strip()
         tests_folder = os.path.join(self.gui.folder_path, "Tests")
@@ -52,6 +83,14 @@ class TestGenerator:
             output_terminal("Warning #2-No Python files found in the selected folder.", "bg_yellow")
             return
 
+        # Incremental mode: only files with changed functions
+        if self.incremental:
+            py_files = self.plan_incremental(py_files, model_name, tests_folder)
+            total_files = len(py_files)
+            if not py_files:
+                output_terminal("Info #160: All tests are up to date.", "blue")
+                return
+
         # If log storage is activated
         formatted_model_name = self.format_model_name(model_name)
         log_file_path = os.path.join(tests_folder, f"unit_test_log_file-{formatted_model_name}.log") if self.gui.checkbox_create_log.get() else None
@@ -65,11 +104,26 @@ class TestGenerator:
             log_file.write(f"Date: {start_time.strftime('%Y-%m-%d')}\n")
             log_file.write(f"Start Time: {start_time.strftime('%H:%M:%S')}\n")
             log_file.write(f"Folder: {self.gui.folder_path}\n\n")
+            for skipped_path, reason in self.skipped:
+                log_file.write(f"- Skipped: {skipped_path} ({reason})\n")
+
+        # Opt-in profiling of the whole run (every worker call is profiled in its thread)
+        profiler = RunProfiler(self.profile_mode) if self.profile_mode else None
+        if profiler:
+            profiler.start()
+        worker = profiler.wrap(self.generate_test_for_file) if profiler else self.generate_test_for_file
 
         # Parallelization of the test generation
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.file_cancel_events = {file: threading.Event() for file in py_files}
+            if self.file_status:
+                self.file_status.reset(py_files)
+            if self.throughput:
+                self.throughput.start(model_name, py_files)
+            if self.timeline:
+                self.timeline.reset(py_files)
             futures = {
-                executor.submit(self.generate_test_for_file, model_name, prompt_text, file): file
+                executor.submit(worker, model_name, self.prompt_for_file(prompt_text, file), file, self.file_cancel_events[file]): file
                 for file in py_files
             }
             completed = 0
@@ -79,22 +133,49 @@ class TestGenerator:
                 try:
                     test_code, generated_output, code_text = future.result()
 
+                    if test_code is None and self.file_cancel_events[filename].is_set():
+                        self.report_status(filename, "cancelled")
+                        # Cancelled by the user (e.g. in the live preview): no error, the file counts as processed
+                        completed += 1
+                        if log_file:
+                            self.write_log(log_file, f"- Cancelled: {filename}\n")
+                        self.gui.update_progress_bar(completed, total_files)
+                        continue
+
                     if test_code is None:
                         output_terminal(f"Error #5: Failed to generate test for {filename}", "bg_red")
+                        self.report_status(filename, "failed")
                         self.error = True
                         continue
 
                     # Save test file
-                    test_filename = self.save_files(filename, model_name, tests_folder, prompt_text, code_text, generated_output)
-
-                    with open(test_filename, "w", encoding="utf-8") as test_file:
-                        test_file.write(test_code)
+                    if self.timeline:
+                        self.timeline.start_stage(filename, "saving")
+                    with self.span("save_raw", filename): # Prompt & raw response (.md)
+                        test_filename = self.save_files(filename, model_name, tests_folder, self.prompt_for_file(prompt_text, filename), code_text, generated_output)
+
+                    if filename in self.function_changes:
+                        if self.timeline:
+                            self.timeline.start_stage(filename, "validation")
+                        test_code = self.merge_tests(filename, test_filename, test_code)
+                        if self.timeline:
+                            self.timeline.start_stage(filename, "saving")
+                        if test_code is None:
+                            self.report_status(filename, "failed")
+                            self.error = True
+                            continue
+
+                    with self.span("save", filename):
+                        with open(test_filename, "w", encoding="utf-8") as test_file:
+                            test_file.write(test_code)
+                        save_snapshot(tests_folder, filename, code_text) # The tests are up to date with this source (also for full runs)
 
                     # If Log is active, write the entry
                     if log_file:
-                        log_file.write(f"✔ Completed: {filename} at {datetime.now().strftime('%H:%M:%S')}\n")
+                        self.write_log(log_file, f"✔ Completed: {filename} at {datetime.now().strftime('%H:%M:%S')}\n")
 
                     completed += 1
+                    self.report_status(filename, "done")
                     output_terminal(f"Info #7: Test generated for {filename} ({completed}/{total_files})", "yellow")
                     self.gui.set_status_label(f"Generated Tests for ({completed}/{total_files}).")
                     
@@ -102,8 +183,26 @@ class TestGenerator:
 
                 except Exception as e:
                     output_terminal(f"Error #6: Failed to generate test for {filename}: {e}", "bg_red")
+                    self.report_status(filename, "failed")
                     if log_file:
-                        log_file.write(f"ERROR: generating test for {filename} - {e}\n")
+                        self.write_log(log_file, f"ERROR: generating test for {filename} - {e}\n")
+                finally:
+                    if self.timeline:
+                        self.timeline.end_stage(filename) # Ends 'saving' / 'validation' (the worker ended its own stage)
+
+        if self.throughput:
+            self.throughput.save() # Starting values of the next run with this model
+        if self.timeline:
+            self.timeline.finish()
+            if log_file_path:
+                timeline_path = os.path.join(tests_folder, f"unit_test_timeline-{formatted_model_name}.json")
+                self.timeline.save(timeline_path)
+                output_terminal(f"Info #186: Timeline saved (open in chrome://tracing or ui.perfetto.dev): {timeline_path}", "yellow")
+        if profiler:
+            profile_files = profiler.stop(os.path.join(tests_folder, f"unit_test_{profiler.mode}-{formatted_model_name}"))
+            output_terminal(f"Info #192: Profile saved: {', '.join(profile_files)}", "yellow")
+        if self.tracer:
+            self.report_spans(os.path.join(tests_folder, f"unit_test_spans-{formatted_model_name}.json"))
 
         # If log is active, close it
         if log_file:
@@ -115,7 +214,99 @@ class TestGenerator:
             log_file.close()
             output_terminal(f"Info #51: Log file saved: {log_file_path}", "yellow")
 
-    def generate_test_for_file(self, model_name, prompt_text, filename):
+    # Incremental generation
+    def plan_incremental(self, py_files, model_name, tests_folder):
+        '''
+        Finds the files whose functions changed since their tests were generated.
+
+        This method:
+        - Compares the AST of every file with the snapshot of the last generation
+          (or the code in the '.md' file of the last generation).
+        - Files without a test file are generated completely.
+        - Files with added or changed functions are generated for these functions only ('focus_functions');
+          the result is merged into the existing test file by 'merge_tests()'.
+        - Tests of removed functions are removed right away, without a model call.
+        - Files without a known earlier version get a snapshot, so the next run can compare.
+
+        Args:
+        - py_files (list): Python files found by 'get_python_files()'.
+        - model_name (str): The AI model used.
+        - tests_folder (str): Directory where the test files are stored.
+
+        Return:
+        - list: Files to generate tests for.
+        '''
+        planned = []
+        for file in py_files:
+            test_filename = self.test_file_path(file, model_name, tests_folder)
+            if not os.path.exists(test_filename):
+                planned.append(file)
+                continue
+
+            with open(file, "r", encoding="utf-8") as source_file:
+                code_text = source_file.read()
+            old_code = load_snapshot(tests_folder, file, os.path.splitext(test_filename)[0] + ".md")
+            if old_code is None:
+                save_snapshot(tests_folder, file, code_text)
+                self.skipped.append((file, "no earlier version known, snapshot saved"))
+                continue
+
+            changes = function_changes(old_code, code_text)
+            if changes is None:
+                self.skipped.append((file, "cannot be parsed"))
+                continue
+            if not (changes["added"] or changes["changed"] or changes["removed"]):
+                self.skipped.append((file, "no changed functions"))
+                continue
+
+            self.function_changes[file] = changes
+            if changes["added"] or changes["changed"]:
+                self.focus_functions[file] = changes["added"] + changes["changed"]
+                planned.append(file)
+            else:
+                merged = self.merge_tests(file, test_filename, "")
+                if merged is not None:
+                    with open(test_filename, "w", encoding="utf-8") as test_file:
+                        test_file.write(merged)
+                    save_snapshot(tests_folder, file, code_text)
+
+        output_terminal(f"Info #161: {len(planned)} of {len(py_files)} files have new or changed functions.", "yellow")
+        return planned
+
+    def merge_tests(self, filename, test_filename, test_code):
+        '''
+        Merges the tests generated for the changed functions into the existing test file.
+
+        Return:
+        - str: The merged test module (None if the tests could not be merged; the existing file is kept).
+        '''
+        changes = self.function_changes[filename]
+        try:
+            with open(test_filename, "r", encoding="utf-8") as test_file:
+                existing_code = test_file.read()
+            merged, stats = merge_test_module(existing_code, test_code, changes["added"] + changes["changed"], changes["removed"])
+        except (OSError, SyntaxError, ValueError) as e:
+            output_terminal(f"Error #160: Could not merge the tests for {filename}, kept {test_filename}: {e}", "bg_red")
+            return None
+
+        output_terminal(f"Info #162: Merged tests for {filename}: {stats['replaced']} replaced, {stats['removed']} removed, {stats['added']} added", "yellow")
+        if stats["kept"]:
+            output_terminal(f"Warning #160-Kept {len(stats['kept'])} existing tests of changed functions in {test_filename}, please review: {', '.join(stats['kept'])}", "bg_yellow")
+        return merged
+
+    def prompt_for_file(self, prompt_text, filename):
+        '''
+        Returns the prompt for a single file.
+
+        If 'focus_functions' names functions for the file (e.g. the functions changed in a
+        git revision range), the model is asked to write tests only for them.
+        '''
+        functions = self.focus_functions.get(filename)
+        if not functions:
+            return prompt_text
+        return f"{prompt_text}\n\nOnly write tests for the following functions of this file: {', '.join(functions)}"
+
+    def generate_test_for_file(self, model_name, prompt_text, filename, cancel_event=None):
         '''
         Generates a unit test for a single Python file using the AI model.
 
@@ -128,94 +319,331 @@ class TestGenerator:
         - model_name (str): The AI model used.
         - prompt_text (str): User-defined prompt.
         - filename (str): The Python file to be processed.
+        - cancel_event (threading.Event, optional): Stops the streaming when set (the result is then None).
 
         Return:
         - Tuple (str, str, str): Generated test code, raw AI response, original code.
         '''
+        timeline = self.timeline
+        tracer = self.tracer
+        if timeline:
+            timeline.start_stage(filename, "prompt_eval") # Ends the queue wait, the request is sent with the first iteration
         try:
             # Read in file content
-            with open(filename, 'r', encoding='utf-8') as file:
-                code_text = file.read()
+            with self.span("file_read", filename):
+                with open(filename, 'r', encoding='utf-8') as file:
+                    code_text = file.read()
 
             # Prepare prompt and code for the model
-            full_prompt = f"{prompt_text}\n\n{code_text}\n"
+            with self.span("prompt_build", filename):
+                full_prompt = f"{prompt_text}\n\n{code_text}\n"
             output_terminal(f"Info #6: Generating test for {filename}...", "yellow")
 
             # Streamed output retrieved from the AI model
+            self.report_status(filename, "streaming")
             try:
-                stream = ollama.chat(
-                    model=model_name,
-                    messages=[{'role': 'user', 'content': full_prompt}],
-                    stream=True,
-                )
+                with self.span("request_submit", filename):
+                    stream = self.model_client.chat(
+                        model=model_name,
+                        messages=[{'role': 'user', 'content': full_prompt}],
+                        stream=True,
+                        keep_alive=self.keep_alive,
+                    )
             except Exception as e:
                 output_terminal(f"Error #4: AI model failed to generate test for {filename}: {e}", "bg_red")
                 return None, None, None
+            request_sent = time.perf_counter()
 
             generated_output = ""
-            for chunk in stream:
-                if 'message' in chunk and 'content' in chunk['message']:
-                    generated_output += chunk['message']['content']
-
-            # Extract Python code from the AI response
-            python_code_lines = []
-            in_code_block = False
-
-            for line in generated_output.splitlines():
-                if line.strip() == "```python":
-                    in_code_block = True
-                    continue
-                elif line.strip() == "```" and in_code_block:
-                    in_code_block = False
-                    continue
-                if in_code_block:
-                    python_code_lines.append(line)
-
-            # Return generated test code
-            return "\n".join(python_code_lines), generated_output, code_text
+            preview = self.stream_preview
+            status = self.file_status
+            throughput = self.throughput
+            first_token = True
+            if preview:
+                preview.start(filename)
+            try:
+                for chunk in stream:
+                    if first_token:
+                        first_token = False
+                        first_token_at = time.perf_counter()
+                        if timeline:
+                            timeline.start_stage(filename, "streaming")
+                        if tracer:
+                            tracer.add("first_token", request_sent, first_token_at, filename)
+                    if cancel_event is not None and cancel_event.is_set():
+                        if hasattr(stream, "close"):
+                            stream.close() # Closes the connection, so the model stops generating
+                        output_terminal(f"Info #155: Generation cancelled for {filename}", "yellow")
+                        return None, None, None # The final state is reported by the caller
+                    if 'message' in chunk and 'content' in chunk['message']:
+                        generated_output += chunk['message']['content']
+                        if preview:
+                            preview.append(filename, chunk['message']['content'])
+                        if status:
+                            status.add_tokens(filename)
+                        if throughput:
+                            throughput.add_tokens(filename)
+            finally:
+                if preview:
+                    preview.finish(filename)
+            if tracer and not first_token:
+                tracer.add("streaming", first_token_at, time.perf_counter(), filename)
+
+            # Extract Python code from the AI response and return generated test code
+            self.report_status(filename, "validating")
+            if timeline:
+                timeline.start_stage(filename, "extraction")
+            with self.span("extraction", filename):
+                test_code = extract_python_code(generated_output)
+            return test_code, generated_output, code_text
 
         except Exception as e:
             output_terminal(f"Error #4: Failed to generate test for {filename}: {e}", "bg_red")
             self.error = True
             return None, None, None # Error
+        finally:
+            if timeline:
+                timeline.end_stage(filename) # The lane of the worker is free from here on
+
+    # Tracing
+    def span(self, name, filename=None):
+        ''' Returns a context manager recording a span of 'tracer' (a shared no-op if tracing is off). '''
+        return self.tracer.span(name, filename) if self.tracer else NO_SPAN
+
+    def write_log(self, log_file, text):
+        ''' Writes an entry to the log file of the run (as 'log_write' span). '''
+        with self.span("log_write"):
+            log_file.write(text)
+
+    def report_spans(self, spans_path):
+        '''
+        Prints where the time of the run went and saves the spans (tracing only).
+
+        This method:
+        - Prints count, total, mean & maximum of every span
+        - Prints the time outside the model (all spans except 'first_token' & 'streaming', summed over the threads)
+        - Saves the spans as Chrome trace-event JSON with the summary and starts a new recording
+        '''
+        summary = self.tracer.summary()
+        for name, values in summary["spans"].items():
+            output_terminal(f"Info #190: Span {name}: {values['count']}x, total {values['total']:.3f}s, mean {values['mean']:.2f}ms, max {values['max']:.2f}ms", "blue")
+        output_terminal(f"Info #191: Non-model time {summary['non_model']:.3f}s (summed over all threads) in a run of {summary['wall']:.3f}s", "blue")
+        self.tracer.save(spans_path)
+        output_terminal(f"Info #193: Spans saved: {spans_path}", "blue")
+        self.tracer.reset()
+
+    def report_status(self, filename, state):
+        '''
+        Passes the state of a file to 'file_status' and its end to 'throughput' (if set).
+
+        The final states ('done', 'failed', 'cancelled') are only reported by the loop collecting the results,
+        once per file; the timeline stages are ended by the thread that started them.
+        '''
+        if self.file_status:
+            self.file_status.set_state(filename, state)
+        if state in ("done", "failed", "cancelled") and self.throughput:
+            self.throughput.finish(filename, state)
+
+    def cancel_file(self, filename):
+        '''
+        Cancels the generation of a single file of the current run (e.g. a model rambling on).
+
+        Return:
+        - bool: True if the file belongs to the current run.
+        '''
+        cancel_event = self.file_cancel_events.get(filename)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
 
     # File management
-    def get_python_files(self, folder_path, excluded_folder_path):
+    def get_python_files(self, folder_path, excluded_folder_path, progress=None, cancel_event=None):
         '''
-        Monitors the test generation process and resets the user interface after completion.
+        Collects the Python files below the selected folder that tests should be generated for.
 
         This method:
-        - Checks whether the generation thread is still running.
-        - If completed:
-            - Updates the user interface labels.
-            - Resets the progress bar.
-            - Activates the UI elements again.
+        - Walks the folder with 'os.scandir()' and never descends into skipped folders
+          (excluded folder, 'Tests' output folder, virtual environments, '.gitignore', ...).
+        - Applies the rules of 'source_selector' to every file and keeps the reason of every skip in 'skipped'.
+        - Scans the subfolders in parallel if 'discovery_workers' is set.
+        - Prints a single summary with the number of files, the skip reasons and the discovery time.
+        - Reports the number of files found so far to 'progress' and stops early if 'cancel_event' is set.
+
+        Args:
+        - folder_path (str): The selected folder.
+        - excluded_folder_path (str): Subfolder to skip (or None).
+        - progress (callable, optional): Called with the number of Python files found so far (from the scanning threads).
+        - cancel_event (threading.Event, optional): Set to cancel the discovery.
+
+        Return:
+        - list: Sorted paths of the Python files (None if no file was found or the discovery was cancelled).
         '''
-        py_files = []
-        for dirpath, _, files in os.walk(folder_path):
-            output_terminal(f"Info #54: Checking folder: {dirpath}", "blue")
+        start_time = time.perf_counter()
+        root = folder_path
+        excluded = os.path.normcase(os.path.abspath(excluded_folder_path)) if excluded_folder_path else None
+        py_files, skipped = [], []
+        self.scanned_folders = {}
+        found = [0]
+        found_lock = threading.Lock()
+
+        def report(count):
+            ''' Adds the files found in a folder to the total and reports it. '''
+            with found_lock:
+                found[0] += count
+                total = found[0]
+            progress(total)
+
+        scan = lambda subfolder, recursive=True: self.scan_folder(subfolder, excluded, recursive, report if progress else None, cancel_event)
+
+        if excluded == os.path.normcase(os.path.abspath(root)):
+            skipped.append((root, "excluded folder"))
+        elif self.discovery_workers and self.discovery_workers > 1:
+            # Expand the tree breadth-first until there are enough subtrees for all workers
+            subfolders = [(root, "", ())]
+            while subfolders and len(subfolders) < self.discovery_workers * 4:
+                next_subfolders = []
+                for subfolder in subfolders:
+                    files, children, skips = scan(subfolder, recursive=False)
+                    py_files.extend(files)
+                    next_subfolders.extend(children)
+                    skipped.extend(skips)
+                subfolders = next_subfolders
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+                for files, _, skips in executor.map(scan, subfolders):
+                    py_files.extend(files)
+                    skipped.extend(skips)
+        else:
+            py_files, _, skipped = scan((root, "", ()))
 
-            # Skip excluded folders
-            if excluded_folder_path and os.path.commonpath([excluded_folder_path, dirpath]) == excluded_folder_path:
-                output_terminal(f"Info #56: Skipping excluded folder: {dirpath}", "red")
-                continue
+        if cancel_event and cancel_event.is_set():
+            output_terminal(f"Info #180: File discovery cancelled after {len(py_files)} Python files.", "yellow")
+            return None
 
-            # Add all .py files to the list
-            for file in files:
-                if file.endswith(".py"):
-                    file_path = os.path.join(dirpath, file)
-                    output_terminal(f"Info #50: Found Python file: {file_path}", "yellow")
-                    py_files.append(file_path)
+        # Content rules (size, empty '__init__.py', generated code, complexity)
+        if self.discovery_workers and self.discovery_workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+                reasons = list(executor.map(self.source_selector.skip_content, py_files))
+        else:
+            reasons = [self.source_selector.skip_content(file) for file in py_files]
+        if cancel_event and cancel_event.is_set():
+            output_terminal(f"Info #180: File discovery cancelled after {len(py_files)} Python files.", "yellow")
+            return None
+        skipped.extend((file, reason) for file, reason in zip(py_files, reasons) if reason)
+        py_files = sorted(file for file, reason in zip(py_files, reasons) if not reason)
+
+        self.skipped = sorted(skipped)
+        self.discovery_time = time.perf_counter() - start_time
+        if self.tracer:
+            self.tracer.add("discovery", start_time, start_time + self.discovery_time)
+        reason_counts = collections.Counter(reason.split(" (")[0] for _, reason in skipped)
+        summary = ", ".join(f"{reason}: {count}" for reason, count in reason_counts.most_common())
+        output_terminal(f"Info #50: Found {len(py_files)} Python files in {self.discovery_time:.3f}s" + (f", skipped {len(skipped)} ({summary})" if skipped else ""), "yellow")
 
         # If no files were found, output debugging message
         if not py_files:
             self.gui.set_status_label("No Python files found.") #MARK:Check
-            self.gui.is_generating_tests = False
             output_terminal("❌ No Python files found!", "red")
             return
 
         return py_files
 
+    def scan_folder(self, folder, excluded, recursive=True, report=None, cancel_event=None):
+        '''
+        Returns the Python files below a folder and (if not 'recursive') its subfolders.
+
+        Args:
+        - folder (tuple): Path, path relative to the selected folder & '.gitignore' rules of the folder to scan.
+        - excluded (str): Normalized absolute path of the excluded folder (or None).
+        - recursive (bool): Descend into the subfolders instead of returning them.
+        - report (callable, optional): Called with the number of Python files found in each scanned folder.
+        - cancel_event (threading.Event, optional): Stops the scan when set.
+
+        Return:
+        - Tuple (list, list, list): Python files, subfolders not descended into, skipped paths with their reasons.
+        '''
+        py_files = []
+        subfolders = []
+        skipped = []
+        reported = 0
+        pending = [folder]
+        while pending and not (cancel_event and cancel_event.is_set()):
+            folder_path, rel_path, rules = pending.pop()
+            try:
+                with os.scandir(folder_path) as iterator:
+                    entries = list(iterator)
+            except OSError as e:
+                output_terminal(f"Warning #55-Cannot read folder: {e}", "bg_yellow")
+                continue
+
+            rules = self.source_selector.folder_rules(folder_path, rel_path, {entry.name for entry in entries}, rules)
+            self.scanned_folders[folder_path] = (rel_path, rules)
+            for entry in entries:
+                entry_rel_path = f"{rel_path}/{entry.name}" if rel_path else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune skipped folders, so they are never descended
+                    if excluded is not None and os.path.normcase(os.path.abspath(entry.path)) == excluded:
+                        reason = "excluded folder"
+                    else:
+                        reason = self.source_selector.skip_folder(entry.path, entry.name, entry_rel_path, rules)
+                    if reason:
+                        skipped.append((entry.path, reason))
+                    else:
+                        (pending if recursive else subfolders).append((entry.path, entry_rel_path, rules))
+                elif entry.name.endswith(".py"):
+                    reason = self.source_selector.skip_file(entry.name, entry_rel_path, rules)
+                    if reason:
+                        skipped.append((entry.path, reason))
+                    else:
+                        py_files.append(entry.path)
+            if report and len(py_files) > reported:
+                report(len(py_files) - reported)
+                reported = len(py_files)
+        return py_files, subfolders, skipped
+
+    def filter_changed_files(self, folder_path, py_files, revision_range, functions_only=False):
+        '''
+        Keeps only the Python files added or modified in a git revision range.
+
+        This method:
+        - Asks the local 'git' for the changed files & lines below the folder.
+        - With 'functions_only', keeps only files with changed functions and stores
+          them for the next run ('next_focus_functions'), so the prompt asks for tests of these functions only.
+        - Adds changed files without changed functions to 'skipped'.
+
+        Args:
+        - folder_path (str): The selected folder (inside a git repository).
+        - py_files (list): Python files found by 'get_python_files()'.
+        - revision_range (str): Revision range for 'git diff' (e.g. 'origin/main...HEAD').
+        - functions_only (bool): Generate tests only for the changed functions.
+
+        Return:
+        - list: The changed Python files (None if 'git' failed).
+        '''
+        try:
+            changed = {os.path.realpath(path): lines for path, lines in changed_python_lines(folder_path, revision_range).items()}
+        except (subprocess.CalledProcessError, OSError) as e:
+            output_terminal(f"Error #140: 'git diff {revision_range}' failed: {getattr(e, 'stderr', '') or e}".strip(), "bg_red")
+            return None
+
+        changed_files = []
+        self.next_focus_functions = {}
+        for file in py_files:
+            lines = changed.get(os.path.realpath(file))
+            if lines is None:
+                continue
+            if functions_only:
+                functions = changed_functions(file, lines)
+                if not functions:
+                    self.skipped.append((file, "no changed functions"))
+                    continue
+                self.next_focus_functions[file] = functions
+            changed_files.append(file)
+
+        output_terminal(f"Info #140: {len(changed_files)} of {len(py_files)} Python files changed in {revision_range}", "yellow")
+        return changed_files
+
     def save_files(self, filename, model_name, tests_folder, prompt_text, code_text, generated_output):
         '''
         Saves the generated test file and optionally a Markdown documentation.
@@ -239,7 +667,7 @@ class TestGenerator:
         # Generated test file name
         formatted_model_name = self.format_model_name(model_name)
         base_filename = os.path.basename(os.path.splitext(filename)[0])
-        test_filename = os.path.join(tests_folder, f"unit_test_{base_filename}_{formatted_model_name}.py")
+        test_filename = self.test_file_path(filename, model_name, tests_folder)
 
         # If Markdown saving is activated
         if self.gui.checkbox_save_raw.get():
@@ -256,6 +684,11 @@ class TestGenerator:
         output_terminal(f"Info #52: Markdown file saved: {test_filename}", color="yellow")
         return test_filename # Returns the test file path
 
+    def test_file_path(self, filename, model_name, tests_folder):
+        ''' Returns the path of the test file for a Python file ('unit_test_<file>_<model>.py'). '''
+        base_filename = os.path.basename(os.path.splitext(filename)[0])
+        return os.path.join(tests_folder, f"unit_test_{base_filename}_{self.format_model_name(model_name)}.py")
+
     def format_model_name(self, model_name):
         '''
         Formats the model name by replacing invalid characters.
@@ -272,45 +705,32 @@ class TestGenerator:
 
 
     # Threading & Progress
-    def check_generation_completion(self):
+    def generation_completed(self):
         '''
-        Monitors the test generation process and resets UI elements after completion.
+        Reports the result of a test generation and resets UI elements (runs in the Tk main loop).
 
         This method:
-        - Checks every second if the test generation thread is still running.
-        - After completion:
-            - Updates the UI labels.
-            - Resets the progress bar.
-            - Re-enables the UI buttons and input fields.
-            - Ensures a smooth transition for a new test generation session.
+        - Is posted to the GUI update bus by the generation thread as soon as the run ends
+          (no polling, the UI reacts immediately).
+        - Updates the UI labels with the result of the run.
+        - Re-enables the UI buttons and input fields, so a new generation can be started.
+        - The progress bar keeps its final value until the next run starts.
         '''
-        # If the thread is still running, check again after 1 second
-        if getattr(self.gui, "generation_thread", None) and self.gui.generation_thread.is_alive():
-            self.gui.after(1000, self.check_generation_completion)
+        if self.error == True:
+            output_terminal("Error #20: Error: Not all tests created!", "bg_red")
+            self.gui.set_generate_label("Error while generating tests.", "red")
         else:
-            # Generation completed
-            if self.error == True:
-                output_terminal("Error #20: Error: Not all tests created!", "bg_red")
-                self.gui.set_generate_label("Error while generating tests.", "red")
-            else:
-                output_terminal("Info #4-Success: Done generating all tests!", "blue")
-                self.gui.set_generate_label("Done generating tests.")
-
-            # Reset status so that a new generation can be started
-            self.gui.is_generating_tests = False
-
-            # Activate button again
-            self.gui.after(4000, lambda: self.gui.btn_generate.configure(state="normal", text=self.gui.on_model_select(self.gui.selected_model)))
-
-            # Reset states
-            self.gui.btn_exclude_folder.configure(state="normal")
-            self.gui.btn_folder.configure(state="normal")
-            self.gui.btn_prompt_file.configure(state="normal")
-            self.gui.combo_models.configure(state="normal")
-            self.gui.checkbox_save_raw.configure(state="normal")
-            self.gui.checkbox_create_log.configure(state="normal")
-
-            # Reset Labels after 4 seconds
-            self.gui.after(4000, lambda: self.gui.reset_progress_bar())
-            self.gui.after(4000, lambda: self.gui.set_generate_label("Ready"))
-            self.gui.after(4000, lambda: self.gui.set_status_label("OK"))
+            output_terminal("Info #4-Success: Done generating all tests!", "blue")
+            self.gui.set_generate_label("Done generating tests.")
+
+        # Reset status so that a new generation can be started
+        self.gui.is_generating_tests = False
+
+        # Activate button & reset states
+        self.gui.btn_generate.configure(state="normal", text=self.gui.on_model_select(self.gui.selected_model))
+        self.gui.btn_exclude_folder.configure(state="normal")
+        self.gui.btn_folder.configure(state="normal")
+        self.gui.btn_prompt_file.configure(state="normal")
+        self.gui.combo_models.configure(state="normal")
+        self.gui.checkbox_save_raw.configure(state="normal")
+        self.gui.checkbox_create_log.configure(state="normal")
@@ -0,0 +1,310 @@
+import argparse # Command line options
+import ast # Analyse the source code & merge the generated tests
+import ollama # Communicate with the AI model
+import os # File handling and folder operations
+import tempfile # Check the merged test module before it replaces the existing one
+from datetime import datetime # For timestamps in the appended tests
+from helpers import output_terminal, extract_python_code # Print colored messages & extract code from AI responses
+from isolated_runner import run_test_file, statement_lines # Run the generated tests with coverage & find the executable lines
+
+# Prompt used for the targeted gap requests
+GAP_PROMPT = (
+    "The existing unit tests for the Python module '{module_name}' do not execute the lines marked with '# NOT COVERED'.\n"
+    "Write additional test methods with the 'unittest' framework that execute exactly these lines and branches.\n"
+    "- Import the tested code with 'from {module_name} import ...'.\n"
+    "- Only write new tests, do not repeat the existing ones.\n"
+    "- Return the tests in a single ```python code block.\n"
+)
+NOT_COVERED_MARKER = "  # NOT COVERED"
+
+class CoverageGapFiller:
+    '''
+    Generates additional unit tests only for the uncovered regions of a source file.
+
+    Responsibilities:
+    - Runs the existing test module with line and branch coverage.
+    - Determines the functions/methods with uncovered lines or branches.
+    - Sends only these function bodies to the AI model.
+    - Appends the generated tests to the existing test module (only if they pass and close gaps).
+    '''
+    def __init__(self, model_name, prompt_text=GAP_PROMPT, timeout=60):
+        '''
+        Initializes the CoverageGapFiller class.
+
+        Args:
+        - model_name (str): The AI model used.
+        - prompt_text (str): Prompt template with the placeholder '{module_name}'.
+        - timeout (float): Maximum runtime of one test run in seconds.
+        '''
+        self.model_name = model_name
+        self.prompt_text = prompt_text
+        self.timeout = timeout
+
+    # Coverage analysis
+    def measure_coverage(self, source_path, test_path):
+        '''
+        Runs the test module against the source file and returns the coverage data.
+
+        Return:
+        - Tuple (set, set, dict): Executed lines, executed arcs and the complete run result.
+        '''
+        result = run_test_file(test_path, source_path, timeout=self.timeout, collect_coverage=True)
+        return set(result["lines"]), {tuple(arc) for arc in result["arcs"]}, result
+
+    def find_gaps(self, source_text, executed_lines, executed_arcs):
+        '''
+        Finds all functions and methods with uncovered lines or branches.
+
+        This method:
+        - Collects the executable statement lines of every top-level function and method
+          (nested functions are counted to their enclosing function).
+        - Compares them with the executed lines.
+        - Checks 'if', 'for' and 'while' statements for branches that were never taken.
+
+        Args:
+        - source_text (str): Content of the source file.
+        - executed_lines (set): Lines executed by the tests.
+        - executed_arcs (set): Line transitions executed by the tests.
+
+        Return:
+        - list: One dictionary per function with 'name', 'start', 'end', 'class_line',
+          'missing_lines' and 'missing_branches'.
+        '''
+        tree = ast.parse(source_text)
+        gaps = []
+
+        for name, node, class_node in self.iter_functions(tree):
+            missing_lines = sorted(line for line in statement_lines(node) if line not in executed_lines)
+            missing_branches = self.missing_branches(node, executed_lines, executed_arcs)
+
+            if missing_lines or missing_branches:
+                gaps.append({
+                    "name": name,
+                    "start": min([node.lineno] + [decorator.lineno for decorator in node.decorator_list]),
+                    "end": node.end_lineno,
+                    "class_line": class_node.lineno if class_node else None,
+                    "missing_lines": missing_lines,
+                    "missing_branches": missing_branches,
+                })
+
+        return gaps
+
+    def iter_functions(self, tree):
+        ''' Yields (qualified name, function node, class node or None) for top-level functions and methods. '''
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield node.name, node, None
+            elif isinstance(node, ast.ClassDef):
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        yield f"{node.name}.{child.name}", child, node
+
+    def missing_branches(self, function_node, executed_lines, executed_arcs):
+        '''
+        Returns a description of every branch that was reached but never taken.
+
+        A branch statement counts as partially covered if its line was executed but
+        either the jump into the body or the jump past the body is missing.
+        '''
+        missing = []
+        for node in ast.walk(function_node):
+            if not isinstance(node, (ast.If, ast.For, ast.AsyncFor, ast.While)) or node.lineno not in executed_lines:
+                continue
+
+            body_start = node.body[0].lineno
+            targets = {end for start, end in executed_arcs if start == node.lineno}
+            keyword = "if" if isinstance(node, ast.If) else "loop"
+
+            if body_start not in targets:
+                missing.append(f"line {node.lineno}: {keyword} body never entered")
+            if not targets - {body_start}:
+                missing.append(f"line {node.lineno}: {keyword} condition never false")
+        return missing
+
+    # Prompt
+    def build_gap_prompt(self, source_text, gaps, module_name):
+        '''
+        Builds the prompt with only the function bodies that contain gaps.
+
+        This method:
+        - Copies the lines of every affected function (with class header for methods).
+        - Marks uncovered lines and partially covered branches with '# NOT COVERED'.
+
+        Return:
+        - str: The complete prompt for the AI model.
+        '''
+        source_lines = source_text.splitlines()
+        sections = []
+
+        for gap in gaps:
+            marked_lines = set(gap["missing_lines"]) | {int(branch.split(":")[0].split()[1]) for branch in gap["missing_branches"]}
+            section = []
+            if gap["class_line"]:
+                section.append(source_lines[gap["class_line"] - 1].rstrip())
+                section.append("    ...")
+            for number in range(gap["start"], gap["end"] + 1):
+                line = source_lines[number - 1].rstrip()
+                section.append(line + NOT_COVERED_MARKER if number in marked_lines else line)
+            if gap["missing_branches"]:
+                section.append("# Missing branches: " + "; ".join(gap["missing_branches"]))
+            sections.append("\n".join(section))
+
+        return f"{self.prompt_text.format(module_name=module_name)}\n\n" + "\n\n".join(sections) + "\n"
+
+    # Merge
+    def append_tests(self, existing_code, new_code):
+        '''
+        Appends generated tests to an existing test module.
+
+        This method:
+        - Removes the "if __name__ == '__main__'" block from both modules and adds it again at the end.
+        - Skips imports that already exist in the test module.
+        - Renames test classes whose names already exist ('<Name>CoverageGaps', '<Name>CoverageGaps2', ...) so no existing test is overwritten.
+
+        Return:
+        - str: The merged test module (or None if the generated code is not valid Python).
+        '''
+        try:
+            existing_tree = ast.parse(existing_code)
+            new_tree = ast.parse(new_code)
+        except SyntaxError as e:
+            output_terminal(f"Error #60: Generated gap tests are not valid Python: {e}", "bg_red")
+            return None
+
+        existing_lines = existing_code.splitlines()
+        main_blocks = [node for node in existing_tree.body if self.is_main_block(node)]
+        for node in reversed(main_blocks):
+            del existing_lines[node.lineno - 1:node.end_lineno]
+
+        known_imports = {ast.unparse(node) for node in existing_tree.body if isinstance(node, (ast.Import, ast.ImportFrom))}
+        known_classes = {node.name for node in existing_tree.body if isinstance(node, ast.ClassDef)}
+
+        new_body = []
+        for node in new_tree.body:
+            if self.is_main_block(node):
+                continue
+            if isinstance(node, (ast.Import, ast.ImportFrom)) and ast.unparse(node) in known_imports:
+                continue
+            if isinstance(node, ast.ClassDef):
+                if node.name in known_classes:
+                    base_name, number = f"{node.name}CoverageGaps", 1
+                    node.name = base_name
+                    while node.name in known_classes: # Taken by an earlier round
+                        number += 1
+                        node.name = f"{base_name}{number}"
+                known_classes.add(node.name)
+            new_body.append(ast.unparse(node))
+
+        if not new_body:
+            return None
+
+        merged = "\n".join(existing_lines).rstrip() + "\n\n\n"
+        merged += f"# Additional tests for uncovered regions ({self.model_name}, {datetime.now().strftime('%Y-%m-%d %H:%M:%S')})\n"
+        merged += "\n\n".join(new_body) + "\n"
+        merged += "\n\nif __name__ == '__main__':\n    unittest.main()\n" if main_blocks else ""
+        return merged
+
+    def is_main_block(self, node):
+        ''' Checks whether a statement is an "if __name__ == '__main__':" block. '''
+        return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+                and isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__")
+
+    # Gap filling
+    def fill_gaps(self, source_path, test_path, max_rounds=1):
+        '''
+        Generates tests for uncovered regions and appends them to the test module.
+
+        This method:
+        - Measures coverage, builds a targeted prompt and asks the AI model for tests.
+        - Runs the merged test module from a temporary file next to the test module.
+        - Replaces the test module only if the merged module runs without new failures or errors
+          and closes gaps; otherwise the existing test module stays untouched and the rounds stop.
+        - Repeats up to 'max_rounds' times while gaps remain.
+
+        Args:
+        - source_path (str): The Python file under test.
+        - test_path (str): The existing 'unit_test_*.py' file.
+        - max_rounds (int): Maximum number of gap-filling rounds.
+
+        Return:
+        - list: The remaining gaps after the last round.
+        '''
+        with open(source_path, "r", encoding="utf-8") as file:
+            source_text = file.read()
+        module_name = os.path.splitext(os.path.basename(source_path))[0]
+
+        executed_lines, executed_arcs, result = self.measure_coverage(source_path, test_path)
+        gaps = self.find_gaps(source_text, executed_lines, executed_arcs)
+        problems_before = result["failures"] + result["errors"]
+
+        for round_number in range(1, max_rounds + 1):
+            if not gaps:
+                output_terminal(f"Info #60: No coverage gaps left in {source_path}.", "green")
+                break
+
+            missing_before = sum(len(gap["missing_lines"]) + len(gap["missing_branches"]) for gap in gaps)
+            output_terminal(f"Info #61: Round {round_number}: {len(gaps)} function(s) with {missing_before} gap(s) in {source_path}.", "yellow")
+
+            try:
+                response = ollama.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': self.build_gap_prompt(source_text, gaps, module_name)}],
+                )
+            except Exception as e:
+                output_terminal(f"Error #61: AI model failed to generate gap tests for {source_path}: {e}", "bg_red")
+                break
+
+            new_code = extract_python_code(response["message"]["content"])
+            with open(test_path, "r", encoding="utf-8") as file:
+                merged = self.append_tests(file.read(), new_code)
+            if merged is None:
+                output_terminal(f"Warning #60: No usable tests generated for {source_path}.", "bg_yellow")
+                break
+
+            # Check the merged module in a temporary file; the existing test module is only replaced if it got better
+            file_descriptor, candidate_path = tempfile.mkstemp(prefix=".unit_test_gaps_", suffix=".py", dir=os.path.dirname(os.path.abspath(test_path)))
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                    file.write(merged)
+                executed_lines, executed_arcs, result = self.measure_coverage(source_path, candidate_path)
+                new_gaps = self.find_gaps(source_text, executed_lines, executed_arcs)
+                missing_after = sum(len(gap["missing_lines"]) + len(gap["missing_branches"]) for gap in new_gaps)
+                problems_after = result["failures"] + result["errors"]
+
+                if result["status"] in ("error", "timeout") or problems_after > problems_before:
+                    output_terminal(f"Warning #62: Gap tests of round {round_number} fail ({result['status']}, {problems_after} failures/errors), kept {test_path}.", "bg_yellow")
+                    break
+                if missing_after >= missing_before:
+                    output_terminal(f"Warning #61: Round {round_number} did not close any gaps, kept {test_path}.", "bg_yellow")
+                    break
+
+                os.replace(candidate_path, test_path)
+                gaps = new_gaps
+                problems_before = problems_after
+                output_terminal(f"Info #62: Appended gap tests to {test_path} ({missing_before} -> {missing_after} gaps).", "yellow")
+            finally:
+                if os.path.exists(candidate_path):
+                    os.remove(candidate_path)
+
+        return gaps
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate additional tests only for uncovered lines and branches.")
+    parser.add_argument("--source", required=True, help="Python file under test")
+    parser.add_argument("--tests", required=True, help="Existing 'unit_test_*.py' file the new tests are appended to")
+    parser.add_argument("--model", required=True, help="Ollama model name")
+    parser.add_argument("--rounds", type=int, default=1, help="Maximum number of gap-filling rounds")
+    parser.add_argument("--report-only", action="store_true", help="Only report the gaps, do not call the model")
+    args = parser.parse_args()
+
+    filler = CoverageGapFiller(args.model)
+    if args.report_only:
+        with open(args.source, "r", encoding="utf-8") as source_file:
+            source = source_file.read()
+        lines, arcs, _ = filler.measure_coverage(args.source, args.tests)
+        remaining = filler.find_gaps(source, lines, arcs)
+    else:
+        remaining = filler.fill_gaps(args.source, args.tests, args.rounds)
+
+    for gap in remaining:
+        output_terminal(f"Info #63: {gap['name']}: lines {gap['missing_lines']} {gap['missing_branches']}", "blue")
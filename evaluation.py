@@ -0,0 +1,179 @@
+import argparse # Command line options
+import concurrent.futures # Evaluate the cells in parallel
+import hashlib # Content hashes for the result cache
+import json # Persist the result cache & report
+import os # File handling and folder operations
+import threading # Protect the cache while workers report results
+import time # Runtime of the whole evaluation
+import app_logging # Flush queued messages before printing the matrix
+import isolated_runner # Hash of the runner itself invalidates the cache on changes
+from helpers import output_terminal # Print colored messages to the terminal
+from isolated_runner import run_test_file, find_test_cells, executable_lines # Run generated tests in isolated processes
+
+EVALUATION_CACHE_FILE = "evaluation_cache.json"
+
+class TestEvaluator:
+    '''
+    Evaluates an archive of generated unit tests automatically.
+
+    Responsibilities:
+    - Pairs every 'unit_test_*.py' of a tree like 'Testcodes/<prompt>/<model>/'
+      with its module under test (e.g. in 'Codes/').
+    - Runs every test file in its own process, several processes in parallel.
+    - Collects pass/fail/error counts, number of tests, runtime and line coverage.
+    - Caches every cell by the hashes of test file, source file and runner,
+      so only changed cells are evaluated again.
+    '''
+    def __init__(self, max_workers=None, timeout=60, cache_dir=".genunit_cache"):
+        '''
+        Initializes the TestEvaluator class.
+
+        Args:
+        - max_workers (int, optional): Number of parallel test processes (default: CPU count).
+        - timeout (float): Timeout per test file in seconds.
+        - cache_dir (str, optional): Folder of the result cache (None disables the cache).
+        '''
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache_path = os.path.join(cache_dir, EVALUATION_CACHE_FILE) if cache_dir else None
+        self.cache = self.load_cache()
+        self.cache_lock = threading.Lock()
+        self.runner_hash = self.file_hash(isolated_runner.__file__)
+
+    # Cache
+    def load_cache(self):
+        ''' Loads the result cache from disk (empty if missing or unreadable). '''
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError) as e:
+            output_terminal(f"Warning #80: Evaluation cache could not be read, starting empty - {e}", "bg_yellow")
+            return {}
+
+    def save_cache(self):
+        ''' Writes the result cache to disk. '''
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self.cache_lock:
+            with open(self.cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self.cache, cache_file)
+
+    def file_hash(self, path):
+        ''' Returns the SHA-256 hash of a file's content. '''
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    # Evaluation
+    def evaluate_cell(self, cell):
+        '''
+        Runs one generated test file against its module (or takes the result from the cache).
+
+        Args:
+        - cell (dict): Entry of 'find_test_cells()' with 'test_path' and 'source_path'.
+
+        Return:
+        - dict: The cell with 'status', 'tests_run', 'passed', 'failures', 'errors', 'skipped',
+          'runtime', 'coverage' (0.0 - 1.0), 'message' and 'cached'.
+        '''
+        cache_key = f"{self.file_hash(cell['test_path'])}:{self.file_hash(cell['source_path'])}:{self.runner_hash}"
+        with self.cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            return {**cell, **cached, "cached": True}
+
+        result = run_test_file(cell["test_path"], cell["source_path"], timeout=self.timeout, collect_coverage=True)
+
+        with open(cell["source_path"], "r", encoding="utf-8") as file:
+            statements = executable_lines(file.read())
+        covered = statements & set(result["lines"])
+
+        metrics = {
+            "status": result["status"],
+            "tests_run": result["tests_run"],
+            "passed": len(result["passed_tests"]),
+            "failures": result["failures"],
+            "errors": result["errors"],
+            "skipped": result["skipped"],
+            "runtime": round(result["duration"], 3),
+            "coverage": round(len(covered) / len(statements), 4) if statements else 0.0,
+            "message": result["message"],
+        }
+        with self.cache_lock:
+            self.cache[cache_key] = metrics
+        return {**cell, **metrics, "cached": False}
+
+    def evaluate_tree(self, results_root, sources_root):
+        '''
+        Evaluates all generated tests of a results tree in parallel.
+
+        Args:
+        - results_root (str): Tree like 'Testcodes/<prompt>/<model>/'.
+        - sources_root (str): Folder with the original modules (e.g. 'Codes').
+
+        Return:
+        - list: One result per cell, sorted by prompt, module and model (the order of the evaluation sheets).
+        '''
+        cells = find_test_cells(results_root, sources_root)
+        output_terminal(f"Info #80: Evaluating {len(cells)} test file(s) with {self.max_workers} worker(s)...", "yellow")
+        start_time = time.perf_counter()
+
+        results = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.evaluate_cell, cell): cell for cell in cells}
+            for future in concurrent.futures.as_completed(futures):
+                cell = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    output_terminal(f"Error #80: Failed to evaluate {cell['test_path']}: {e}", "bg_red")
+
+        self.save_cache()
+        cached_count = sum(result["cached"] for result in results)
+        output_terminal(f"Info #81: Evaluated {len(results)} cell(s) ({cached_count} from cache) in {time.perf_counter() - start_time:.2f}s.", "yellow")
+        return sorted(results, key=lambda result: (result["prompt"], result["module"], result["model"]))
+
+    def build_matrix(self, results):
+        '''
+        Arranges the results as matrix rows (prompt, model) x columns (module).
+
+        Return:
+        - Tuple (list, list, dict): Row keys, module names and {(prompt, model): {module: result}}.
+        '''
+        matrix = {}
+        for result in results:
+            matrix.setdefault((result["prompt"], result["model"]), {})[result["module"]] = result
+        modules = sorted({result["module"] for result in results})
+        return sorted(matrix), modules, matrix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate all generated unit tests of a results tree.")
+    parser.add_argument("--results", default="Testcodes", help="Results tree '<prompt>/<model>/unit_test_*.py'")
+    parser.add_argument("--sources", default="Codes", help="Folder with the modules under test")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel test processes")
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout per test file in seconds")
+    parser.add_argument("--json", default=None, help="Write all cell results to this JSON file ('.jsonl': one result per line)")
+    args = parser.parse_args()
+
+    evaluator = TestEvaluator(max_workers=args.workers, timeout=args.timeout)
+    cell_results = evaluator.evaluate_tree(args.results, args.sources)
+    row_keys, module_names, result_matrix = evaluator.build_matrix(cell_results)
+
+    # Matrix: passed/total tests per cell, '-' if no test file exists
+    app_logging.flush() # Queued messages first, so they do not run into the table
+    print(" | ".join(["Prompt", "Model"] + module_names))
+    for prompt, model in row_keys:
+        cells = []
+        for module in module_names:
+            result = result_matrix[(prompt, model)].get(module)
+            cells.append(f"{result['passed']}/{result['tests_run']} {result['status']}" if result else "-")
+        print(" | ".join([prompt, model] + cells))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            if args.json.endswith(".jsonl"):
+                report_file.writelines(json.dumps(result) + "\n" for result in cell_results)
+            else:
+                json.dump(cell_results, report_file, indent=2)
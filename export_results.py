@@ -0,0 +1,350 @@
+import argparse # Command line options
+import csv # CSV export
+import itertools # Group the streamed results by prompt and module
+import json # Read evaluation results
+import re # Sheet names & invalid XML characters
+import zipfile # XLSX files are ZIP archives of XML files
+from xml.sax.saxutils import escape # Escape cell values for XML
+from helpers import output_terminal # Print colored messages to the terminal
+
+# Columns of the per-file metrics (CSV and 'Metrics' sheet)
+METRIC_COLUMNS = ["prompt", "model", "module", "test_path", "source_path", "status", "tests_run", "passed",
+                  "failures", "errors", "skipped", "runtime", "coverage", "message"]
+
+# Rows of one module block, as in 'Excel/Unit Test Evaluation.xlsx' (the manual part stays empty)
+MANUAL_ROWS_EXECUTABLE = [
+    "Unabhängigkeit der Tests gewährleistet?",
+    "^ Ja, wenn kein Test den anderen an der Durchführung behindert.",
+    "^ Nein, wenn ein Test den anderen an der Durchführung behindert.",
+    "Testabdeckung (Test Code Coverage) in % ",
+]
+MANUAL_ROWS_NON_EXECUTABLE = [
+    "Ist der Testcode syntaktisch korrekt?",
+    "^ Ja, wenn es keine Syntaxfehler enthält.",
+    "^ Nein, wenn es Syntaxfehler enthält (mit einer kurzen Erklärung, um welche Fehler es sich handelt)",
+    "Gibt es Erklärungen zum Testcode, die beschreiben, was getestet wird?",
+    "^ Ja, wenn die Tests mit Kommentaren / Docstrings erläutert werden.",
+    "^ Teils, wenn die Tests mit wenigen guten Kommentaren / Docstrings erklärt werden.",
+    "^ Nein, wenn die Tests nicht mit Kommentaren / Docstrings erläutert werden.",
+    "Sind alle Funktionen und Fehlerquellen aus dem Quellcodes getestet? ",
+    "^ Ja, wenn alle Funktionen / Fehlerquellen getestet sind",
+    "^ Teils, wenn wenige Funktionen / Fehlerquellen geprüft werden.",
+    "^ Nein, wenn keine Funktionen /  Fehlerquellen getestet werden.",
+    "Werden Sonderfälle/Spezialfälle berücksichtigt?",
+    "^ Ja, wenn >=3 Fälle vorhanden.",
+    "^ Teils, wenn 1 >= x > 3 Fälle vorhanden.",
+    "^ Nein, wenn keine Fälle vorhanden.",
+    "Wie ist die Lesbarkeit / Wartbarkeit der Tests?",
+    "^ Sehr gut, wenn der Code kommentiert ist, aussagekräftige Namen der Testmethoden, Abstände und Einrückungen vorhanden sind und der Code leicht verständlich ist.",
+    "^ Gut, wenn bei \"sehr gut\" ein oder zwei Aspekte fehlen.",
+    "^ Schlecht, wenn der Code keine Kommentare und keine guten Testmethodennamen hat.",
+    "Gibt es Chat Hinweise / Erklärungen im Code?",
+    "^ Ja, wenn gute / sehr gute Erklärungen und weitere Informationen zum Test verfügbar sind.",
+    "^ Nein, wenn nur der Code oder keine weiteren Informationen verfügbar sind.",
+    "Haben die Variablen / Testmethoden aussagekräftige Namen?",
+    "^ Ja, wenn der Name wie folgt lautet: test_{die_getestete_funktion} oder test_{was_getestet_wird}.",
+    "^ Nein, wenn die Namen unsinnig oder sinnlos sind.",
+    "Weitere Bemerkungen (optional)",
+]
+
+INVALID_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Reading
+def iter_results_file(path):
+    '''
+    Reads evaluation results from a '.json' list (from 'evaluation.py --json') or a '.jsonl' file.
+
+    Both are streamed: '.jsonl' files line by line, '.json' lists element by element ('iter_json_array()'),
+    so the memory usage stays bounded by the largest single result.
+    '''
+    with open(path, "r", encoding="utf-8") as results_file:
+        if path.endswith(".jsonl"):
+            for line in results_file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(results_file)
+
+def iter_json_array(text_file, chunk_size=65536):
+    '''
+    Yields the elements of a JSON array one at a time, reading the file in chunks.
+
+    Every element is decoded with 'json.JSONDecoder.raw_decode()' as soon as it is complete;
+    the decoded text is dropped from the buffer, so only the current element is held in memory.
+    '''
+    decoder = json.JSONDecoder()
+    buffer, position, started, eof = "", 0, False, False
+    while True:
+        # Skip whitespace and, inside the array, the separators
+        while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ",")):
+            position += 1
+
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array of results.")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+                if end < len(buffer) or eof: # A number at the end of the buffer could still go on
+                    yield element
+                    buffer, position = buffer[end:], 0
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            raise ValueError("Unexpected end of the JSON array.")
+
+        chunk = text_file.read(chunk_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+
+# Rows
+def metric_rows(results):
+    ''' Yields the header and one row of per-file metrics per result. '''
+    yield METRIC_COLUMNS
+    for result in results:
+        yield [result.get(column, "") for column in METRIC_COLUMNS]
+
+def test_id_for_prompt(prompt, index):
+    ''' Returns the test ID of a prompt (the leading number of the folder, else its position). '''
+    match = re.match(r"\s*(\d+)", prompt)
+    return int(match.group(1)) if match else index
+
+def unique_sheet_name(name, used_names):
+    '''
+    Returns a valid sheet name that is not in 'used_names' (and adds it).
+
+    Invalid characters are replaced and the name is cut to 31 characters; a repeated name
+    (Excel compares case-insensitively) gets a numeric suffix, e.g. 'Unit Test_Eval-ID-1 (2)'.
+    '''
+    base = re.sub(r"[\[\]:*?/\\]", "_", name)[:31]
+    candidate, number = base, 1
+    while candidate.lower() in used_names:
+        number += 1
+        suffix = f" ({number})"
+        candidate = base[:31 - len(suffix)] + suffix
+    used_names.add(candidate.lower())
+    return candidate
+
+def layout_rows(results):
+    '''
+    Yields the rows of the evaluation sheets in the layout of 'Unit Test Evaluation.xlsx'.
+
+    This method:
+    - Starts a new sheet per prompt and a block of rows per module.
+    - Fills one column per model with the automatically measurable values.
+    - Keeps the rows of the manual evaluation as empty rows.
+
+    The results must be sorted by prompt and module (as returned by 'TestEvaluator.evaluate_tree()'),
+    so only one module block is held in memory at a time.
+
+    Yields:
+    - Tuple (str, list): Sheet name and row; cells are values or (value, style) with style 'bold' or 'percent'.
+    '''
+    used_names = set()
+    for index, (prompt, prompt_results) in enumerate(itertools.groupby(results, key=lambda result: result["prompt"]), start=1):
+        test_id = test_id_for_prompt(prompt, index)
+        sheet_name = unique_sheet_name(f"Unit Test_Eval-ID-{test_id}", used_names)
+        yield sheet_name, []
+        yield sheet_name, [("EVALUATIONSTABELLE", "bold")]
+
+        for module, module_results in itertools.groupby(prompt_results, key=lambda result: result["module"]):
+            block = list(module_results) # One result per model
+            passed = [result["status"] == "passed" for result in block]
+
+            yield sheet_name, [(module, "bold")]
+            yield sheet_name, [("Allgemeiner Teil", "bold")]
+            yield sheet_name, ["Test-ID:"] + [test_id] * len(block)
+            yield sheet_name, ["Test-Projektname:"] + [f"{module}.py"] * len(block)
+            yield sheet_name, ["Verwendetes KI-Modell:"] + [result["model"] for result in block]
+            yield sheet_name, ["Verwendeter Prompt:"] + [prompt] * len(block)
+            yield sheet_name, ["Programmiersprache des Codes:"] + ["Python"] * len(block)
+            yield sheet_name, []
+            yield sheet_name, [("Ausführbarer Teil", "bold")]
+            yield sheet_name, ["Kann der Code ohne manuelle Änderungen ausgeführt werden?"]
+            yield sheet_name, ["^ Wenn nein, kurze Erklärung, was verbessert werden muss, damit der Test durchgeführt werden kann."]
+            yield sheet_name, ["Sind alle Test-Assertions erfolgreich?"] + ["Ja" if ok else "Nein" for ok in passed]
+            yield sheet_name, ["^ Wenn ja, wie viele Tests gibt es insgesamt?"] + [result["tests_run"] if ok else None for result, ok in zip(block, passed)]
+            yield sheet_name, ["^ Wenn nein: Failure-Anzahl_Error_Anzahl / Gesamtanzahl (einschließlich einer kurzen Erklärung, um welche Fehler es sich handelt): F(Failure-Message); E(Error-Message)"] + [
+                None if ok else f"{result['failures']}/{result['errors']}/{result['tests_run']} {'F' if result['status'] == 'failed' else 'E'}({result['message']})"
+                for result, ok in zip(block, passed)
+            ]
+            yield sheet_name, ["Codeabdeckung (Code Coverage) in % "] + [(result["coverage"], "percent") for result in block]
+            for label in MANUAL_ROWS_EXECUTABLE:
+                yield sheet_name, [label]
+            yield sheet_name, []
+            yield sheet_name, [("Nicht-ausführbarer Teil", "bold")]
+            for label in MANUAL_ROWS_NON_EXECUTABLE:
+                yield sheet_name, [label]
+            yield sheet_name, []
+
+# CSV
+def write_csv(path, rows):
+    ''' Writes rows to a CSV file one by one; styled cells are written as plain values. '''
+    with open(path, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        for row in rows:
+            writer.writerow([cell[0] if isinstance(cell, tuple) else ("" if cell is None else cell) for cell in row])
+
+def write_layout_csv(path, results):
+    ''' Writes the evaluation layout of all sheets to one CSV file, with the sheet name as first column. '''
+    write_csv(path, ([sheet_name] + row for sheet_name, row in layout_rows(results)))
+
+# XLSX
+def column_letter(index):
+    ''' Returns the column letter of a 1-based column index (1 -> 'A', 27 -> 'AA'). '''
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class XlsxStreamWriter:
+    '''
+    Writes a minimal XLSX workbook without a spreadsheet library.
+
+    Every sheet is written row by row directly into the ZIP archive, so the memory
+    usage does not grow with the number of rows. Strings are stored as inline strings
+    (no shared string table has to be collected), and only three cell styles exist:
+    normal, bold and percent.
+    '''
+    def __init__(self, path):
+        '''
+        Opens the XLSX file for writing.
+
+        Args:
+        - path (str): Target '.xlsx' file.
+        '''
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.sheet_names = []
+
+    def add_sheet(self, name, rows, column_widths=None, first_column=1):
+        '''
+        Streams one worksheet into the archive.
+
+        Args:
+        - name (str): Name of the sheet (max. 31 characters, made unique within the workbook).
+        - rows (iterable): Rows of cell values or (value, style) tuples.
+        - column_widths (dict, optional): 1-based column index -> width.
+        - first_column (int): Column of the first cell of each row (2 = column 'B' as in the existing sheets).
+        '''
+        self.sheet_names.append(unique_sheet_name(name, {sheet_name.lower() for sheet_name in self.sheet_names}))
+        sheet_path = f"xl/worksheets/sheet{len(self.sheet_names)}.xml"
+
+        with self.archive.open(sheet_path, "w") as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        b'<sheetViews><sheetView showGridLines="0" workbookViewId="0"/></sheetViews>')
+            if column_widths:
+                columns = "".join(f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>' for index, width in sorted(column_widths.items()))
+                sheet.write(f"<cols>{columns}</cols>".encode("utf-8"))
+            sheet.write(b"<sheetData>")
+            for row_number, row in enumerate(rows, start=1):
+                sheet.write(self.row_xml(row_number, row, first_column).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+    def row_xml(self, row_number, row, first_column):
+        ''' Returns the XML of one row. '''
+        cells = []
+        for column, cell in enumerate(row, start=first_column):
+            value, style = cell if isinstance(cell, tuple) else (cell, None)
+            if value is None or value == "":
+                continue
+            reference = f"{column_letter(column)}{row_number}"
+            style_attribute = {"bold": ' s="1"', "percent": ' s="2"'}.get(style, "")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                text = escape(INVALID_XML_CHARACTERS.sub("", str(value)))
+                cells.append(f'<c r="{reference}" t="inlineStr"{style_attribute}><is><t xml:space="preserve">{text}</t></is></c>')
+            else:
+                cells.append(f'<c r="{reference}"{style_attribute}><v>{value}</v></c>')
+        return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+    def close(self):
+        ''' Writes workbook, relationships, styles and content types and closes the archive. '''
+        sheets = "".join(f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{index}" r:id="rId{index}"/>' for index, name in enumerate(self.sheet_names, start=1))
+        relations = "".join(
+            f'<Relationship Id="rId{index}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{index}.xml"/>'
+            for index in range(1, len(self.sheet_names) + 1)
+        )
+        style_id = len(self.sheet_names) + 1
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for index in range(1, len(self.sheet_names) + 1)
+        )
+
+        self.archive.writestr("[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{overrides}</Types>')
+        self.archive.writestr("_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>')
+        self.archive.writestr("xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets>{sheets}</sheets></workbook>')
+        self.archive.writestr("xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relations}<Relationship Id="rId{style_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            '</Relationships>')
+        self.archive.writestr("xl/styles.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<fonts count="2"><font><sz val="12"/><name val="Calibri"/></font><font><b/><sz val="12"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+            '<xf numFmtId="9" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+            '</styleSheet>')
+        self.archive.close()
+
+def write_xlsx(path, results_source):
+    '''
+    Writes the evaluation sheets (one per prompt) and a 'Metrics' sheet with one row per file.
+
+    Args:
+    - path (str): Target '.xlsx' file.
+    - results_source (callable): Returns a new iterator over the sorted results on every call
+      (the results are streamed twice: once for the layout sheets, once for the metrics).
+    '''
+    writer = XlsxStreamWriter(path)
+    layout_widths = {1: 2.7, 2: 120, 3: 40, 4: 40, 5: 40, 6: 40}
+
+    for sheet_name, sheet_rows in itertools.groupby(layout_rows(results_source()), key=lambda item: item[0]):
+        writer.add_sheet(sheet_name, (row for _, row in sheet_rows), column_widths=layout_widths, first_column=2)
+
+    writer.add_sheet("Metrics", metric_rows(results_source()))
+    writer.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export evaluation results to CSV and XLSX.")
+    parser.add_argument("--input", required=True, help="Results of 'evaluation.py --json' (.json list or .jsonl with one result per line; both are streamed)")
+    parser.add_argument("--csv", default=None, help="CSV file with per-file metrics")
+    parser.add_argument("--layout-csv", default=None, help="CSV file with the evaluation layout of all sheets")
+    parser.add_argument("--xlsx", default=None, help="XLSX file with one evaluation sheet per prompt and a 'Metrics' sheet")
+    args = parser.parse_args()
+
+    if args.csv:
+        write_csv(args.csv, metric_rows(iter_results_file(args.input)))
+        output_terminal(f"Info #90: Metrics CSV saved: {args.csv}", "yellow")
+    if args.layout_csv:
+        write_layout_csv(args.layout_csv, iter_results_file(args.input))
+        output_terminal(f"Info #91: Layout CSV saved: {args.layout_csv}", "yellow")
+    if args.xlsx:
+        write_xlsx(args.xlsx, lambda: iter_results_file(args.input))
+        output_terminal(f"Info #92: XLSX saved: {args.xlsx}", "yellow")
@@ -0,0 +1,352 @@
+import argparse # Command line options
+import hashlib # Deterministic choice of the recorded response
+import json # Request & response bodies of the Ollama API
+import os # File handling and folder operations
+import random # Injected errors & stalls (seeded)
+import re # Split responses into tokens
+import threading # Serve requests in the background
+import time # Simulated token rate, time-to-first-token & stalls
+from datetime import datetime, timezone # 'created_at' fields of the API
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler # Local HTTP server
+from helpers import output_terminal, read_markdown_record # Print colored messages & read saved AI responses
+
+TOKEN_PATTERN = re.compile(r"\s*\S+|\s+") # A token is a word with its leading whitespace
+
+def load_recordings(recordings_root):
+    '''
+    Loads the raw AI responses of all Markdown files written by 'TestGenerator.save_files()'.
+
+    This method:
+    - Reads every '.md' file below the folder with 'read_markdown_record()'.
+    - Skips files without a '### Generated Output' section.
+
+    Args:
+    - recordings_root (str): Folder with '.md' files (e.g. 'Testcodes').
+
+    Return:
+    - list: Dictionaries with 'original_file', 'model', 'prompt', 'response' and 'path'.
+    '''
+    recordings = []
+    for dirpath, dirnames, files in os.walk(recordings_root):
+        dirnames.sort()
+        for file in sorted(files):
+            if file.endswith(".md"):
+                recording = read_markdown_record(os.path.join(dirpath, file))
+                if recording:
+                    recordings.append(recording)
+    return recordings
+
+class FakeOllamaServer:
+    '''
+    Local stand-in for the Ollama HTTP API, replaying recorded responses.
+
+    Supported endpoints (the subset used by this tool):
+    - 'GET /' and 'GET /api/version' (health checks)
+    - 'GET /api/tags' (model list, used by 'ollama list' / 'ollama.list()')
+    - 'POST /api/show' (model details)
+    - 'POST /api/chat' (streamed and non-streamed)
+    - 'POST /api/generate' (streamed and non-streamed; an empty prompt only loads the model, as 'watch.py' does)
+
+    The response for a chat request is the recording whose model and prompt match the request;
+    otherwise a recording is chosen by the hash of the prompt, so the same request always
+    gets the same answer. Token rate, time-to-first-token, errors and stalls are configurable;
+    errors and stalls are drawn per request from the seed, the prompt and its number of attempts,
+    so they do not depend on the order in which parallel requests arrive.
+    '''
+    def __init__(self, recordings, host="127.0.0.1", port=0, models=None, tokens_per_second=0.0,
+                 time_to_first_token=0.0, error_rate=0.0, stall_rate=0.0, stall_seconds=5.0, seed=0):
+        '''
+        Initializes the FakeOllamaServer class.
+
+        Args:
+        - recordings (list): Recorded responses (see 'load_recordings()'); at least one is required.
+        - host (str): Interface to listen on.
+        - port (int): Port to listen on (0 = free port, see 'url').
+        - models (list, optional): Model names reported by '/api/tags' (default: models of the recordings).
+        - tokens_per_second (float): Simulated token rate (0 = as fast as possible).
+        - time_to_first_token (float): Delay before the first chunk in seconds.
+        - error_rate (float): Probability (0.0 - 1.0) that a chat request fails with HTTP 500.
+        - stall_rate (float): Probability that a streamed response pauses once for 'stall_seconds'.
+        - stall_seconds (float): Duration of a stall in seconds.
+        - seed (int): Seed of the random generator for errors & stalls.
+        '''
+        if not recordings:
+            raise ValueError("At least one recorded response is required.")
+        self.recordings = recordings
+        self.recordings_by_prompt = {recording["prompt"].strip(): recording for recording in recordings}
+        self.recordings_by_model_prompt = {(recording["model"], recording["prompt"].strip()): recording for recording in recordings}
+        self.models = models or sorted({recording["model"] for recording in recordings if recording["model"]}) or ["fake:latest"]
+        self.tokens_per_second = tokens_per_second
+        self.time_to_first_token = time_to_first_token
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.seed = seed
+        self.attempts = {} # Prompt hash -> number of requests so far
+        self.random_lock = threading.Lock()
+        self.request_count = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self.create_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        ''' Base URL of the server (for 'OLLAMA_HOST' or 'ollama.Client(host=...)'). '''
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        ''' Starts serving in a background thread and returns the server. '''
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        ''' Stops the server and closes the socket. '''
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Replay
+    def choose_recording(self, model, prompt):
+        ''' Returns the recording for a request: same model & prompt, same prompt, otherwise chosen by the prompt hash. '''
+        recording = self.recordings_by_model_prompt.get((model, prompt.strip())) or self.recordings_by_prompt.get(prompt.strip())
+        if recording:
+            return recording
+        index = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % len(self.recordings)
+        return self.recordings[index]
+
+    def draw(self, model, prompt):
+        ''' Returns (fail, stall) for a request from a random generator seeded with the seed, model, prompt & attempt. '''
+        prompt_hash = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+        with self.random_lock:
+            self.request_count += 1
+            attempt = self.attempts.get(prompt_hash, 0)
+            self.attempts[prompt_hash] = attempt + 1
+        generator = random.Random(f"{self.seed}:{prompt_hash}:{attempt}")
+        return generator.random() < self.error_rate, generator.random() < self.stall_rate
+
+    def create_handler(self):
+        ''' Creates the request handler class bound to this server instance. '''
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True # Headers & body are separate writes; with Nagle & delayed ACK every keep-alive request waits ~40 ms
+
+            def log_message(self, format, *args):
+                pass # No access log in the terminal
+
+            def send_json(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                if self.path == "/":
+                    data = b"Ollama is running"
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; charset=utf-8")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                elif self.path == "/api/version":
+                    self.send_json(200, {"version": "0.0.0-fake"})
+                elif self.path == "/api/tags":
+                    self.send_json(200, {"models": [server.model_entry(name) for name in server.models]})
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                try:
+                    body = self.read_json()
+                except ValueError:
+                    self.send_json(400, {"error": "invalid JSON"})
+                    return
+
+                if self.path == "/api/show":
+                    name = body.get("model") or body.get("name", "")
+                    if name not in server.models:
+                        self.send_json(404, {"error": f"model '{name}' not found"})
+                        return
+                    self.send_json(200, server.show_entry(name))
+                elif self.path == "/api/chat":
+                    server.handle_chat(self, body)
+                elif self.path == "/api/generate":
+                    server.handle_generate(self, body)
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+        return Handler
+
+    def model_entry(self, name):
+        ''' Returns the '/api/tags' entry of a model. '''
+        return {
+            "name": name,
+            "model": name,
+            "modified_at": "2024-12-01T00:00:00Z",
+            "size": 0,
+            "digest": hashlib.sha256(name.encode("utf-8")).hexdigest(),
+            "details": {"format": "gguf", "family": "fake", "parameter_size": "0B", "quantization_level": "none"},
+        }
+
+    def show_entry(self, name):
+        ''' Returns the '/api/show' details of a model. '''
+        return {
+            "modelfile": "",
+            "parameters": "",
+            "template": "",
+            "details": self.model_entry(name)["details"],
+            "model_info": {"general.architecture": "fake", "fake.context_length": 8192},
+        }
+
+    def handle_chat(self, handler, body):
+        ''' Answers a '/api/chat' request with a recorded response (see 'respond()'). '''
+        messages = body.get("messages") or []
+        prompt = messages[-1].get("content", "") if messages else ""
+        self.respond(handler, body, prompt, self.chat_chunk)
+
+    def handle_generate(self, handler, body):
+        ''' Answers a '/api/generate' request with a recorded response; an empty prompt only "loads" the model. '''
+        model = body.get("model", "")
+        prompt = body.get("prompt") or ""
+        if not prompt and model in self.models:
+            handler.send_json(200, {**self.generate_chunk(model, "", True), "done_reason": "load"})
+            return
+        self.respond(handler, body, prompt, self.generate_chunk)
+
+    def respond(self, handler, body, prompt, make_chunk):
+        '''
+        Answers a chat or generate request with a recorded response.
+
+        This method:
+        - Fails with HTTP 500 according to the error rate.
+        - Waits for the time-to-first-token.
+        - Streams the response token by token as NDJSON (or returns it at once with 'stream': false),
+          paced by the token rate and with an optional stall in the middle.
+
+        Args:
+        - handler (BaseHTTPRequestHandler): The request.
+        - body (dict): The request body.
+        - prompt (str): The prompt of the request.
+        - make_chunk (callable): Builds one response object from (model, content, done).
+        '''
+        model = body.get("model", "")
+        fail, stall = self.draw(model, prompt)
+
+        if model not in self.models:
+            handler.send_json(404, {"error": f"model '{model}' not found, try pulling it first"})
+            return
+        if fail:
+            handler.send_json(500, {"error": "injected error from fake Ollama server"})
+            return
+
+        start_time = time.perf_counter()
+        response = self.choose_recording(model, prompt)["response"]
+        tokens = TOKEN_PATTERN.findall(response)
+        time.sleep(self.time_to_first_token)
+
+        if body.get("stream", True) is False:
+            if self.tokens_per_second:
+                time.sleep(len(tokens) / self.tokens_per_second)
+            handler.send_json(200, {**make_chunk(model, response, True), **self.final_fields(start_time, prompt, len(tokens))})
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        stall_at = len(tokens) // 2 if stall else -1
+        try:
+            for index, token in enumerate(tokens):
+                if index == stall_at:
+                    time.sleep(self.stall_seconds)
+                self.write_chunk(handler, make_chunk(model, token, False))
+                if self.tokens_per_second:
+                    time.sleep(1 / self.tokens_per_second)
+            self.write_chunk(handler, {**make_chunk(model, "", True), **self.final_fields(start_time, prompt, len(tokens))})
+            handler.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass # Client cancelled the stream
+
+    def write_chunk(self, handler, body):
+        ''' Writes one NDJSON line as an HTTP chunk. '''
+        data = (json.dumps(body) + "\n").encode("utf-8")
+        handler.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        handler.wfile.flush()
+
+    def chat_chunk(self, model, content, done):
+        ''' Returns one chat response object. '''
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+
+    def generate_chunk(self, model, content, done):
+        ''' Returns one generate response object. '''
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": content,
+            "done": done,
+        }
+
+    def final_fields(self, start_time, prompt, token_count):
+        ''' Returns the statistics of the last chunk (durations in nanoseconds). '''
+        total = int((time.perf_counter() - start_time) * 1e9)
+        return {
+            "done_reason": "stop",
+            "total_duration": total,
+            "load_duration": 0,
+            "prompt_eval_count": len(TOKEN_PATTERN.findall(prompt)),
+            "prompt_eval_duration": int(self.time_to_first_token * 1e9),
+            "eval_count": token_count,
+            "eval_duration": max(0, total - int(self.time_to_first_token * 1e9)),
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Ollama API replaying recorded responses.")
+    parser.add_argument("--recordings", default="Testcodes", help="Folder with '.md' files containing a '### Generated Output' section")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", action="append", default=None, help="Model name to report (repeatable, default: models of the recordings)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated token rate (0 = unlimited)")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Time to first token in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of chat requests failing with HTTP 500")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="Share of streams pausing once in the middle")
+    parser.add_argument("--stall-seconds", type=float, default=5.0, help="Duration of a stall in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected errors & stalls (combined with the prompt of each request)")
+    args = parser.parse_args()
+
+    fake_server = FakeOllamaServer(
+        load_recordings(args.recordings), host=args.host, port=args.port, models=args.model,
+        tokens_per_second=args.tokens_per_second, time_to_first_token=args.ttft, error_rate=args.error_rate,
+        stall_rate=args.stall_rate, stall_seconds=args.stall_seconds, seed=args.seed,
+    )
+    output_terminal(f"Info #100: Fake Ollama server with {len(fake_server.recordings)} recording(s) running on {fake_server.url} (models: {', '.join(fake_server.models)})", "green")
+    output_terminal(f"Info #101: Use it with: OLLAMA_HOST={fake_server.url}", "green")
+    try:
+        fake_server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        fake_server.httpd.server_close()
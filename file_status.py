@@ -0,0 +1,76 @@
+import collections # Number of files per state
+import threading # States are reported by the worker threads
+import time # Elapsed time & tokens per second
+
+STATES = ("queued", "streaming", "validating", "done", "failed", "cancelled")
+
+class FileStatusTracker:
+    '''
+    Keeps the state of every file of a generation run.
+
+    A file is 'queued' until its request is sent, 'streaming' while the model answers, 'validating'
+    while the test code is extracted, merged & saved, and finally 'done', 'failed' or 'cancelled'.
+    Every streamed chunk counts as one token (Ollama streams one token per chunk).
+    The worker threads report through 'set_state()' & 'add_tokens()'; 'rows()' returns a snapshot.
+    '''
+    def __init__(self, on_change=None):
+        '''
+        Initializes the FileStatusTracker class.
+
+        Args:
+        - on_change (callable, optional): Called without arguments after every change (from the worker threads).
+        '''
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        self.records = {} # File -> [state, tokens, start time, end time]
+
+    def reset(self, files):
+        ''' Starts a new run with all files queued. '''
+        with self.lock:
+            self.records = {file: ["queued", 0, None, None] for file in files}
+        self.notify()
+
+    def set_state(self, filename, state):
+        ''' Sets the state of a file ('streaming' starts and a final state stops its clock). '''
+        with self.lock:
+            record = self.records.setdefault(filename, ["queued", 0, None, None])
+            record[0] = state
+            if state == "streaming":
+                record[1], record[2], record[3] = 0, time.perf_counter(), None
+            elif state in ("done", "failed", "cancelled") and record[2] is not None:
+                record[3] = time.perf_counter()
+        self.notify()
+
+    def add_tokens(self, filename, count=1):
+        ''' Counts streamed tokens of a file. '''
+        with self.lock:
+            record = self.records.get(filename)
+            if record:
+                record[1] += count
+        self.notify()
+
+    def rows(self):
+        '''
+        Returns a snapshot of all files.
+
+        Return:
+        - list: (file, state, tokens, tokens per second, elapsed seconds) in the order of the run.
+        '''
+        now = time.perf_counter()
+        with self.lock:
+            records = [(file, *record) for file, record in self.records.items()]
+        rows = []
+        for file, state, tokens, start, end in records:
+            elapsed = ((end or now) - start) if start is not None else 0.0
+            rows.append((file, state, tokens, tokens / elapsed if elapsed > 0 else 0.0, elapsed))
+        return rows
+
+    def counts(self):
+        ''' Returns the number of files per state. '''
+        with self.lock:
+            return collections.Counter(record[0] for record in self.records.values())
+
+    def notify(self):
+        ''' Calls 'on_change' if it is set. '''
+        if self.on_change:
+            self.on_change()
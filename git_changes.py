@@ -0,0 +1,79 @@
+import ast # Functions & methods of a changed file
+import os # File handling and folder operations
+import re # Hunk headers of 'git diff'
+import subprocess # Run the local 'git'
+
+HUNK_PATTERN = re.compile(r"@@ -\S+ \+(\d+)(?:,(\d+))? @@")
+
+def run_git(folder_path, *args):
+    ''' Runs a 'git' command in a folder and returns its output (raises 'subprocess.CalledProcessError'). '''
+    return subprocess.run(["git", "-C", folder_path, *args], capture_output=True, text=True, encoding="utf-8", errors="replace", check=True).stdout
+
+def changed_python_lines(folder_path, revision_range):
+    '''
+    Returns the Python files below a folder that were added or modified in a revision range.
+
+    This method:
+    - Runs 'git diff -U0' once for all '.py' files below the folder (renamed files count with their new path).
+    - Reads the line numbers of the added & modified lines from the hunk headers;
+      for a pure deletion the line before the deleted lines counts as changed.
+
+    Args:
+    - folder_path (str): Folder inside a git repository.
+    - revision_range (str): Revision range as understood by 'git diff' (e.g. 'origin/main...HEAD', 'HEAD~3').
+
+    Return:
+    - dict: Absolute path -> set of changed line numbers (new version of the file).
+    '''
+    top_level = run_git(folder_path, "rev-parse", "--show-toplevel").strip()
+    diff = run_git(
+        folder_path, "-c", "core.quotePath=false", "diff", "-U0", "--no-color", "--no-ext-diff",
+        "--find-renames", "--diff-filter=AMR", revision_range, "--", "*.py",
+    )
+
+    changed = {}
+    current = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:].strip().strip('"')
+            current = None if path == "/dev/null" else os.path.normpath(os.path.join(top_level, path[2:] if path.startswith("b/") else path))
+            if current:
+                changed[current] = set()
+        elif line.startswith("@@") and current:
+            match = HUNK_PATTERN.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                changed[current].update(range(start, start + count) if count else [max(start, 1)])
+    return changed
+
+def changed_functions(file_path, changed_lines):
+    '''
+    Returns the top-level functions and methods whose line range (including decorators) contains a changed line.
+
+    Args:
+    - file_path (str): Python file.
+    - changed_lines (set): Changed line numbers.
+
+    Return:
+    - list: Names like 'function' or 'Class.method' in source order (empty if the file cannot be parsed).
+    '''
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            tree = ast.parse(file.read())
+    except (OSError, SyntaxError, ValueError, UnicodeDecodeError):
+        return []
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            functions = [(f"{node.name}.{child.name}", child) for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions = [(node.name, node)]
+        else:
+            continue
+        for name, function in functions:
+            start = min([function.lineno] + [decorator.lineno for decorator in function.decorator_list])
+            if any(start <= line <= function.end_lineno for line in changed_lines):
+                names.append(name)
+    return names
@@ -1,9 +1,16 @@
 import customtkinter as ctk # GUI framework
 import threading # For running test generation in a separate thread
-import psutil # Check if Ollama is running
+import collections # Queue of waiting generation runs
 import os # File and folder operations
 from tkinter import filedialog # Open file/folder selection dialogs
-from helpers import fetch_models, output_terminal # Load AI models & terminal logging
+import app_logging # Messages for the log console
+from helpers import output_terminal # Terminal logging
+from model_catalog import ModelCatalog # Available AI models (persisted, refreshed in the background)
+from file_status import FileStatusTracker # State of every file of a run
+from throughput import ThroughputEstimator # ETA, tokens/s & files/min of a run
+from timeline import RunTimeline # Stages of the files per worker
+from ui_bus import UIUpdateBus # Thread-safe UI updates from the worker threads
+from ollama_health import OllamaHealthChecker # Background check of the Ollama API
 
 class GenUnitApp(ctk.CTk):
     '''
@@ -27,7 +34,7 @@ class GenUnitApp(ctk.CTk):
         - Connects the user interface to the core logic ('TestGenerator')
         - Defines local properties to manage paths, models & UI elements
         - Creates the GUI through 'create_widgets()'
-        - Checks the status of the Ollama service
+        - Starts the background check of the Ollama service
 
         Parameters:
         - test_generator (TestGenerator): Instance of the core logic for test generation.
@@ -46,6 +53,7 @@ class GenUnitApp(ctk.CTk):
         self.status_label = None
         self.generate_label = None
         self.btn_generate = None
+        self.btn_cancel_scan = None
         self.btn_exclude_folder = None
         self.btn_folder = None
         self.btn_prompt_file = None
@@ -55,12 +63,49 @@ class GenUnitApp(ctk.CTk):
         self.checkbox_save_raw = None
         self.checkbox_create_log = None
         self.combo_models = None
+        self.btn_refresh_models = None
         self.progress_bar = None
+        self.throughput_label = None
+        self.throughput_job = None # Pending 'after()' of 'update_throughput_label()'
+        self.btn_preview = None
+        self.preview_window = None # Created on first use ('toggle_preview()')
+        self.btn_status_table = None
+        self.status_window = None # Created on first use ('toggle_status_table()')
+        self.btn_log = None
+        self.log_window = None # Created on first use ('toggle_log()')
+        self.btn_timeline = None
+        self.timeline_window = None # Created on first use ('toggle_timeline()')
 
         self.is_generating_tests = False
         self.generation_thread = None
+        self.queued_runs = collections.deque() # Runs started while a generation is running: (model, py_files)
+        self.prepared_files = None # Python files of the selected folder (None = not searched yet)
+        self.is_preparing = False
+        self.prepare_cancel = None # Event to cancel the running file search
         self.model_list = None
 
+        # Updates from worker threads are applied in the main loop (max. 30 frames per second)
+        self.ui_bus = UIUpdateBus(self, frame_rate=30)
+
+        # Ollama status is checked in the background, only changes are posted to the UI
+        self.health_checker = OllamaHealthChecker(lambda status: self.ui_bus.post(self.on_ollama_status, status, key="ollama"))
+
+        # Model list: stored list on launch, refreshed through the API in the background
+        self.model_catalog = ModelCatalog(on_change=lambda names: self.ui_bus.post(self.set_model_list, names, key="models"))
+
+        # State of every file of the current run (shown in the file status window)
+        self.file_status = FileStatusTracker(on_change=self.on_file_status)
+
+        # ETA from the file sizes & the measured token rate (shown below the progress bar)
+        self.throughput = ThroughputEstimator()
+
+        # Stages of every file per worker (shown in the timeline window, exported next to the log file)
+        self.timeline = RunTimeline(on_change=self.on_timeline_change)
+
+        # Last messages for the log console (collected from launch, so the history is there when it is opened)
+        self.log_buffer = app_logging.RingBufferSink(capacity=5000, on_emit=self.on_log_message)
+        app_logging.add_sink(self.log_buffer)
+
         # Build GUI
         self.create_widgets()
         self.check_ollama_status()
@@ -85,9 +130,9 @@ class GenUnitApp(ctk.CTk):
 
         
         # Main window settings
-        self.geometry("600x710")
-        self.minsize(600, 710)
-        self.maxsize(600, 710)
+        self.geometry("600x760")
+        self.minsize(600, 760)
+        self.maxsize(600, 760)
         self.title("Unit Test-Generation with AI [GenUnit]")
         self.protocol("WM_DELETE_WINDOW", self.destroy)
 
@@ -156,13 +201,16 @@ class GenUnitApp(ctk.CTk):
         lbl_model_select = ctk.CTkLabel(frame_model_selection, text=" Select AI Model:", font=("Arial", 14))
         lbl_model_select.grid(row=0, column=0, padx=(0, 10), pady=4, sticky="w")
 
-        #self.model_list = fetch_models()
-        self.model_list = fetch_models(self)
+        # Stored list of the last session (no request to Ollama, the current list is fetched in the background)
+        self.model_list = self.model_catalog.load()
 
         self.combo_models = ctk.CTkComboBox(frame_model_selection, values=self.model_list, command=self.on_model_select, width=300)
         self.combo_models.grid(row=0, column=1, padx=0, pady=4, sticky="w")
         self.combo_models.set("None")
 
+        self.btn_refresh_models = ctk.CTkButton(frame_model_selection, text="Refresh", width=70, command=self.refresh_models)
+        self.btn_refresh_models.grid(row=0, column=2, padx=5, pady=4, sticky="w")
+
         # Additional options
         frame_generate = ctk.CTkFrame(main_frame)
         frame_generate.pack(padx=10, pady=10, fill="x")
@@ -179,14 +227,41 @@ class GenUnitApp(ctk.CTk):
         self.btn_generate = ctk.CTkButton(frame_generate, text="Generate", command=self.start_test_generation)
         self.btn_generate.pack(side="top", pady=4)
 
+        # Cancel the file search (only shown while the selected folder is searched)
+        self.btn_cancel_scan = ctk.CTkButton(frame_generate, text="Cancel Scan", command=self.cancel_prepare, fg_color="grey")
+
         # Progress bar
         frame_progress = ctk.CTkFrame(main_frame)
         frame_progress.pack(padx=10, pady=10, fill="x")
 
-        self.progress_bar = ctk.CTkProgressBar(frame_progress, orientation="horizontal", width=400, mode="determinate")
-        self.progress_bar.pack(pady=10, anchor="center")
+        self.progress_bar = ctk.CTkProgressBar(frame_progress, orientation="horizontal", width=480, mode="determinate")
+        self.progress_bar.pack(pady=(10, 2), anchor="center")
         self.progress_bar.set(0.0)
 
+        # ETA, tokens per second & files per minute of the running generation
+        self.throughput_label = ctk.CTkLabel(frame_progress, text="", font=("Arial", 11))
+        self.throughput_label.pack(pady=(0, 2), anchor="center")
+
+        # Views of the run (windows created on first use)
+        frame_views = ctk.CTkFrame(frame_progress, fg_color="transparent")
+        frame_views.pack(pady=(0, 8), anchor="center")
+
+        # Live preview of the streamed output
+        self.btn_preview = ctk.CTkButton(frame_views, text="Live Preview", width=100, command=self.toggle_preview)
+        self.btn_preview.pack(side="left", padx=5)
+
+        # State of every file
+        self.btn_status_table = ctk.CTkButton(frame_views, text="File Status", width=100, command=self.toggle_status_table)
+        self.btn_status_table.pack(side="left", padx=5)
+
+        # Stages of the files per worker
+        self.btn_timeline = ctk.CTkButton(frame_views, text="Timeline", width=100, command=self.toggle_timeline)
+        self.btn_timeline.pack(side="left", padx=5)
+
+        # Log console
+        self.btn_log = ctk.CTkButton(frame_views, text="Log", width=100, command=self.toggle_log)
+        self.btn_log.pack(side="left", padx=5)
+
         # Footer with trademark & disclaimer
         trademark_label = ctk.CTkLabel(main_frame, text="© 2025 Created by Berkant - GenUnit", font=("Arial", 10))
         trademark_label.pack(pady=5, anchor="center")
@@ -262,6 +337,9 @@ class GenUnitApp(ctk.CTk):
         # Confirm successful selection in the terminal and GUI
         output_terminal(f"Info #20: Your selected folder: '{self.folder_path}'", "yellow")
 
+        # Search the Python files in the background
+        self.prepare_files()
+
     def choose_exclude_folder(self):
         '''
         Opens a dialog for selecting a subfolder to be excluded and validates the selection.
@@ -275,6 +353,7 @@ class GenUnitApp(ctk.CTk):
             - If not: Displays an error message and discards the selection
         - If the user closes the dialog without making a selection, the UI text field is cleared
         - Outputs corresponding status messages in the terminal
+        - Searches the Python files again in the background
         '''
         # Check whether a main folder has been selected
         if not self.folder_path:
@@ -293,6 +372,7 @@ class GenUnitApp(ctk.CTk):
             self.tb_excluded_folder.configure(state="normal") # Unlock text box so that we can change the text
             self.tb_excluded_folder.delete("1.0", ctk.END) # Delete text box content
             self.tb_excluded_folder.configure(state="disabled") # Deactivate text box again
+            self.prepare_files()
             return # Exit function so that no error message appears
         
         # Check whether the selected folder is within the main folder
@@ -313,6 +393,8 @@ class GenUnitApp(ctk.CTk):
             output_terminal("Error #10: The excluded folder must be a subfolder of the main folder.", "bg_red")
             self.excluded_folder_path = None
 
+        self.prepare_files()
+
     def choose_prompt_file(self):
         '''
         Opens a file dialog to select a prompt file and loads the content into the UI.
@@ -385,14 +467,35 @@ class GenUnitApp(ctk.CTk):
             output_terminal("Info #14: No model selected. Please choose an AI model.", "green")
             return "Generate"
 
-        # Update the button text with the selected model
-        new_text = f"Generate Unit Test with '{self.selected_model}'"
+        # Update the button text with the selected model (during a generation, a further run is queued)
+        new_text = f"Queue run with '{self.selected_model}'" if self.is_generating_tests else f"Generate Unit Test with '{self.selected_model}'"
         self.btn_generate.configure(text=new_text)
         
-        output_terminal(f"Info #15: Model selected: '{self.selected_model}'", "yellow")
+        details = self.model_catalog.describe(self.selected_model)
+        output_terminal(f"Info #15: Model selected: '{self.selected_model}'" + (f" ({details})" if details else ""), "yellow")
 
         return new_text
 
+    def refresh_models(self):
+        ''' Fetches the model list again in the background (manual refresh, ignores the TTL). '''
+        if not self.model_catalog.refresh(force=True):
+            output_terminal("Info #172: Model list is already being refreshed.", "green")
+
+    def set_model_list(self, model_names):
+        '''
+        Updates the model selection with a new model list (runs in the Tk main loop).
+
+        Parameters:
+        - model_names (list): The available model names.
+
+        This method:
+        - Replaces the values of the ComboBox
+        - Keeps the selected model, even if it is no longer available (the generation reports the error)
+        '''
+        self.model_list = model_names
+        self.combo_models.configure(values=model_names)
+        self.combo_models.set(self.selected_model)
+
     def set_ollama_label(self, opt):
         '''
         Updates the label for displaying the Ollama status in the user interface.
@@ -401,6 +504,7 @@ class GenUnitApp(ctk.CTk):
         - opt (str): The new status of Ollama, can be:
             - 'Online' -> Sets the label to 'Ollama Online' (green)
             - 'Offline' -> Sets the label to 'Ollama Offline' (red)
+            - 'Unresponsive' -> Sets the label to 'Ollama not responding' (orange)
             - All other values -> Sets the label to 'Error' (gray)
 
         This method:
@@ -411,11 +515,87 @@ class GenUnitApp(ctk.CTk):
             self.ollama_status_label.configure(text="Ollama Online", text_color="green")
         elif opt == "Offline":
             self.ollama_status_label.configure(text="Ollama Offline", text_color="red")
+        elif opt == "Unresponsive":
+            self.ollama_status_label.configure(text="Ollama not responding", text_color="orange")
         else:
             self.ollama_status_label.configure(text="Error", text_color="grey")
             return
     
+    # Live preview
+    def toggle_preview(self):
+        ''' Shows the live preview window (created on first use) or hides it. '''
+        if self.preview_window is None:
+            from preview_window import LivePreviewWindow # Deferred: only needed when the preview is opened
+            self.preview_window = LivePreviewWindow(self)
+            self.preview_window.show()
+        elif self.preview_window.winfo_viewable():
+            self.preview_window.hide()
+        else:
+            self.preview_window.show()
+
+    # File status
+    def toggle_status_table(self):
+        ''' Shows the file status window (created on first use) or hides it. '''
+        if self.status_window is None:
+            from status_window import StatusTableWindow # Deferred: only needed when the table is opened
+            self.status_window = StatusTableWindow(self, self.file_status)
+            self.status_window.show()
+        elif self.status_window.winfo_viewable():
+            self.status_window.withdraw()
+        else:
+            self.status_window.show()
+
+    def on_file_status(self):
+        ''' Requests a render of the file status window after a change (called from the worker threads). '''
+        if self.status_window is not None:
+            self.status_window.schedule_render()
+
+    # Timeline
+    def toggle_timeline(self):
+        ''' Shows the timeline window (created on first use) or hides it. '''
+        if self.timeline_window is None:
+            from timeline_window import TimelineWindow # Deferred: only needed when the timeline is opened
+            self.timeline_window = TimelineWindow(self, self.timeline)
+            self.timeline_window.show()
+        elif self.timeline_window.winfo_viewable():
+            self.timeline_window.withdraw()
+        else:
+            self.timeline_window.show()
+
+    def on_timeline_change(self):
+        ''' Requests a render of the timeline window after a stage change (called from the worker threads). '''
+        if self.timeline_window is not None:
+            self.timeline_window.schedule_render()
+
+    # Log console
+    def toggle_log(self):
+        ''' Shows the log console (created on first use) or hides it. '''
+        if self.log_window is None:
+            from log_window import LogWindow # Deferred: only needed when the console is opened
+            self.log_window = LogWindow(self, self.log_buffer)
+            self.log_window.show()
+        elif self.log_window.winfo_viewable():
+            self.log_window.withdraw()
+        else:
+            self.log_window.show()
+
+    def on_log_message(self):
+        ''' Requests a render of the log console after a message (called from the logging thread). '''
+        if self.log_window is not None:
+            self.log_window.schedule_render()
+
     # Status and progress
+    def in_main_thread(self):
+        ''' Returns True if called from the thread running the Tk main loop (widgets may only be changed there). '''
+        return threading.current_thread() is threading.main_thread()
+
+    def destroy(self):
+        ''' Stops the update bus and the Ollama check before the window is destroyed. '''
+        self.health_checker.stop()
+        app_logging.remove_sink(self.log_buffer)
+        self.ui_bus.close()
+        super().destroy()
+
     def set_status_label(self, msg):
         '''
         Updates the status label in the UI with a new message.
@@ -426,7 +606,11 @@ class GenUnitApp(ctk.CTk):
         This method:
         - Sets the text of the 'status_label' widget to the passed value
         - Uses the color green for the text by default
+        - Called from a worker thread, the update is posted to 'ui_bus' (only the latest status is shown)
         '''
+        if not self.in_main_thread():
+            self.ui_bus.post(self.set_status_label, msg, key="status")
+            return
         self.status_label.configure(text=msg)
 
     def set_generate_label(self, msg, color="green"):
@@ -440,7 +624,11 @@ class GenUnitApp(ctk.CTk):
         This method:
         - Sets the text of the 'generate_label' widget to the passed value
         - Uses the color green for the text by default
+        - Called from a worker thread, the update is posted to 'ui_bus' (only the latest message is shown)
         '''
+        if not self.in_main_thread():
+            self.ui_bus.post(self.set_generate_label, msg, color, key="generate")
+            return
         self.generate_label.configure(text=msg, text_color=color)
 
     def initialize_progress_bar(self, total_files):
@@ -468,16 +656,25 @@ class GenUnitApp(ctk.CTk):
         - total_files (int): The total number of files to be processed
 
         This method:
-        - Calculates the progress as a ratio of 'completed_tests / total_files'
+        - Calculates the progress from the predicted output of the files ('ThroughputEstimator', large files weigh more);
+          without a running estimate as a ratio of 'completed_tests / total_files'
         - Updates the value of the progress bar ('progress_bar')
         - Outputs a terminal message to indicate progress
         - If 'total_files == 0', a warning is issued to avoid division by zero
+        - Called from a worker thread, the update is posted to 'ui_bus' (only the latest progress is shown)
         '''
+        if not self.in_main_thread():
+            self.ui_bus.post(self.update_progress_bar, completed_tests, total_files, key="progress")
+            return
+
         if total_files == 0: # Prevent division by zero
             output_terminal(f"Warning #3: No files to process, progress bar update skipped.", "bg_yellow")
             return
 
-        progress_value = completed_tests / total_files # Value between 0.0 and 1.0
+        if self.is_generating_tests and self.test_generator.throughput is self.throughput:
+            progress_value = self.throughput.progress() # Value between 0.0 and 1.0
+        else:
+            progress_value = completed_tests / total_files # Value between 0.0 and 1.0
         self.progress_bar.set(progress_value)
 
         output_terminal(f"Info #9: Progress: {completed_tests}/{total_files} tests completed ({progress_value*100:.2f}%)", "yellow")
@@ -489,11 +686,83 @@ class GenUnitApp(ctk.CTk):
         - Sets the value of the progress bar ('progress_bar') to 0.0
         - Outputs an info message in the terminal to confirm the reset
         '''
+        if not self.in_main_thread():
+            self.ui_bus.post(self.reset_progress_bar, key="progress")
+            return
+
         # Reset progress bar
         self.progress_bar.set(0.0)
 
         output_terminal(f"Info #10: Progress bar reset.", "yellow")
 
+    # Prepare test generation
+    def prepare_files(self):
+        '''
+        Searches the Python files of the selected folder in a background thread.
+
+        This method:
+        - Cancels a search that is still running (e.g. after choosing another folder)
+        - Deactivates the 'Generate' button and shows the 'Cancel Scan' button until the search is done
+        - Shows the number of files found so far in the status label
+        - The result is stored in 'prepared_files' by 'finish_prepare()'
+        '''
+        if not self.folder_path or self.test_generator is None:
+            return
+
+        self.cancel_prepare()
+        self.prepared_files = None
+        self.prepare_cancel = threading.Event()
+        self.is_preparing = True
+        self.btn_generate.configure(state="disabled", text="Scanning folder...")
+        self.btn_cancel_scan.pack(side="top", pady=4)
+        self.set_status_label("Scanning folder...")
+
+        threading.Thread(
+            target=self.run_prepare,
+            args=(self.folder_path, self.excluded_folder_path, self.prepare_cancel),
+            daemon=True
+        ).start()
+
+    def run_prepare(self, folder_path, excluded_folder_path, cancel_event):
+        ''' Runs the file search (in the search thread) and posts the result to the main loop. '''
+        try:
+            py_files = self.test_generator.get_python_files(
+                folder_path, excluded_folder_path,
+                progress=lambda found: self.set_status_label(f"{found} Python files found..."),
+                cancel_event=cancel_event
+            )
+        except Exception as e:
+            output_terminal(f"Error #180: File search failed - {e}", "bg_red")
+            py_files = None
+        self.ui_bus.post(self.finish_prepare, py_files, cancel_event)
+
+    def finish_prepare(self, py_files, cancel_event):
+        '''
+        Stores the result of a file search and activates the 'Generate' button (runs in the Tk main loop).
+
+        Parameters:
+        - py_files (list): The Python files found (None if none were found or the search failed).
+        - cancel_event (threading.Event): Event of the search, results of outdated searches are ignored.
+        '''
+        if cancel_event is not self.prepare_cancel:
+            return # Another folder was chosen meanwhile
+
+        self.is_preparing = False
+        self.btn_cancel_scan.pack_forget()
+        self.prepared_files = None if cancel_event.is_set() else (py_files or [])
+        if not self.is_generating_tests:
+            self.update_generate_button_state(self.health_checker.status in (None, "Online"))
+
+        if self.prepared_files is None:
+            self.set_status_label("Scan cancelled.")
+        else:
+            self.set_status_label(f"Total files found: {len(self.prepared_files)}" if self.prepared_files else "No Python files found.")
+
+    def cancel_prepare(self):
+        ''' Cancels the running file search (the 'Generate' button starts a new one). '''
+        if self.is_preparing and self.prepare_cancel:
+            self.prepare_cancel.set()
+
     # Start test generation
     def start_test_generation(self): # (generate_tests)
         '''
@@ -503,14 +772,18 @@ class GenUnitApp(ctk.CTk):
         - Checks if a main folder ('folder_path') has been selected
         - Checks if a prompt file ('tb_chosen_prompt_file') is loaded
         - Ensures that an AI model ('selected_model') has been selected
-        - Searches for Python files in the specified folder (and excludes subfolders if necessary)
+        - Uses the Python files found by 'prepare_files()' (starts the search if it has not run yet)
         - If no Python files are found, the process is aborted
         - Displays the number of files found and updates the UI status
         - Initializes the progress bar
-        - Deactivates relevant UI elements to prevent changes during generation
-        - Starts the test generation in a separate thread to avoid blocking the GUI
-        - Tracks the progress of the generation with 'check_generation_completion()'
+        - If a generation is already running, queues the run (started as soon as the current one is done)
+        - Otherwise starts the run with 'start_run()'
         '''
+        # The test generation logic is still being loaded (see 'main.py')
+        if self.test_generator is None:
+            self.set_status_label("Starting up, please try again.")
+            return
+
         # Check if main folder is selected
         if not self.folder_path:
             output_terminal("Error #1-Please choose a folder.", "bg_red")
@@ -532,8 +805,11 @@ class GenUnitApp(ctk.CTk):
         output_terminal(f"Info #1-Mardown-Checkbox Status is: {self.checkbox_save_raw.get()}", "green")
         output_terminal(f"Info #2-Log-Checkbox Status is: {self.checkbox_create_log.get()}", "green")
 
-        # Search for Python files in the selected folder
-        py_files = self.test_generator.get_python_files(self.folder_path, self.excluded_folder_path)
+        # Python files of the selected folder (searched in the background when the folder was chosen)
+        if self.prepared_files is None:
+            self.prepare_files()
+            return
+        py_files = self.prepared_files
 
         # If no Python files were found, end the generation
         if not py_files:
@@ -541,12 +817,35 @@ class GenUnitApp(ctk.CTk):
             self.set_status_label("No Python files found.")
             return
 
+        # A generation is running: queue the run
+        if self.is_generating_tests:
+            self.queued_runs.append((self.selected_model, py_files))
+            output_terminal(f"Info #170: Run with '{self.selected_model}' queued ({len(self.queued_runs)} waiting).", "yellow")
+            return
+
+        self.start_run(self.selected_model, py_files)
+
+    def start_run(self, model_name, py_files):
+        '''
+        Starts a test generation run in a separate thread.
+
+        Parameters:
+        - model_name (str): The AI model of the run.
+        - py_files (list): The Python files to be processed.
+
+        This method:
+        - Displays the number of files found and updates the UI status
+        - Initializes the progress bar
+        - Deactivates relevant UI elements to prevent changes during generation
+          (the model selection & the 'Generate' button stay active to queue further runs)
+        - Starts the test generation in a separate thread to avoid blocking the GUI
+        '''
         # Display the number of files found
         total_files = len(py_files)
         output_terminal(f"Info #3-Found {total_files} Python file(s): {', '.join(os.path.basename(f) for f in py_files)}", "yellow")
         
         # Update status for current generation
-        self.set_generate_label("Generation in progress...")
+        self.set_generate_label(f"Generation in progress ({model_name})...")
         self.set_status_label(f"Total files found: {total_files}")
 
         # Initialize the progress bar
@@ -554,74 +853,130 @@ class GenUnitApp(ctk.CTk):
 
         # Start the generation
         self.is_generating_tests = True # Set variable that the generation is running
-        self.btn_generate.configure(state="disabled", text="Generating, please wait...")
+        self.test_generator.error = False
+        self.test_generator.file_status = self.file_status
+        self.test_generator.throughput = self.throughput
+        self.test_generator.timeline = self.timeline
+        self.btn_generate.configure(state="normal", text=self.on_model_select(self.selected_model))
         self.btn_exclude_folder.configure(state="disabled")
         self.btn_folder.configure(state="disabled")
         self.btn_prompt_file.configure(state="disabled")
-        self.combo_models.configure(state="disabled")
         self.checkbox_save_raw.configure(state="disabled")
         self.checkbox_create_log.configure(state="disabled")
 
         # Start the generation in a separate thread to avoid blocking the GUI
         self.generation_thread = threading.Thread(
-            target=self.test_generator.generate_tests_for_folder, 
-            args=(self.selected_model, total_files, py_files), 
+            target=self.run_generation, 
+            args=(model_name, py_files), 
             daemon=True
         )
         self.generation_thread.start()
-        
-        # Track the progress of the generation
-        self.test_generator.check_generation_completion()
+        if self.throughput_job is None:
+            self.throughput_job = self.after(1000, self.update_throughput_label)
+        if self.timeline_window is not None:
+            self.timeline_window.start_ticking()
+
+    def update_throughput_label(self):
+        '''
+        Shows ETA, tokens per second & files per minute of the running generation (every second while it runs).
+
+        This method:
+        - Updates the label below the progress bar from the 'ThroughputEstimator'
+        - Moves the progress bar with the streamed tokens, not only when a file is finished
+        - Stops when the generation is done (the label keeps the last rates)
+        '''
+        self.throughput_job = None
+        if not self.is_generating_tests:
+            return
+        self.throughput_label.configure(text=self.throughput.summary())
+        self.progress_bar.set(self.throughput.progress())
+        self.throughput_job = self.after(1000, self.update_throughput_label)
+
+    def run_generation(self, model_name, py_files):
+        '''
+        Runs the test generation (in the generation thread) and reports its end to the main loop.
+
+        The completion is posted to 'ui_bus' when the run ends (also after an unexpected error),
+        so the UI is updated immediately and no timer polls the thread.
+        '''
+        try:
+            self.test_generator.generate_tests_for_folder(model_name, len(py_files), py_files)
+        except Exception as e:
+            self.test_generator.error = True
+            output_terminal(f"Error #170: Generation with '{model_name}' failed - {e}", "bg_red")
+        finally:
+            self.ui_bus.post(self.finish_run)
+
+    def finish_run(self):
+        '''
+        Handles the end of a generation run (runs in the Tk main loop).
+
+        This method:
+        - Reports the result and resets the UI through 'generation_completed()'
+        - Starts the next queued run, if there is one; otherwise searches the Python files again
+        '''
+        self.test_generator.generation_completed()
+        self.throughput_label.configure(text=self.throughput.summary())
+        if self.queued_runs:
+            model_name, py_files = self.queued_runs.popleft()
+            output_terminal(f"Info #171: Starting queued run with '{model_name}' ({len(self.queued_runs)} waiting).", "yellow")
+            self.start_run(model_name, py_files)
+            return
+
+        self.model_catalog.refresh() # Load newly pulled models if the list is older than its TTL
+        self.prepare_files() # Files changed meanwhile are part of the next run ('Generate' is enabled when the search is done)
 
     # Check Ollama status
     def check_ollama_status(self):
         '''
-        Checks the current status of the Ollama process and updates the UI accordingly.
+        Starts the background check of the Ollama API or, if it is already running, checks immediately.
 
         This method:
         - Ensures that all required GUI elements are present
-        - Checks whether a process with the name “ollama” is active ('psutil.process_iter()')
-        - If Ollama is running:
-            - The status label is set to 'Ollama Online'
-            - The 'Generate' button is activated (if no generation is running)
-        - If Ollama is not running:
-            - The status label is set to 'Ollama Offline'
-            - The 'Generate' button is deactivated
-        - Repeats the check every 5 seconds ('self.after(5000, self.check_ollama_status)')
-        - Outputs info or error messages in the terminal if an error occurs
+        - Starts the 'OllamaHealthChecker' thread ('GET /api/version' with a short timeout),
+          so the Tk main loop is never blocked by the check
+        - Each change of the status is posted to 'ui_bus' and applied by 'on_ollama_status()'
         '''
         # Check whether all GUI elements are present
         if not all([self.ollama_status_label, self.btn_generate, self.generate_label]):
             output_terminal(f"Error #12: Some GUI elements are None! The interface might not be fully initialized.", "red")
             return # If GUI is not ready, cancel
 
-        try:
-            # Check whether a process with “ollama” in its name is running
-            ollama_running = any("ollama" in (proc.info.get("name", "").lower()) for proc in psutil.process_iter(["name"]))
-
-            if ollama_running:
-                # Ollama is active → Update status
-                self.set_ollama_label("Online")
-                output_terminal("Info #21: Ollama is Online!", "green")
-            else:
-                # Ollama is not active → Update status
-                self.set_ollama_label("Offline")
-                output_terminal("Warning #7: Ollama is Offline!", "bg_yellow")
-
-            # Aktualisiere UI-Elemente nur, wenn kein Test generiert wird
-            if not self.is_generating_tests:
-                self.update_generate_button_state(ollama_running)
-
-            # Repeat the check
-            self.after(5000, self.check_ollama_status)
-            output_terminal("Info #22: Checking Ollama status..", "green")
+        if self.health_checker.thread is None:
+            self.health_checker.start()
+        else:
+            self.health_checker.check_now()
 
-        except Exception as e:
-            # Error handling if `psutil.process_iter()` fails
-            output_terminal(f"Error: Could not check Ollama status - {e}", "red")
+    def on_ollama_status(self, status):
+        '''
+        Applies a changed Ollama status to the UI (runs in the Tk main loop).
+
+        Parameters:
+        - status (str): 'Online', 'Offline' or 'Unresponsive' (process running, but the API does not answer).
+
+        This method:
+        - Updates the Ollama status label
+        - Activates or deactivates the 'Generate' button (only if no generation is running)
+        '''
+        self.set_ollama_label(status)
+        if status == "Online":
+            output_terminal(f"Info #21: Ollama is Online! (version {self.health_checker.version})", "green")
+        else:
+            output_terminal(f"Warning #7: Ollama is {status}!", "bg_yellow")
+
+        # Update UI elements only if no test is being generated
+        if not self.is_generating_tests:
+            self.update_generate_button_state(status == "Online")
+
+        # Ollama (re)started: load the current model list if the stored one is outdated
+        if status == "Online":
+            self.model_catalog.refresh()
 
     def update_generate_button_state(self, ollama_running):
         ''' Updates the generate button and status labels based on Ollama's status. '''
+        if ollama_running and self.is_preparing:
+            return # Activated when the file search is done ('finish_prepare()')
+
         if ollama_running:
             # Activate button only if no generation is running
             self.generate_label.configure(text="Ready", text_color="green")
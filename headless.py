@@ -0,0 +1,229 @@
+import argparse # Command line options
+import os # File handling and folder operations
+import app_logging # Log level, log file & rate limit of the messages
+from cassette import CassettePlayer, CassetteRecorder # Record & replay model interactions
+from core import TestGenerator # Import the test generation logic
+from datetime import datetime # Timestamp in the cassette file name
+from helpers import output_terminal # Print colored messages to the terminal
+from source_selection import SourceSelector # Decide which files are sent to the model
+from throughput import ThroughputEstimator # ETA, tokens/s & files/min of the run
+from timeline import RunTimeline # Stages of the files per worker
+from tracing import Tracer # Spans of the pipeline stages
+
+class HeadlessValue:
+    '''
+    Stand-in for a text box or checkbox of the GUI.
+
+    'get()' returns a fixed value, 'configure()' is ignored.
+    '''
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, *args):
+        return self.value
+
+    def configure(self, **kwargs):
+        pass
+
+class HeadlessApp:
+    '''
+    Provides the part of the 'GenUnitApp' interface used by 'TestGenerator', without a window.
+
+    Used for command line runs, benchmarks and CI, where no display is available.
+    Status and progress are kept as attributes and printed to the terminal unless 'quiet' is set
+    (with ETA, tokens per second & files per minute from 'throughput').
+    '''
+    def __init__(self, folder_path, prompt_text, excluded_folder_path=None, save_raw=True, create_log=True, quiet=False):
+        '''
+        Initializes the HeadlessApp class.
+
+        Args:
+        - folder_path (str): Folder with the Python files.
+        - prompt_text (str): Prompt for the test generation.
+        - excluded_folder_path (str, optional): Subfolder to skip.
+        - save_raw (bool): Save the raw AI response as Markdown.
+        - create_log (bool): Write a log file.
+        - quiet (bool): Do not print status & progress updates.
+        '''
+        self.folder_path = folder_path
+        self.excluded_folder_path = excluded_folder_path
+        self.tb_chosen_prompt_file = HeadlessValue(prompt_text)
+        self.checkbox_save_raw = HeadlessValue(1 if save_raw else 0)
+        self.checkbox_create_log = HeadlessValue(1 if create_log else 0)
+        self.quiet = quiet
+
+        self.is_generating_tests = False
+        self.status = "OK"
+        self.progress = 0.0
+        self.throughput = ThroughputEstimator()
+
+    def set_status_label(self, msg):
+        ''' Stores (and prints) the status message. '''
+        self.status = msg
+        if not self.quiet:
+            output_terminal(f"Status: {msg}", "green")
+
+    def set_generate_label(self, msg, color="green"):
+        ''' Prints the generation status. '''
+        if not self.quiet:
+            output_terminal(f"Generation: {msg}", color)
+
+    def update_progress_bar(self, completed_tests, total_files):
+        ''' Stores the progress as a value between 0.0 and 1.0 (weighted by the predicted output of the files) and prints the ETA. '''
+        if self.throughput.sizes:
+            self.progress = self.throughput.progress()
+        else:
+            self.progress = completed_tests / total_files if total_files else 0.0
+        if not self.quiet:
+            output_terminal(f"Info #185: {completed_tests}/{total_files} files | {self.throughput.summary()}", "green")
+
+    def reset_progress_bar(self):
+        ''' Resets the progress. '''
+        self.progress = 0.0
+
+def load_prompt(folder_path, prompt_file=None):
+    '''
+    Reads the prompt file (default: 'prompt.{txt,md,doc}' in the folder, same lookup as 'GenUnitApp.choose_folder()').
+
+    Return:
+    - str: The prompt (None if no prompt file was found).
+    '''
+    prompt_path = prompt_file or next(
+        (os.path.join(folder_path, f"prompt.{ext}") for ext in ["txt", "md", "doc"] if os.path.exists(os.path.join(folder_path, f"prompt.{ext}"))),
+        None,
+    )
+    if not prompt_path:
+        return None
+    with open(prompt_path, "r", encoding="utf-8") as file:
+        return file.read().strip()
+
+def run_headless(folder_path, prompt_text, model_name, excluded_folder_path=None, save_raw=True, create_log=True, max_workers=None, quiet=False, model_client=None, discovery_workers=None, source_selector=None, show_skipped=False, git_range=None, changed_functions_only=False, incremental=False, timeline_path=None, trace_spans=False, profile=None):
+    '''
+    Generates unit tests for a folder without the GUI.
+
+    Args:
+    - folder_path (str): Folder with the Python files.
+    - prompt_text (str): Prompt for the test generation.
+    - model_name (str): The AI model used.
+    - excluded_folder_path (str, optional): Subfolder to skip.
+    - save_raw (bool): Save the raw AI response as Markdown.
+    - create_log (bool): Write a log file.
+    - max_workers (int, optional): Number of parallel model requests.
+    - quiet (bool): Do not print status & progress updates.
+    - model_client (object, optional): Replaces the 'ollama' module (e.g. 'CassetteRecorder', 'CassettePlayer').
+    - discovery_workers (int, optional): Number of parallel folder scans while searching for Python files.
+    - source_selector (SourceSelector, optional): Rules which files are sent to the model.
+    - show_skipped (bool): Print every skipped file & folder with its reason.
+    - git_range (str, optional): Only files added or modified in this git revision range (e.g. 'origin/main...HEAD').
+    - changed_functions_only (bool): With 'git_range', only tests for the changed functions.
+    - incremental (bool): Only tests for functions changed since the last generation, merged into the existing test files.
+    - timeline_path (str, optional): Record the stages of every file per worker and save them as Chrome trace-event JSON.
+    - trace_spans (bool): Record the spans of the pipeline stages (summary printed & saved next to the log file).
+    - profile (str, optional): Profile the run with 'cprofile' or 'tracemalloc' (saved next to the log file).
+
+    Return:
+    - bool: True if all tests were generated.
+    '''
+    app = HeadlessApp(folder_path, prompt_text, excluded_folder_path, save_raw, create_log, quiet)
+    test_generator = TestGenerator(app)
+    test_generator.max_workers = max_workers
+    test_generator.discovery_workers = discovery_workers
+    test_generator.incremental = incremental
+    test_generator.throughput = app.throughput
+    if timeline_path:
+        test_generator.timeline = RunTimeline()
+    if trace_spans:
+        test_generator.tracer = Tracer()
+    if profile:
+        test_generator.profile_mode = profile
+    if source_selector is not None:
+        test_generator.source_selector = source_selector
+    if model_client is not None:
+        test_generator.model_client = model_client
+
+    py_files = test_generator.get_python_files(folder_path, excluded_folder_path)
+    if py_files and git_range:
+        py_files = test_generator.filter_changed_files(folder_path, py_files, git_range, changed_functions_only)
+        if py_files is None:
+            return False
+        if not py_files:
+            output_terminal(f"Info #141: No changed Python files in {git_range}, nothing to generate.", "blue")
+            return True
+    if show_skipped:
+        for skipped_path, reason in test_generator.skipped:
+            output_terminal(f"Info #122: Skipped {skipped_path} ({reason})", "blue")
+    if not py_files:
+        output_terminal("Warning #1-No Python files found in the selected folder.", "bg_yellow")
+        return False
+
+    app.is_generating_tests = True
+    test_generator.generate_tests_for_folder(model_name, len(py_files), py_files)
+    app.is_generating_tests = False
+    if timeline_path:
+        test_generator.timeline.save(timeline_path)
+        output_terminal(f"Info #186: Timeline saved (open in chrome://tracing or ui.perfetto.dev): {timeline_path}", "yellow")
+    return not test_generator.error
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate unit tests without the GUI.")
+    parser.add_argument("--folder", required=True, help="Folder with the Python files")
+    parser.add_argument("--model", required=True, help="Ollama model name")
+    parser.add_argument("--prompt-file", default=None, help="Prompt file (default: prompt.{txt,md,doc} in the folder)")
+    parser.add_argument("--exclude", action="append", default=[], help="Subfolder to skip (repeatable)")
+    parser.add_argument("--include-glob", action="append", default=[], help="Only files matching this pattern, e.g. 'src/**/*.py' (repeatable)")
+    parser.add_argument("--exclude-glob", action="append", default=[], help="Skip files & folders matching this pattern, e.g. '*_pb2.py' (repeatable)")
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not skip files ignored by '.gitignore'")
+    parser.add_argument("--min-complexity", type=int, default=0, help="Skip files with fewer functions, classes & branches")
+    parser.add_argument("--max-size", type=int, default=None, help="Skip files larger than this many bytes")
+    parser.add_argument("--git-range", default=None, help="Only files added or modified in this git revision range, e.g. 'origin/main...HEAD'")
+    parser.add_argument("--changed-functions", action="store_true", help="With --git-range: only tests for the changed functions")
+    parser.add_argument("--incremental", action="store_true", help="Only tests for functions changed since the last generation, merged into the existing test files")
+    parser.add_argument("--show-skipped", action="store_true", help="Print every skipped file & folder with its reason")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel model requests")
+    parser.add_argument("--discovery-workers", type=int, default=None, help="Number of parallel folder scans while searching for Python files")
+    parser.add_argument("--no-markdown", action="store_true", help="Do not save the raw AI response")
+    parser.add_argument("--no-log", action="store_true", help="Do not write a log file")
+    parser.add_argument("--record-cassette", nargs="?", const="", default=None, metavar="PATH", help="Record all model interactions (default: Tests/unit_test_cassette-<model>-<time>.jsonl.gz)")
+    parser.add_argument("--replay-cassette", nargs="+", default=None, metavar="PATH", help="Replay recorded model interactions instead of calling Ollama")
+    parser.add_argument("--realtime", action="store_true", help="Replay with the recorded chunk timings")
+    parser.add_argument("--timeline", default=None, metavar="PATH", help="Save the stages of every file per worker as Chrome trace-event JSON")
+    parser.add_argument("--trace-spans", action="store_true", help="Record how long every pipeline stage takes (same as GENUNIT_TRACE=1)")
+    parser.add_argument("--profile", choices=["cprofile", "tracemalloc"], default=None, help="Profile the run (same as GENUNIT_PROFILE=<mode>)")
+    parser.add_argument("--log-level", default="INFO", choices=list(app_logging.LEVELS), help="Lowest level printed on the terminal")
+    parser.add_argument("--log-file", default=None, help="Also write all messages (every level, not rate limited) to this file")
+    parser.add_argument("--log-rate-limit", type=int, default=20, help="Maximum terminal messages with the same tag per second (0 = unlimited)")
+    args = parser.parse_args()
+    app_logging.configure(args.log_level, args.log_file, rate_limit=args.log_rate_limit or None)
+
+    prompt = load_prompt(args.folder, args.prompt_file)
+    if prompt is None:
+        output_terminal("Error #2-No prompt selected.", "bg_red")
+        raise SystemExit(2)
+
+    # Record or replay the model interactions
+    model_client = None
+    if args.replay_cassette:
+        model_client = CassettePlayer(args.replay_cassette, realtime=args.realtime)
+        output_terminal(f"Info #120: Replaying {len(model_client)} recorded interactions.", "yellow")
+    elif args.record_cassette is not None:
+        cassette_path = args.record_cassette or os.path.join(
+            args.folder, "Tests", f"unit_test_cassette-{args.model.replace(':', '_')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(cassette_path)), exist_ok=True)
+        model_client = CassetteRecorder(cassette_path)
+
+    source_selector = SourceSelector(
+        include_globs=args.include_glob, exclude_globs=args.exclude_glob, excluded_folders=args.exclude,
+        use_gitignore=not args.no_gitignore, min_complexity=args.min_complexity, max_size=args.max_size,
+    )
+    success = run_headless(
+        args.folder, prompt, args.model, save_raw=not args.no_markdown,
+        create_log=not args.no_log, max_workers=args.workers, model_client=model_client,
+        discovery_workers=args.discovery_workers, source_selector=source_selector, show_skipped=args.show_skipped,
+        git_range=args.git_range, changed_functions_only=args.changed_functions, incremental=args.incremental,
+        timeline_path=args.timeline, trace_spans=args.trace_spans, profile=args.profile,
+    )
+
+    if isinstance(model_client, CassetteRecorder):
+        output_terminal(f"Info #121: Cassette saved ({model_client.count} interactions): {model_client.path}", "yellow")
+    raise SystemExit(0 if success else 1)
@@ -1,78 +1,96 @@
-import subprocess # Run system commands (fetch AI models from terminal)
-
-model_names_cache = None # Cache as a global variable so that it remains saved
+import app_logging # Leveled, non-blocking logging (terminal, file & GUI console)
 
 # Logging-Funktion
 def output_terminal(msg, color):
     '''
-    Prints a color-coded message on the terminal for debugging purposes.
+    Logs a color-coded message (terminal, optional log file & the log console of the GUI).
 
     Process:
-    - Assigns predefined colors to ANSI escape codes.
-    - Formats the message with the selected color.
-    - Resets the color after the message so as not to affect further terminal output.
+    - Derives the level from the tag of the message ('Error #..', 'Warning #..', 'Info #..') or its color.
+    - Queues the message; a background thread writes it to the sinks (see 'app_logging'),
+      so worker threads never wait for the terminal.
+    - Repetitive messages are rate limited on the terminal and in the console.
 
     Args:
     - msg (str): The message to be displayed in the terminal.
-    - color (str): The color name ('red', 'green', 'yellow', 'blue', 'reset').
+    - color (str): The color name ('red', 'green', 'yellow', 'blue', 'bg_red', 'bg_yellow', 'reset').
     '''
-    all_colors = {
-        "red": "\033[31m",          # red text
-        "green": "\033[32m",        # green text
-        "yellow": "\033[33m",       # yellow text
-        "blue": "\033[34m",         # blue text
-        "bg_red": "\033[41m",       # red background
-        "bg_yellow": "\033[43m",    # yellow background
-        "reset": "\033[0m"          # Reset to standard
-    }
+    app_logging.log_message(msg, color)
+
+# Response processing
+def extract_python_code(generated_output):
+    '''
+    Extracts the Python code blocks from a raw AI response.
+
+    This method:
+    - Collects all lines between a '```python' line and the closing '```' line.
+    - Ignores all text outside of the code blocks (explanations, notes, etc.).
+
+    Args:
+    - generated_output (str): Unprocessed response generated by the AI.
+
+    Return:
+    - str: The extracted Python code (empty if no code block was found).
+    '''
+    python_code_lines = []
+    in_code_block = False
+
+    for line in generated_output.splitlines():
+        if line.strip() == "```python":
+            in_code_block = True
+            continue
+        elif line.strip() == "```" and in_code_block:
+            in_code_block = False
+            continue
+        if in_code_block:
+            python_code_lines.append(line)
 
-    color_code = all_colors.get(color, all_colors["reset"]) # Standard color as Fallback
-    print(f"{color_code}{msg}{all_colors['reset']}") # Resets color at the end
+    return "\n".join(python_code_lines)
 
-# Ollama functionality
-def fetch_models(gui_instance):
+def read_markdown_record(md_path):
     '''
-    Prints a color-coded message on the terminal for debugging purposes.
+    Reads a Markdown file written by 'TestGenerator.save_files()'.
 
     This method:
-    - Assigns predefined colors to ANSI escape codes.
-    - Formats the message with the selected color.
-    - Resets the color after the message so as not to affect further terminal output.
+    - Takes the original file & the model from the header lines before the prompt.
+    - Takes the prompt from the '### Prompt' header up to the '### Generated Output' header.
+    - Takes the raw AI response from the '### Generated Output' header up to the end of the file,
+      so '### ' headings written by the model stay part of the response.
+    - Removes the outer '```' fence of prompt & response (the text between the first and the last '```' line).
 
     Args:
-    - msg (str): The message to be displayed in the terminal.
-    - color (str): The color name ('red', 'green”, 'yellow', 'blue', 'reset').
+    - md_path (str): Path to the '.md' file.
+
+    Return:
+    - dict: 'original_file', 'model', 'prompt', 'response' and 'path' (None if the file has no '### Generated Output').
     '''
-    global model_names_cache
-    
-    # If models are already stored in the cache, use them directly (performance optimization)
-    if model_names_cache is not None: # Prevents the cache from being overwritten again and again
-        output_terminal("Info #11: Using cached model list.", "green")
-        return model_names_cache
-        
-    try:
-        # Execute the command `ollama list` to load models from the terminal
-        output_terminal("Info #12: Fetching available AI models...", "green")
-
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True, check=True)
-
-        # Process the terminal output: Extract only the model names (first column of the output)
-        model_names = [line.split()[0] for line in result.stdout.splitlines() if not line.startswith("NAME")]
-
-        # Save the models in the cache to avoid repeated queries
-        model_names_cache = model_names
-
-        output_terminal(f"Info #13: Available AI models: {', '.join(model_names)}", "green")
-
-        return model_names
-    
-    except FileNotFoundError as e:
-        # Error handling if ollama is not installed on OS
-        gui_instance.set_ollama_label("PathError")
-        output_terminal(f"Error #14: Ollama not found! Make sure Ollama is installed and added to the system PATH. - {e}", "bg_red")
-        return [] # Fallback: Return of an empty list
-
-    except subprocess.CalledProcessError as e:
-        # Error handling if `ollama list` fails
-        output_terminal(f"Error #7: Failed to fetch models using 'ollama list': {e}", "bg_red")
-        return [] # Fallback: Return of an empty list
+    with open(md_path, "r", encoding="utf-8") as md_file:
+        lines = md_file.read().splitlines()
+
+    output_index = next((index for index, line in enumerate(lines) if line.startswith("### Generated Output")), None)
+    if output_index is None:
+        return None
+    prompt_index = next((index for index, line in enumerate(lines[:output_index]) if line.startswith("### Prompt")), output_index)
+
+    original_file = ""
+    model = ""
+    for line in lines[:prompt_index]:
+        if line.startswith("## Original File:"):
+            original_file = line[len("## Original File:"):].strip()
+        elif line.startswith("### Model:"):
+            model = line[len("### Model:"):].strip()
+
+    return {
+        "original_file": original_file,
+        "model": model,
+        "prompt": fenced_text(lines[prompt_index + 1:output_index]),
+        "response": fenced_text(lines[output_index + 1:]),
+        "path": md_path,
+    }
+
+def fenced_text(section_lines):
+    ''' Returns the text between the first and the last '```' line of a section (or the whole section). '''
+    fences = [index for index, line in enumerate(section_lines) if line.strip().startswith("```")]
+    if len(fences) < 2:
+        return "\n".join(section_lines).strip()
+    return "\n".join(section_lines[fences[0] + 1:fences[-1]])
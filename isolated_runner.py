@@ -0,0 +1,331 @@
+import ast # Determine the executable lines of a source file
+import importlib.util # Load the module under test and the generated test file from a path
+import io # Collect the unittest output in memory
+import json # Exchange configuration & results with the worker process
+import os # File and folder operations
+import subprocess # Run every test file in its own isolated process
+import sys # Python interpreter, module cache & tracing
+import tempfile # Working directory & config files for the worker
+import threading # Trace code that is executed in threads
+import time # Measure the runtime of a test run
+import unittest # Framework used by the generated tests
+
+# Module names the AI models use instead of the real module name ('from your_module import ...')
+PLACEHOLDER_MODULES = ["your_module", "your_script_name", "your_script", "your_code", "your_file", "main", "module", "code_to_test"]
+
+class LineTracer:
+    '''
+    Records executed lines and line transitions (arcs) of a single source file.
+
+    The tracer is installed with 'sys.settrace()' and ignores every frame
+    that does not belong to the traced file, so the overhead stays limited
+    to the module under test.
+    '''
+    def __init__(self, filename):
+        '''
+        Initializes the tracer.
+
+        Args:
+        - filename (str): Absolute path of the file whose lines are recorded.
+        '''
+        self.filename = filename
+        self.lines = set()
+        self.arcs = set()
+        self.last_line = {} # Last executed line per frame
+
+    def global_trace(self, frame, event, arg):
+        ''' Activates line tracing only for frames of the traced file. '''
+        if event == "call" and frame.f_code.co_filename == self.filename:
+            return self.local_trace
+        return None
+
+    def local_trace(self, frame, event, arg):
+        ''' Records lines and arcs; a return is stored as an arc to the negative first line of the code object. '''
+        if event == "line":
+            line = frame.f_lineno
+            last = self.last_line.get(frame)
+            self.lines.add(line)
+            if last is not None:
+                self.arcs.add((last, line))
+            self.last_line[frame] = line
+        elif event == "return":
+            last = self.last_line.pop(frame, None)
+            if last is not None:
+                self.arcs.add((last, -frame.f_code.co_firstlineno))
+        return self.local_trace
+
+    def start(self):
+        ''' Starts tracing for the current and all new threads. '''
+        threading.settrace(self.global_trace)
+        sys.settrace(self.global_trace)
+
+    def stop(self):
+        ''' Stops tracing. '''
+        sys.settrace(None)
+        threading.settrace(None)
+
+# Test execution
+def run_test_file(test_path, source_path, timeout=60, collect_coverage=False, failfast=False, module_name=None, test_ids=None, extra_paths=None):
+    '''
+    Runs a generated unit test file against a source module in an isolated process.
+
+    This method:
+    - Writes the run configuration to a temporary file.
+    - Starts a new Python process ('--worker' mode of this module) in an empty working directory.
+    - Kills the process if it exceeds the timeout.
+    - Reads the JSON result written by the worker.
+
+    Args:
+    - test_path (str): Path to the 'unit_test_*.py' file.
+    - source_path (str): Path to the module under test (can be a mutated copy).
+    - timeout (float): Maximum runtime of the process in seconds.
+    - collect_coverage (bool): Records executed lines and arcs of the source module.
+    - failfast (bool): Stops at the first failing test.
+    - module_name (str, optional): Import name of the module (default: file name of 'source_path').
+    - test_ids (list, optional): Only runs the tests with these ids ('Class.method').
+    - extra_paths (list, optional): Additional folders for imports (e.g. the folder of the original module).
+
+    Return:
+    - dict: 'status' ('passed', 'failed', 'error', 'timeout'), 'tests_run', 'failures',
+      'errors', 'skipped', 'duration', 'message', 'passed_tests' and with coverage 'lines' and 'arcs'.
+    '''
+    module_name = module_name or os.path.splitext(os.path.basename(source_path))[0]
+    start_time = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="genunit_run_") as work_dir:
+        config_path = os.path.join(work_dir, "run_config.json")
+        result_path = os.path.join(work_dir, "run_result.json")
+        config = {
+            "test_path": os.path.abspath(test_path),
+            "source_path": os.path.abspath(source_path),
+            "module_name": module_name,
+            "result_path": result_path,
+            "collect_coverage": collect_coverage,
+            "failfast": failfast,
+            "test_ids": list(test_ids) if test_ids is not None else None,
+            "extra_paths": [os.path.abspath(path) for path in extra_paths or []],
+        }
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump(config, config_file)
+
+        try:
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", config_path],
+                cwd=work_dir, capture_output=True, text=True, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return empty_result("timeout", f"Test run exceeded {timeout} seconds.", time.perf_counter() - start_time)
+
+        if not os.path.exists(result_path):
+            stderr_tail = process.stderr.strip().splitlines()[-1:] if process.stderr else []
+            return empty_result("error", f"Worker exited with code {process.returncode}. {' '.join(stderr_tail)}".strip(), time.perf_counter() - start_time)
+
+        with open(result_path, "r", encoding="utf-8") as result_file:
+            result = json.load(result_file)
+
+    result["duration"] = time.perf_counter() - start_time
+    return result
+
+def empty_result(status, message, duration=0.0):
+    ''' Returns a result dictionary for a run that produced no test results. '''
+    return {
+        "status": status,
+        "tests_run": 0,
+        "failures": 0,
+        "errors": 0,
+        "skipped": 0,
+        "duration": duration,
+        "message": message,
+        "passed_tests": [],
+        "lines": [],
+        "arcs": [],
+    }
+
+def executable_lines(source_text):
+    '''
+    Returns the first line of every executable statement of a source file (without docstrings).
+
+    Used together with the traced 'lines' of a run to calculate the line coverage.
+    '''
+    return statement_lines(ast.parse(source_text))
+
+def statement_lines(root_node):
+    ''' Returns the first line of every executable statement below an AST node (module or function, without docstrings). '''
+    lines = set()
+    for node in ast.walk(root_node):
+        if node is root_node or not isinstance(node, ast.stmt):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            continue # Docstrings are not executed
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.decorator_list:
+            lines.add(node.decorator_list[0].lineno)
+        else:
+            lines.add(node.lineno)
+    return lines
+
+# Discovery of generated tests
+def index_source_modules(sources_root):
+    '''
+    Maps module names to their Python files below a source folder.
+
+    Return:
+    - dict: Module name -> path of the source file.
+    '''
+    modules = {}
+    for dirpath, _, files in os.walk(sources_root):
+        for file in files:
+            if file.endswith(".py") and not file.startswith("unit_test_"):
+                modules.setdefault(file[:-3], os.path.join(dirpath, file))
+    return modules
+
+def match_source_module(test_filename, modules):
+    '''
+    Finds the module under test for a generated test file name.
+
+    Supports the archived names ('unit_test_<module>.py') and the names written by
+    'TestGenerator.save_files()' ('unit_test_<module>_<model>.py') by taking the
+    longest module name that matches the start of the file name.
+
+    Return:
+    - str: The module name or None if no module matches.
+    '''
+    stem = os.path.splitext(test_filename)[0][len("unit_test_"):]
+    candidates = [name for name in modules if stem == name or stem.startswith(name + "_")]
+    return max(candidates, key=len) if candidates else None
+
+def find_test_cells(results_root, sources_root):
+    '''
+    Walks a results tree like 'Testcodes/<prompt>/<model>/' and pairs every generated test with its source module.
+
+    Return:
+    - list: Dictionaries with 'prompt', 'model', 'module', 'test_path' and 'source_path'.
+    '''
+    modules = index_source_modules(sources_root)
+    cells = []
+
+    for dirpath, dirnames, files in os.walk(results_root):
+        dirnames.sort()
+        relative_parts = os.path.relpath(dirpath, results_root).split(os.sep)
+        for file in sorted(files):
+            if not (file.startswith("unit_test_") and file.endswith(".py")):
+                continue
+            module_name = match_source_module(file, modules)
+            if module_name is None:
+                continue
+            cells.append({
+                "prompt": relative_parts[0] if len(relative_parts) >= 2 else "-",
+                "model": relative_parts[-1] if relative_parts != ["."] else "-",
+                "module": module_name,
+                "test_path": os.path.join(dirpath, file),
+                "source_path": modules[module_name],
+            })
+
+    return cells
+
+def load_source_module(source_path, module_name):
+    '''
+    Imports the module under test and registers it under its real name and all placeholder names.
+
+    Args:
+    - source_path (str): Path to the module under test.
+    - module_name (str): Name under which the module is imported.
+
+    Return:
+    - module: The imported module.
+    '''
+    spec = importlib.util.spec_from_file_location(module_name, source_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    for alias in PLACEHOLDER_MODULES:
+        sys.modules.setdefault(alias, module)
+    spec.loader.exec_module(module)
+    return module
+
+def iter_tests(suite):
+    ''' Yields all single test cases of a (nested) test suite. '''
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+def get_test_id(test):
+    ''' Returns the id of a test case without the module name ('Class.method'). '''
+    return test.id().split(".", 1)[-1]
+
+def worker_main(config_path):
+    '''
+    Entry point of the isolated worker process.
+
+    This method:
+    - Puts the folder of the source module (and of the original module) on 'sys.path'.
+    - Imports the module under test, traced if coverage is requested.
+    - Loads all 'unittest' test cases of the generated test file and runs them.
+    - Writes the results as JSON to the result file.
+
+    Args:
+    - config_path (str): Path to the JSON configuration written by 'run_test_file()'.
+    '''
+    with open(config_path, "r", encoding="utf-8") as config_file:
+        config = json.load(config_file)
+
+    source_path = config["source_path"]
+    result = empty_result("error", "")
+
+    sys.path[:0] = [os.path.dirname(source_path), os.path.dirname(config["test_path"])] + config["extra_paths"]
+    tracer = LineTracer(source_path) if config["collect_coverage"] else None
+
+    try:
+        if tracer:
+            tracer.start()
+        try:
+            load_source_module(source_path, config["module_name"])
+
+            spec = importlib.util.spec_from_file_location("generated_unit_test", config["test_path"])
+            test_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(test_module)
+
+            suite = unittest.defaultTestLoader.loadTestsFromModule(test_module)
+            if config["test_ids"] is not None:
+                suite = unittest.TestSuite(test for test in iter_tests(suite) if get_test_id(test) in config["test_ids"])
+            all_test_ids = [get_test_id(test) for test in iter_tests(suite)] # The suite is emptied while running
+            runner = unittest.TextTestRunner(stream=io.StringIO(), verbosity=0, failfast=config["failfast"])
+            test_result = runner.run(suite)
+        finally:
+            if tracer:
+                tracer.stop()
+
+        result["tests_run"] = test_result.testsRun
+        result["failures"] = len(test_result.failures) + len(test_result.unexpectedSuccesses)
+        result["errors"] = len(test_result.errors)
+        result["skipped"] = len(test_result.skipped)
+        not_passed = {get_test_id(test) for test, _ in test_result.failures + test_result.errors + test_result.skipped}
+        result["passed_tests"] = [test_id for test_id in all_test_ids if test_id not in not_passed]
+        if test_result.errors:
+            result["status"] = "error"
+            result["message"] = test_result.errors[0][1].strip().splitlines()[-1]
+        elif not test_result.wasSuccessful():
+            result["status"] = "failed"
+            result["message"] = (test_result.failures or [(None, "Unexpected success")])[0][1].strip().splitlines()[-1]
+        elif test_result.testsRun == 0:
+            result["status"] = "error"
+            result["message"] = "No unittest test cases found."
+        else:
+            result["status"] = "passed"
+
+    except BaseException as e: # Import errors, syntax errors, 'sys.exit()' in the generated code
+        result["status"] = "error"
+        result["message"] = f"{type(e).__name__}: {e}"
+
+    if tracer:
+        result["lines"] = sorted(tracer.lines)
+        result["arcs"] = sorted(tracer.arcs)
+
+    with open(config["result_path"], "w", encoding="utf-8") as result_file:
+        json.dump(result, result_file)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--worker":
+        worker_main(sys.argv[2])
+    else:
+        print("Usage: python isolated_runner.py --worker <config.json>")
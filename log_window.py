@@ -0,0 +1,108 @@
+import logging # Message levels
+import customtkinter as ctk # GUI framework
+from ui_bus import UIUpdateBus # Capped refresh rate of the console
+
+LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR")
+LEVEL_COLORS = {logging.DEBUG: "grey", logging.INFO: None, logging.WARNING: "orange", logging.ERROR: "red"}
+
+class LogWindow(ctk.CTkToplevel):
+    '''
+    Log console showing the messages of the application.
+
+    The messages are kept by a 'RingBufferSink' (only the last messages, rate limited); the console
+    renders the new ones at most 'refresh_rate' times per second and keeps at most 'max_lines'
+    lines in the text box, so long runs neither grow the memory nor slow down Tk.
+    '''
+    def __init__(self, app, buffer, refresh_rate=5, max_lines=2000):
+        '''
+        Initializes the LogWindow class.
+
+        Parameters:
+        - app (GenUnitApp): The main window.
+        - buffer (RingBufferSink): Messages of the application.
+        - refresh_rate (int): Maximum number of renders per second.
+        - max_lines (int): Lines kept in the text box.
+        '''
+        super().__init__(app)
+        self.buffer = buffer
+        self.max_lines = max_lines
+        self.render_bus = UIUpdateBus(self, frame_rate=refresh_rate)
+
+        self.level = logging.INFO
+        self.shown_sequence = 0 # Sequence number of the last shown message
+        self.shown_lines = 0
+
+        self.title("Log [GenUnit]")
+        self.geometry("760x460")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        frame_filter = ctk.CTkFrame(self)
+        frame_filter.pack(padx=10, pady=(10, 0), fill="x")
+        self.level_buttons = ctk.CTkSegmentedButton(frame_filter, values=list(LEVEL_NAMES), command=self.set_level)
+        self.level_buttons.set("INFO")
+        self.level_buttons.pack(side="left", padx=5, pady=4)
+        self.btn_clear = ctk.CTkButton(frame_filter, text="Clear", command=self.clear, fg_color="grey", width=80)
+        self.btn_clear.pack(side="right", padx=5, pady=4)
+
+        self.tb_log = ctk.CTkTextbox(self, wrap="none", font=("Courier", 12))
+        self.tb_log.pack(padx=10, pady=10, fill="both", expand=True)
+        for levelno, color in LEVEL_COLORS.items():
+            if color:
+                self.tb_log.tag_config(logging.getLevelName(levelno), foreground=color)
+        self.tb_log.configure(state="disabled")
+
+    def show(self):
+        ''' Shows the window. '''
+        self.deiconify()
+        self.lift()
+        self.render()
+
+    def destroy(self):
+        ''' Stops the render bus before the window is destroyed. '''
+        self.render_bus.close()
+        super().destroy()
+
+    def schedule_render(self):
+        ''' Requests a render (can be called from any thread, coalesced to 'refresh_rate'). '''
+        self.render_bus.post(self.render, key="render")
+
+    def set_level(self, level_name):
+        ''' Shows only messages from a level on (the kept messages are rendered again). '''
+        self.level = logging.getLevelName(level_name)
+        self.clear()
+        self.shown_sequence = 0
+        self.render()
+
+    def clear(self):
+        ''' Empties the text box (older messages are not shown again). '''
+        self.tb_log.configure(state="normal")
+        self.tb_log.delete("1.0", "end")
+        self.tb_log.configure(state="disabled")
+        self.shown_lines = 0
+
+    def render(self):
+        '''
+        Appends the new messages (runs in the Tk main loop, at most 'refresh_rate' times per second).
+
+        This method:
+        - Takes the messages after the last shown one with at least the selected level
+        - Inserts them with the color of their level
+        - Removes the oldest lines beyond 'max_lines'
+        '''
+        if not self.winfo_viewable():
+            return
+        entries = self.buffer.since(self.shown_sequence, self.level)
+        if not entries:
+            return
+        entries = entries[-self.max_lines:]
+        self.shown_sequence = entries[-1][0]
+
+        self.tb_log.configure(state="normal")
+        for _, levelno, msg in entries:
+            self.tb_log.insert("end", msg + "\n", logging.getLevelName(levelno) if LEVEL_COLORS.get(levelno) else None)
+        self.shown_lines += len(entries)
+        if self.shown_lines > self.max_lines:
+            self.tb_log.delete("1.0", f"{self.shown_lines - self.max_lines + 1}.0")
+            self.shown_lines = self.max_lines
+        self.tb_log.see("end")
+        self.tb_log.configure(state="disabled")
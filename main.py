@@ -1,8 +1,43 @@
+import json # Startup times for 'startup_benchmark.py'
+import os # Benchmark mode from the environment
+import threading # Import the test generation logic in the background
+import time # Startup times
 from gui import GenUnitApp # Import the GUI application
-from core import TestGenerator # Import the test generation logic
+
+STARTUP_BENCHMARK = os.environ.get("GENUNIT_STARTUP_BENCHMARK") == "1" # Set by 'startup_benchmark.py'
+startup_times = {"imported": time.time()} # Absolute times, so the benchmark can compare them with the launch time
+
+def connect_test_generator(app):
+    '''
+    Imports the test generation logic in the background and connects it to the GUI.
+
+    'core' imports 'ollama', which takes a few hundred milliseconds; the window is shown meanwhile.
+    '''
+    from core import TestGenerator # Deferred: imports 'ollama'
+    test_generator = TestGenerator(app) # Passes GUI to TestGenerator
+    app.ui_bus.post(set_test_generator, app, test_generator)
+
+def set_test_generator(app, test_generator):
+    ''' Connects the GUI to the logic (runs in the Tk main loop). '''
+    app.test_generator = test_generator
+    startup_times["ready"] = time.time()
+    report_startup(app)
+
+def first_paint(app):
+    ''' Records when the window has been drawn for the first time. '''
+    app.update_idletasks()
+    startup_times["first_paint"] = time.time()
+    report_startup(app)
+
+def report_startup(app):
+    ''' Prints the startup times and closes the window (benchmark mode only). '''
+    if STARTUP_BENCHMARK and "first_paint" in startup_times and "ready" in startup_times:
+        print(f"GENUNIT_STARTUP {json.dumps(startup_times)}", flush=True)
+        app.destroy()
 
 if __name__ == "__main__":
     app = GenUnitApp(None) # Created GUI, but TestGenerator is still missing
-    test_generator = TestGenerator(app) # Passes GUI to TestGenerator
-    app.test_generator = test_generator # Connects the GUI to the logic
+    threading.Thread(target=connect_test_generator, args=(app,), daemon=True).start()
+    if STARTUP_BENCHMARK:
+        app.after_idle(first_paint, app)
     app.mainloop()
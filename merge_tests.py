@@ -0,0 +1,309 @@
+import ast # Compare sources & merge test modules
+import os # File handling and folder operations
+from helpers import read_markdown_record # Original code of an earlier generation
+
+def function_nodes(source):
+    '''
+    Returns the top-level functions and the methods of a module.
+
+    Return:
+    - dict: Name ('function' or 'Class.method') -> AST dump without positions (None if the source cannot be parsed).
+    '''
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+
+    functions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = ast.dump(node)
+        elif isinstance(node, ast.ClassDef):
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    functions[f"{node.name}.{child.name}"] = ast.dump(child)
+    return functions
+
+def function_changes(old_source, new_source):
+    '''
+    Compares the functions & methods of two versions of a module.
+
+    Formatting, comments and moved code do not count as changes (the AST dump ignores positions).
+
+    Return:
+    - dict: 'added', 'changed' and 'removed' names in source order (None if a version cannot be parsed).
+    '''
+    old_functions = function_nodes(old_source)
+    new_functions = function_nodes(new_source)
+    if old_functions is None or new_functions is None:
+        return None
+    return {
+        "added": [name for name in new_functions if name not in old_functions],
+        "changed": [name for name in new_functions if name in old_functions and new_functions[name] != old_functions[name]],
+        "removed": [name for name in old_functions if name not in new_functions],
+    }
+
+def source_from_markdown(md_path):
+    '''
+    Returns the original code saved in the '### Prompt' section of a Markdown file (None if not found).
+
+    The section contains the prompt, an empty line and the code; the code is the first
+    remainder after an empty line that is valid Python.
+    '''
+    try:
+        record = read_markdown_record(md_path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not record:
+        return None
+
+    prompt = record["prompt"]
+    position = prompt.find("\n\n")
+    while position != -1:
+        candidate = prompt[position + 2:]
+        if function_nodes(candidate):
+            return candidate
+        position = prompt.find("\n\n", position + 1)
+    return None
+
+# Merging
+def short_name(function_name):
+    ''' 'Class.method' -> 'method'. '''
+    return function_name.rsplit(".", 1)[-1]
+
+def named_after(test_name, function_name):
+    ''' Returns True if a test method is named after a function ('test_<function>' or 'test_<function>_...'). '''
+    prefix = f"test_{short_name(function_name)}".lower()
+    return test_name.lower() == prefix or test_name.lower().startswith(prefix + "_")
+
+def calls(node, function_name):
+    ''' Returns True if the test method calls the function or method. '''
+    name = short_name(function_name)
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if isinstance(child.func, ast.Name) and child.func.id == name:
+                return True
+            if isinstance(child.func, ast.Attribute) and child.func.attr == name:
+                return True
+    return False
+
+def classes_with_tests(tree):
+    ''' Returns the top-level classes with 'test*' methods as (class node, [method nodes]). '''
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            methods = [child for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if any(method.name.startswith("test") for method in methods):
+                classes.append((node, methods))
+    return classes
+
+def matching_tests(classes, function_name):
+    '''
+    Returns the test methods belonging to a function as (class node, method node).
+
+    Tests named after the function are preferred; only if there are none, tests calling it count.
+    '''
+    tests = [(cls, method) for cls, methods in classes for method in methods if method.name.startswith("test")]
+    named = [(cls, method) for cls, method in tests if named_after(method.name, function_name)]
+    return named or [(cls, method) for cls, method in tests if calls(method, function_name)]
+
+def node_lines(lines, node):
+    ''' Returns the source lines of a node including its decorators. '''
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return lines[start - 1:node.end_lineno], start
+
+def reindent(block, indent):
+    ''' Moves a block of lines to a new indentation (the first line defines the old one). '''
+    old_indent = len(block[0]) - len(block[0].lstrip())
+    return [indent + line[old_indent:] if line.strip() else "" for line in block]
+
+def merge_test_module(existing_code, generated_code, functions, removed=()):
+    '''
+    Merges generated tests into an existing test module, replacing only the affected test methods.
+
+    This method:
+    - Finds the existing & generated test methods of every changed or added function
+      (named 'test_<function>...' or, if there are none, calling the function).
+    - Replaces an existing test only with the generated test of the same name; the other existing
+      tests of the function are kept (hand-tuned tests) and returned in 'kept' for a review.
+    - Inserts the other generated tests after the last existing test of the function;
+      tests of new functions are appended to the class of the same name (or, without fixtures,
+      to the first test class), other generated classes are added before the 'if __name__' block.
+    - Removes the tests of removed functions and adds missing imports.
+    - Keeps every other line (hand-written tests, comments, formatting) unchanged.
+
+    Args:
+    - existing_code (str): The current test module.
+    - generated_code (str): Test module generated for the changed functions.
+    - functions (list): Added & changed functions ('function' or 'Class.method').
+    - removed (list): Removed functions.
+
+    Return:
+    - Tuple (str, dict): The merged module, the number of 'replaced', 'removed' & 'added' test methods and
+      the kept tests of changed functions ('kept', 'Class.method').
+    '''
+    existing_tree = ast.parse(existing_code)
+    generated_tree = ast.parse(generated_code) if generated_code.strip() else ast.Module(body=[], type_ignores=[])
+    lines = existing_code.splitlines()
+    generated_lines = generated_code.splitlines()
+    existing_classes = classes_with_tests(existing_tree)
+    generated_classes = classes_with_tests(generated_tree)
+
+    edits = [] # (start line, end line, replacement lines, target class); end < start inserts before 'start'
+    stats = {"replaced": 0, "removed": 0, "added": 0, "kept": []}
+    handled = set() # Existing test methods replaced or removed
+    used = set() # Generated test methods already merged
+    appended = {} # Existing class -> lines appended at its end
+    new_classes = {} # Generated class name -> (class, methods) added as a new class
+
+    for function_name in list(functions) + list(removed):
+        old_tests = [(cls, method) for cls, method in matching_tests(existing_classes, function_name) if id(method) not in handled]
+
+        if function_name in removed:
+            # Tests of a removed function cannot run any more
+            for cls, method in old_tests:
+                handled.add(id(method))
+                _, start = node_lines(lines, method)
+                if start > 1 and not lines[start - 2].strip():
+                    start -= 1 # Remove the empty line before a removed test as well
+                edits.append((start, method.end_lineno, [], cls))
+            stats["removed"] += len(old_tests)
+            continue
+
+        new_tests = [(cls, method) for cls, method in matching_tests(generated_classes, function_name) if id(method) not in used]
+        used.update(id(method) for _, method in new_tests)
+
+        # Replace only the existing tests with the name of a generated test, keep (and report) the others
+        old_by_name = {method.name: (cls, method) for cls, method in old_tests}
+        unmatched = []
+        for generated_cls, new_method in new_tests:
+            match = old_by_name.pop(new_method.name, None)
+            if match is None:
+                unmatched.append((generated_cls, new_method))
+                continue
+            cls, method = match
+            handled.add(id(method))
+            _, start = node_lines(lines, method)
+            block, _ = node_lines(generated_lines, new_method)
+            edits.append((start, method.end_lineno, reindent(block, " " * method.col_offset), cls))
+            stats["replaced"] += 1
+        stats["kept"].extend(f"{cls.name}.{method.name}" for cls, method in old_by_name.values())
+        stats["added"] += len(unmatched)
+
+        if old_tests and unmatched:
+            # Further generated tests go after the last existing test of the function
+            cls, last = max(old_tests, key=lambda item: item[1].end_lineno)
+            block = []
+            for _, new_method in unmatched:
+                block += [""] + reindent(node_lines(generated_lines, new_method)[0], " " * last.col_offset)
+            edits.append((last.end_lineno + 1, last.end_lineno, block, cls))
+            continue
+
+        # Tests of a new function: class of the same name, else the first test class, else a new class
+        for generated_cls, new_method in unmatched:
+            target = next((cls for cls, _ in existing_classes if cls.name == generated_cls.name), None)
+            has_fixtures = any(isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and not child.name.startswith("test") for child in generated_cls.body)
+            if target is None and existing_classes and not has_fixtures:
+                target = existing_classes[0][0] # Tests without fixtures ('setUp', ...) fit into any test class
+            block, _ = node_lines(generated_lines, new_method)
+            if target is None:
+                new_classes.setdefault(generated_cls.name, (generated_cls, []))[1].append(new_method)
+            else:
+                methods = [child for child in target.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+                indent = " " * (methods[0].col_offset if methods else target.col_offset + 4)
+                appended.setdefault(id(target), (target, []))[1].extend([""] + reindent(block, indent))
+    for cls, block in appended.values():
+        edits.append((cls.end_lineno + 1, cls.end_lineno, block, cls))
+
+    # New test classes (with their helper methods like 'setUp') before the 'if __name__' block
+    if new_classes:
+        main_block = next((node for node in existing_tree.body if isinstance(node, ast.If) and "__name__" in ast.dump(node.test)), None)
+        position = main_block.lineno if main_block else len(lines) + 1
+        block = []
+        for generated_cls, methods in new_classes.values():
+            class_lines, _ = node_lines(generated_lines, generated_cls)
+            block += class_lines[:generated_cls.body[0].lineno - generated_cls.lineno]
+            helpers = [child for child in generated_cls.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and not child.name.startswith("test")]
+            for method in sorted(helpers + methods, key=lambda node: node.lineno):
+                block += node_lines(generated_lines, method)[0] + [""]
+            block += [""]
+        edits.append((position, position - 1, block, None))
+
+    # Missing imports after the last import of the existing module
+    imported = {imported_name(node, alias) for node in existing_tree.body if isinstance(node, (ast.Import, ast.ImportFrom)) for alias in node.names}
+    import_lines = []
+    for node in generated_tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            missing = [alias for alias in node.names if imported_name(node, alias) not in imported]
+            if missing:
+                imported.update(imported_name(node, alias) for alias in missing)
+                import_lines.append(ast.unparse(type(node)(**{**vars(node), "names": missing})))
+    if import_lines and (stats["added"] or stats["replaced"]):
+        last_import = max((node.end_lineno for node in existing_tree.body if isinstance(node, (ast.Import, ast.ImportFrom))), default=0)
+        edits.append((last_import + 1, last_import, import_lines, None))
+
+    # Apply from the bottom, so the line numbers stay valid
+    for start, end, replacement, cls in sorted(edits, key=lambda edit: (edit[0], edit[1]), reverse=True):
+        if cls is not None:
+            kept = {child.name for child in cls.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and id(child) not in handled}
+            replacement = rename_clashes(replacement, kept)
+        lines[start - 1:end] = replacement
+
+    merged = "\n".join(lines) + ("\n" if existing_code.endswith("\n") else "")
+    ast.parse(merged) # Raises 'SyntaxError' instead of writing a broken module
+    return merged, stats
+
+def imported_name(node, alias):
+    ''' Returns a hashable description of one imported name. '''
+    return (getattr(node, "module", None), getattr(node, "level", 0), alias.name, alias.asname)
+
+def rename_clashes(block, kept_names):
+    ''' Renames inserted methods whose name is already used by a kept method of the class ('<name>_updated'). '''
+    renamed = []
+    for line in block:
+        stripped = line.lstrip()
+        for prefix in ("def ", "async def "):
+            name = stripped[len(prefix):].split("(", 1)[0] if stripped.startswith(prefix) else None
+            if name in kept_names:
+                line = line.replace(f"{prefix}{name}(", f"{prefix}{name}_updated(", 1)
+        renamed.append(line)
+    return renamed
+
+# Snapshots of the sources the tests were generated for
+def snapshot_path(tests_folder, filename):
+    '''
+    Returns the path of the snapshot of a source file (in 'Tests/.snapshots').
+
+    Snapshots are keyed by the path relative to the selected folder (the parent of 'tests_folder'),
+    so modules with the same name in different folders do not overwrite each other's snapshots.
+    '''
+    relative_path = os.path.relpath(os.path.abspath(filename), os.path.dirname(os.path.abspath(tests_folder)))
+    if relative_path.startswith(os.pardir): # Outside the selected folder: full path below '.snapshots'
+        relative_path = os.path.splitdrive(os.path.abspath(filename))[1].lstrip(os.sep)
+    return os.path.join(tests_folder, ".snapshots", f"{relative_path}.snapshot")
+
+def save_snapshot(tests_folder, filename, code_text):
+    ''' Stores the source the tests are up to date with. '''
+    path = snapshot_path(tests_folder, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as snapshot_file:
+        snapshot_file.write(code_text)
+
+def load_snapshot(tests_folder, filename, md_path=None):
+    '''
+    Returns the source the tests were generated for (None if unknown).
+
+    Uses the snapshot or the code in the '.md' of the last generation, whichever was written last,
+    so a generation that did not write a snapshot is never compared with an outdated one.
+    '''
+    path = snapshot_path(tests_folder, filename)
+    md_exists = bool(md_path) and os.path.exists(md_path)
+    try:
+        if not md_exists or os.path.getmtime(path) >= os.path.getmtime(md_path):
+            with open(path, "r", encoding="utf-8") as snapshot_file:
+                return snapshot_file.read()
+    except OSError:
+        pass
+    if md_exists:
+        return source_from_markdown(md_path)
+    return None
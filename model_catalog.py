@@ -0,0 +1,170 @@
+import json # Persisted model list
+import os # File handling and folder operations
+import threading # Background refresh
+import time # Age of the model list
+from helpers import output_terminal # Terminal logging
+
+class ModelCatalog:
+    '''
+    Keeps the list of available Ollama models and their metadata.
+
+    The last list is stored in '<cache_dir>/models.json', so the model selection is filled
+    immediately on launch. The list is refreshed through the client API in a background thread
+    when it is older than 'ttl' seconds (or on request); 'on_change' is called if the models changed.
+
+    Metadata per model: size (bytes), digest, modification time, family, parameter size,
+    quantization level and context length ('show' is only called for new or changed models).
+    '''
+    def __init__(self, client=None, ttl=300, cache_dir=".genunit_cache", on_change=None):
+        '''
+        Initializes the ModelCatalog class.
+
+        Args:
+        - client (module or ollama.Client, optional): Object with 'list()' & 'show()' (default: the 'ollama' module, imported on the first refresh).
+        - ttl (float): Seconds until the list is refreshed again.
+        - cache_dir (str): Folder of the persisted model list.
+        - on_change (callable, optional): Called with the sorted model names after a refresh changed them (from the refresh thread).
+        '''
+        self.client = client
+        self.ttl = ttl
+        self.cache_path = os.path.join(cache_dir, "models.json")
+        self.on_change = on_change
+
+        # Cache
+        self.models = {} # Name -> metadata
+        self.fetched_at = 0.0
+
+        self.lock = threading.Lock()
+        self.refresh_thread = None
+
+    def names(self):
+        ''' Returns the sorted model names. '''
+        return sorted(self.models)
+
+    def get(self, name):
+        ''' Returns the metadata of a model (empty if unknown). '''
+        return self.models.get(name, {})
+
+    def describe(self, name):
+        ''' Returns a short description of a model, e.g. '4.7 GB, 8B, context 8192'. '''
+        info = self.get(name)
+        parts = []
+        if info.get("size"):
+            parts.append(f"{info['size'] / 1e9:.1f} GB")
+        if info.get("parameter_size"):
+            parts.append(info["parameter_size"])
+        if info.get("context_length"):
+            parts.append(f"context {info['context_length']}")
+        return ", ".join(parts)
+
+    def is_stale(self):
+        ''' Returns True if the list is older than 'ttl' seconds. '''
+        return time.time() - self.fetched_at > self.ttl
+
+    # Persisted list
+    def load(self):
+        '''
+        Loads the persisted model list (warm start, no request to Ollama).
+
+        Return:
+        - list: The sorted model names (empty if nothing was stored yet).
+        '''
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            self.models = dict(data.get("models", {}))
+            self.fetched_at = float(data.get("fetched_at", 0.0))
+        except (OSError, ValueError, AttributeError, TypeError):
+            self.models, self.fetched_at = {}, 0.0
+        return self.names()
+
+    def save(self):
+        ''' Stores the model list (written to a temporary file first, so a crash never leaves a broken file). '''
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"fetched_at": self.fetched_at, "models": self.models}, cache_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.cache_path)
+
+    # Refresh
+    def refresh(self, force=False):
+        '''
+        Refreshes the model list in a background thread.
+
+        Args:
+        - force (bool): Refresh even if the list is younger than 'ttl' (manual refresh).
+
+        Return:
+        - bool: True if a refresh was started (False if the list is fresh or a refresh is already running).
+        '''
+        with self.lock:
+            if self.refresh_thread and self.refresh_thread.is_alive():
+                return False
+            if not force and not self.is_stale():
+                return False
+            self.refresh_thread = threading.Thread(target=self.fetch, name="model-catalog", daemon=True)
+            self.refresh_thread.start()
+        return True
+
+    def fetch(self):
+        '''
+        Fetches the model list & metadata through the client API and stores it.
+
+        This method:
+        - Calls 'list()' once for all models.
+        - Reuses the context length of models whose digest did not change; 'show()' is only called for the others.
+        - Keeps the previous list if Ollama cannot be reached.
+
+        Return:
+        - list: The sorted model names (None if the list could not be fetched).
+        '''
+        output_terminal("Info #12: Fetching available AI models...", "green")
+        if self.client is None:
+            import ollama # Deferred: takes a few hundred milliseconds and is not needed for the stored list
+            self.client = ollama
+        try:
+            response = self.client.list()
+        except Exception as e:
+            output_terminal(f"Error #7: Failed to fetch models - {e}", "bg_red")
+            return None
+
+        models = {}
+        for model in response.models:
+            details = model.details
+            info = {
+                "size": model.size,
+                "digest": model.digest,
+                "modified_at": model.modified_at.isoformat() if model.modified_at else None,
+                "family": details.family if details else None,
+                "parameter_size": details.parameter_size if details else None,
+                "quantization_level": details.quantization_level if details else None,
+                "context_length": None,
+            }
+            previous = self.models.get(model.model, {})
+            if previous.get("digest") == model.digest and previous.get("context_length"):
+                info["context_length"] = previous["context_length"]
+            else:
+                info["context_length"] = self.context_length(model.model)
+            models[model.model] = info
+
+        changed = models != self.models
+        self.models = models
+        self.fetched_at = time.time()
+        try:
+            self.save()
+        except OSError as e:
+            output_terminal(f"Warning #171: Could not store the model list in {self.cache_path} - {e}", "bg_yellow")
+
+        output_terminal(f"Info #13: Available AI models: {', '.join(self.names())}", "green")
+        if changed and self.on_change:
+            self.on_change(self.names())
+        return self.names()
+
+    def context_length(self, name):
+        ''' Returns the context length of a model from 'show()' (None if unknown). '''
+        try:
+            model_info = self.client.show(name).modelinfo or {}
+        except Exception as e:
+            output_terminal(f"Warning #172: Could not read the details of '{name}' - {e}", "bg_yellow")
+            return None
+        return next((value for key, value in model_info.items() if key.endswith(".context_length")), None)
@@ -0,0 +1,340 @@
+import argparse # Command line options
+import ast # Create the mutants on the syntax tree
+import concurrent.futures # Run the mutants in parallel
+import copy # Mutate a copy of the syntax tree
+import hashlib # Hashes of mutants & tests for the result cache
+import json # Persist the result cache & report
+import os # File handling and folder operations
+import tempfile # Folder for the mutated source files
+import threading # Protect the cache while workers report results
+from helpers import output_terminal # Print colored messages to the terminal
+from isolated_runner import run_test_file, find_test_cells # Run generated tests in isolated processes
+
+# Operator swaps applied by the operator mutator
+BINARY_OPERATOR_SWAPS = {
+    ast.Add: ast.Sub, ast.Sub: ast.Add, ast.Mult: ast.Div, ast.Div: ast.Mult,
+    ast.FloorDiv: ast.Mult, ast.Mod: ast.FloorDiv, ast.Pow: ast.Mult,
+}
+COMPARE_OPERATOR_SWAPS = {
+    ast.Eq: ast.NotEq, ast.NotEq: ast.Eq, ast.Lt: ast.GtE, ast.GtE: ast.Lt,
+    ast.Gt: ast.LtE, ast.LtE: ast.Gt, ast.In: ast.NotIn, ast.NotIn: ast.In,
+    ast.Is: ast.IsNot, ast.IsNot: ast.Is,
+}
+BOOL_OPERATOR_SWAPS = {ast.And: ast.Or, ast.Or: ast.And}
+
+MUTATION_CACHE_FILE = "mutation_cache.json"
+
+class MutationApplier(ast.NodeTransformer):
+    '''
+    Walks a syntax tree and applies exactly one mutation.
+
+    Every possible mutation gets a running index in traversal order. With
+    'target_index=None' nothing is changed and only the list of possible
+    mutations ('self.mutations') is collected.
+
+    Mutators:
+    - Operator swap ('+' -> '-', '==' -> '!=', 'and' -> 'or', ...)
+    - Constant tweak (numbers +1, booleans inverted, strings emptied)
+    - Condition negation ('if x' -> 'if not x')
+    - Return replacement ('return x' -> 'return None')
+    '''
+    def __init__(self, target_index=None):
+        super().__init__()
+        self.target_index = target_index
+        self.mutations = [] # (kind, line, description)
+
+    def candidate(self, kind, node, description):
+        ''' Registers a possible mutation and returns True if it should be applied now. '''
+        index = len(self.mutations)
+        self.mutations.append((kind, getattr(node, "lineno", 0), description))
+        return index == self.target_index
+
+    def skip_docstring(self, node):
+        ''' Visits a module, class or function without mutating its docstring. '''
+        docstring = node.body.pop(0) if ast.get_docstring(node, clean=False) is not None else None
+        self.generic_visit(node)
+        if docstring is not None:
+            node.body.insert(0, docstring)
+        return node
+
+    visit_Module = skip_docstring
+    visit_ClassDef = skip_docstring
+    visit_FunctionDef = skip_docstring
+    visit_AsyncFunctionDef = skip_docstring
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        swap = BINARY_OPERATOR_SWAPS.get(type(node.op))
+        if swap and self.candidate("operator", node, f"{type(node.op).__name__} -> {swap.__name__}"):
+            node.op = swap()
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        swap = COMPARE_OPERATOR_SWAPS.get(type(node.ops[0]))
+        if swap and self.candidate("operator", node, f"{type(node.ops[0]).__name__} -> {swap.__name__}"):
+            node.ops = [swap()] + node.ops[1:]
+        return node
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        swap = BOOL_OPERATOR_SWAPS[type(node.op)]
+        if self.candidate("operator", node, f"{type(node.op).__name__} -> {swap.__name__}"):
+            node.op = swap()
+        return node
+
+    def visit_Constant(self, node):
+        value = node.value
+        if isinstance(value, bool):
+            if self.candidate("constant", node, f"{value} -> {not value}"):
+                return ast.copy_location(ast.Constant(value=not value), node)
+        elif isinstance(value, (int, float)):
+            if self.candidate("constant", node, f"{value} -> {value + 1}"):
+                return ast.copy_location(ast.Constant(value=value + 1), node)
+        elif isinstance(value, str) and value:
+            if self.candidate("constant", node, f"{value[:20]!r} -> ''"):
+                return ast.copy_location(ast.Constant(value=""), node)
+        return node
+
+    def visit_JoinedStr(self, node):
+        return node # f-string parts are not mutated separately
+
+    def visit_If(self, node):
+        return self.negate_test(node)
+
+    def visit_While(self, node):
+        return self.negate_test(node)
+
+    def visit_IfExp(self, node):
+        return self.negate_test(node)
+
+    def negate_test(self, node):
+        ''' Negates the condition of an 'if', 'while' or conditional expression. '''
+        self.generic_visit(node)
+        if self.candidate("negation", node, "condition negated"):
+            node.test = ast.copy_location(ast.UnaryOp(op=ast.Not(), operand=node.test), node.test)
+        return node
+
+    def visit_Return(self, node):
+        self.generic_visit(node)
+        if node.value is not None and not (isinstance(node.value, ast.Constant) and node.value.value is None):
+            if self.candidate("return", node, "return value -> None"):
+                node.value = ast.copy_location(ast.Constant(value=None), node.value)
+        return node
+
+class MutationTester:
+    '''
+    Scores generated unit tests by the share of source mutants they detect.
+
+    Responsibilities:
+    - Creates one mutant per possible mutation of the module under test.
+    - Runs the tests that pass on the original code against every mutant,
+      each mutant in its own process with a timeout (stops at the first failing test).
+    - Caches the result of every (mutant hash, test hash) pair.
+    - Summarizes the mutation score per model and prompt.
+    '''
+    def __init__(self, max_workers=None, timeout=None, cache_dir=".genunit_cache"):
+        '''
+        Initializes the MutationTester class.
+
+        Args:
+        - max_workers (int, optional): Number of parallel mutant processes (default: CPU count).
+        - timeout (float, optional): Timeout per mutant in seconds (default: derived from the original run).
+        - cache_dir (str, optional): Folder of the result cache (None disables the cache).
+        '''
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache_path = os.path.join(cache_dir, MUTATION_CACHE_FILE) if cache_dir else None
+        self.cache = self.load_cache()
+        self.cache_lock = threading.Lock()
+
+    # Cache
+    def load_cache(self):
+        ''' Loads the result cache from disk (empty if missing or unreadable). '''
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError) as e:
+            output_terminal(f"Warning #70: Mutation cache could not be read, starting empty - {e}", "bg_yellow")
+            return {}
+
+    def save_cache(self):
+        ''' Writes the result cache to disk. '''
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self.cache_lock:
+            with open(self.cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self.cache, cache_file)
+
+    # Mutants
+    def create_mutants(self, source_text):
+        '''
+        Creates all mutants of a source file.
+
+        Return:
+        - list: Dictionaries with 'kind', 'line', 'description', 'source' and 'hash'.
+          Mutants whose code equals the original code are skipped.
+        '''
+        tree = ast.parse(source_text)
+        collector = MutationApplier()
+        collector.visit(copy.deepcopy(tree))
+        original = ast.unparse(tree)
+
+        mutants = []
+        for index, (kind, line, description) in enumerate(collector.mutations):
+            mutated_tree = ast.fix_missing_locations(MutationApplier(index).visit(copy.deepcopy(tree)))
+            mutant_source = ast.unparse(mutated_tree)
+            if mutant_source == original:
+                continue
+            mutants.append({
+                "kind": kind,
+                "line": line,
+                "description": description,
+                "source": mutant_source,
+                "hash": hashlib.sha256(mutant_source.encode("utf-8")).hexdigest(),
+            })
+        return mutants
+
+    def run_mutant(self, mutant, test_path, source_path, test_ids, timeout, mutant_dir, test_hash):
+        '''
+        Runs the passing tests against a single mutant.
+
+        Return:
+        - str: 'killed', 'survived' or 'timeout' (a timeout counts as killed in the score).
+        '''
+        cache_key = f"{mutant['hash']}:{test_hash}"
+        with self.cache_lock:
+            if cache_key in self.cache:
+                return self.cache[cache_key]
+
+        module_name = os.path.splitext(os.path.basename(source_path))[0]
+        mutant_folder = os.path.join(mutant_dir, mutant["hash"][:16])
+        os.makedirs(mutant_folder, exist_ok=True)
+        mutant_path = os.path.join(mutant_folder, f"{module_name}.py")
+        with open(mutant_path, "w", encoding="utf-8") as mutant_file:
+            mutant_file.write(mutant["source"])
+
+        result = run_test_file(
+            test_path, mutant_path, timeout=timeout, failfast=True, module_name=module_name,
+            test_ids=test_ids, extra_paths=[os.path.dirname(os.path.abspath(source_path))],
+        )
+        if result["status"] == "timeout":
+            outcome = "timeout"
+        elif result["status"] == "passed" and result["tests_run"] > 0:
+            outcome = "survived"
+        else:
+            outcome = "killed"
+
+        with self.cache_lock:
+            self.cache[cache_key] = outcome
+        return outcome
+
+    # Scoring
+    def score_test_file(self, test_path, source_path):
+        '''
+        Calculates the mutation score of one generated test file.
+
+        This method:
+        - Runs the tests against the original code and keeps only the passing tests.
+        - Runs these tests against every mutant in parallel processes.
+        - Counts killed (including timeouts) and surviving mutants.
+
+        Args:
+        - test_path (str): The generated 'unit_test_*.py' file.
+        - source_path (str): The module under test.
+
+        Return:
+        - dict: 'mutants', 'killed', 'survived', 'timeouts', 'score' (None if no test passes
+          on the original code), 'passing_tests' and 'survivors' (descriptions).
+        '''
+        with open(source_path, "r", encoding="utf-8") as file:
+            source_text = file.read()
+        with open(test_path, "rb") as file:
+            test_hash = hashlib.sha256(file.read()).hexdigest()
+
+        baseline = run_test_file(test_path, source_path, timeout=self.timeout or 60)
+        passing_tests = baseline["passed_tests"]
+        report = {"mutants": 0, "killed": 0, "survived": 0, "timeouts": 0, "score": None, "passing_tests": len(passing_tests), "survivors": []}
+
+        if not passing_tests:
+            output_terminal(f"Warning #71: No test passes on the original code: {test_path} ({baseline['message']})", "bg_yellow")
+            return report
+
+        mutants = self.create_mutants(source_text)
+        report["mutants"] = len(mutants)
+        timeout = self.timeout or max(5.0, baseline["duration"] * 10)
+
+        with tempfile.TemporaryDirectory(prefix="genunit_mutants_") as mutant_dir:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self.run_mutant, mutant, test_path, source_path, passing_tests, timeout, mutant_dir, test_hash): mutant
+                    for mutant in mutants
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    mutant = futures[future]
+                    outcome = future.result()
+                    if outcome == "survived":
+                        report["survived"] += 1
+                        report["survivors"].append(f"line {mutant['line']}: {mutant['kind']} ({mutant['description']})")
+                    else:
+                        report["killed"] += 1
+                        report["timeouts"] += outcome == "timeout"
+
+        report["survivors"].sort(key=lambda text: int(text.split(":")[0].split()[1]))
+        report["score"] = report["killed"] / report["mutants"] if report["mutants"] else None
+        return report
+
+    def score_results_tree(self, results_root, sources_root):
+        '''
+        Calculates mutation scores for every generated test in a results tree.
+
+        Args:
+        - results_root (str): Tree like 'Testcodes/<prompt>/<model>/'.
+        - sources_root (str): Folder with the original modules (e.g. 'Codes').
+
+        Return:
+        - Tuple (list, dict): Per-file reports and the summary per (prompt, model) with
+          'killed', 'mutants' and 'score'.
+        '''
+        reports = []
+        for cell in find_test_cells(results_root, sources_root):
+            output_terminal(f"Info #70: Mutation testing {cell['test_path']}...", "yellow")
+            report = self.score_test_file(cell["test_path"], cell["source_path"])
+            reports.append({**cell, **report})
+            self.save_cache() # Keep finished results if the run is interrupted
+
+        summary = {}
+        for report in reports:
+            entry = summary.setdefault((report["prompt"], report["model"]), {"killed": 0, "mutants": 0, "score": None})
+            entry["killed"] += report["killed"]
+            entry["mutants"] += report["mutants"]
+        for entry in summary.values():
+            entry["score"] = entry["killed"] / entry["mutants"] if entry["mutants"] else None
+
+        return reports, summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mutation score of generated unit tests per model and prompt.")
+    parser.add_argument("--results", default="Testcodes", help="Results tree '<prompt>/<model>/unit_test_*.py'")
+    parser.add_argument("--sources", default="Codes", help="Folder with the modules under test")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel mutant processes")
+    parser.add_argument("--timeout", type=float, default=None, help="Timeout per mutant in seconds")
+    parser.add_argument("--json", default=None, help="Write the full report to this JSON file")
+    args = parser.parse_args()
+
+    tester = MutationTester(max_workers=args.workers, timeout=args.timeout)
+    file_reports, prompt_model_summary = tester.score_results_tree(args.results, args.sources)
+
+    for (prompt, model), entry in sorted(prompt_model_summary.items()):
+        score = f"{entry['score'] * 100:.1f}%" if entry["score"] is not None else "n/a"
+        output_terminal(f"Info #71: {prompt} | {model}: {entry['killed']}/{entry['mutants']} mutants killed ({score})", "blue")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump({
+                "files": file_reports,
+                "summary": [{"prompt": prompt, "model": model, **entry} for (prompt, model), entry in sorted(prompt_model_summary.items())],
+            }, report_file, indent=2)
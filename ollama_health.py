@@ -0,0 +1,122 @@
+import json # Answer of '/api/version'
+import os # 'OLLAMA_HOST' environment variable
+import threading # Background checker thread
+import time # Time of the last check
+import urllib.request # HTTP health check
+from helpers import output_terminal # Terminal logging
+
+DEFAULT_HOST = "http://127.0.0.1:11434"
+
+def ollama_url(host=None):
+    '''
+    Returns the base URL of the Ollama API (like the 'ollama' client, 'OLLAMA_HOST' is used if set).
+
+    Supports 'host', 'host:port', 'http(s)://host[:port]' and '0.0.0.0' (checked on localhost).
+    '''
+    host = (host or os.environ.get("OLLAMA_HOST") or DEFAULT_HOST).strip().rstrip("/")
+    scheme = "http"
+    if "://" in host:
+        scheme, host = host.split("://", 1)
+    host, _, path = host.partition("/")
+    if host.startswith("["): # IPv6 address
+        name, _, port = host[1:].partition("]")
+        name, port = f"[{name}]", port.lstrip(":")
+    else:
+        name, _, port = host.partition(":")
+    if name in ("", "0.0.0.0", "[::]"):
+        name = "127.0.0.1"
+    port = port or ("443" if scheme == "https" else "11434")
+    return f"{scheme}://{name}:{port}" + (f"/{path}" if path else "")
+
+class OllamaHealthChecker:
+    '''
+    Checks in a background thread whether the Ollama API answers.
+
+    A check is a single 'GET /api/version' with a short timeout, so the Tk main loop is never blocked.
+    While Ollama is online, the interval doubles up to 'max_interval' (backoff); while it is offline,
+    it is checked every 'interval' seconds. The last result is cached in 'status' and 'on_change'
+    is only called when the status changes.
+
+    Status values:
+    - 'Online': The API answers.
+    - 'Offline': The API does not answer.
+    - 'Unresponsive': The API does not answer, but an Ollama process is running (psutil fallback, if installed).
+    '''
+    def __init__(self, on_change, host=None, timeout=1.0, interval=5.0, max_interval=60.0, process_fallback=True):
+        '''
+        Initializes the OllamaHealthChecker class.
+
+        Args:
+        - on_change (callable): Called with the new status (from the checker thread).
+        - host (str, optional): Ollama host (default: 'OLLAMA_HOST' or 'http://127.0.0.1:11434').
+        - timeout (float): Timeout of a check in seconds.
+        - interval (float): Seconds between checks while offline (and the first one while online).
+        - max_interval (float): Maximum seconds between checks while online.
+        - process_fallback (bool): Look for an Ollama process if the API does not answer (requires 'psutil').
+        '''
+        self.on_change = on_change
+        self.url = ollama_url(host)
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.process_fallback = process_fallback
+
+        # Cache
+        self.status = None
+        self.version = None
+        self.last_checked = None
+
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        ''' Starts the checker thread (the first check runs immediately). '''
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="ollama-health", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        ''' Stops the checker thread. '''
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def check_now(self):
+        ''' Runs the next check immediately (e.g. after the user started Ollama). '''
+        self.wake_event.set()
+
+    def run(self):
+        ''' Checks the status until 'stop()' is called. '''
+        wait = self.interval
+        while not self.stop_event.is_set():
+            status = self.check()
+            wait = min(wait * 2, self.max_interval) if status == "Online" and self.status == "Online" else self.interval
+            if status != self.status:
+                self.status = status
+                self.on_change(status)
+            self.wake_event.wait(wait)
+            self.wake_event.clear()
+
+    def check(self):
+        ''' Runs a single check and returns the status. '''
+        self.last_checked = time.time()
+        try:
+            with urllib.request.urlopen(f"{self.url}/api/version", timeout=self.timeout) as response:
+                self.version = json.loads(response.read() or b"{}").get("version")
+            return "Online"
+        except (OSError, ValueError) as e: # 'urllib.error.URLError', timeouts & invalid answers
+            if self.status in (None, "Online"): # Only when the API stops answering
+                output_terminal(f"Warning #170: Ollama API at {self.url} does not answer - {getattr(e, 'reason', e)}", "bg_yellow")
+
+        if self.process_fallback:
+            try:
+                import psutil # Optional fallback, only imported when the API does not answer
+            except ImportError:
+                self.process_fallback = False
+                return "Offline"
+            try:
+                if any("ollama" in (proc.info.get("name") or "").lower() for proc in psutil.process_iter(["name"])):
+                    return "Unresponsive"
+            except psutil.Error:
+                pass
+        return "Offline"
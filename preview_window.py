@@ -0,0 +1,116 @@
+import customtkinter as ctk # GUI framework
+from helpers import output_terminal # Terminal logging
+from stream_preview import StreamPreview # Bounded buffer of the streamed output
+from ui_bus import UIUpdateBus # Capped refresh rate of the preview
+
+class LivePreviewWindow(ctk.CTkToplevel):
+    '''
+    Window showing the model output of a file while it is being generated.
+
+    The window is created on first use. The streamed chunks are collected by a 'StreamPreview'
+    (only the last 'max_chars' characters per file) and rendered at most 'refresh_rate' times per
+    second; only the new text is inserted, so long outputs do not slow down Tk.
+    A rambling file can be cancelled early with the 'Cancel File' button.
+    '''
+    def __init__(self, app, refresh_rate=10, max_chars=20000):
+        '''
+        Initializes the LivePreviewWindow class.
+
+        Parameters:
+        - app (GenUnitApp): The main window (its 'test_generator' gets the preview buffer while the window is shown).
+        - refresh_rate (int): Maximum number of renders per second.
+        - max_chars (int): Characters kept per file and shown in the text box.
+        '''
+        super().__init__(app)
+        self.app = app
+        self.max_chars = max_chars
+        self.preview = StreamPreview(max_chars, on_update=lambda filename: self.render_bus.post(self.render, key="render"))
+        self.render_bus = UIUpdateBus(self, frame_rate=refresh_rate)
+
+        self.selected_file = None # File shown in the text box
+        self.offset = None # Characters of the selected file already shown
+        self.shown_chars = 0
+        self.shown_files = []
+
+        self.title("Live Preview [GenUnit]")
+        self.geometry("700x500")
+        self.protocol("WM_DELETE_WINDOW", self.hide)
+
+        frame_select = ctk.CTkFrame(self)
+        frame_select.pack(padx=10, pady=(10, 0), fill="x")
+
+        self.combo_files = ctk.CTkComboBox(frame_select, values=[], command=self.select_file, width=480)
+        self.combo_files.pack(side="left", padx=5, pady=4)
+        self.combo_files.set("Waiting for a file...")
+
+        self.btn_cancel_file = ctk.CTkButton(frame_select, text="Cancel File", command=self.cancel_file, fg_color="grey", width=100)
+        self.btn_cancel_file.pack(side="right", padx=5, pady=4)
+
+        self.tb_preview = ctk.CTkTextbox(self, wrap="none", font=("Courier", 12))
+        self.tb_preview.pack(padx=10, pady=10, fill="both", expand=True)
+        self.tb_preview.configure(state="disabled")
+
+    def show(self):
+        ''' Shows the window and starts collecting the streamed output. '''
+        self.deiconify()
+        self.lift()
+        if self.app.test_generator is not None:
+            self.app.test_generator.stream_preview = self.preview
+
+    def hide(self):
+        ''' Hides the window and stops collecting the streamed output (no overhead while hidden). '''
+        if self.app.test_generator is not None:
+            self.app.test_generator.stream_preview = None
+        self.withdraw()
+
+    def destroy(self):
+        ''' Stops the render bus before the window is destroyed. '''
+        self.render_bus.close()
+        super().destroy()
+
+    def select_file(self, filename):
+        ''' Shows another file (called by the ComboBox). '''
+        self.selected_file = filename
+        self.offset = None
+        self.render()
+
+    def cancel_file(self):
+        ''' Cancels the generation of the shown file. '''
+        if self.selected_file and self.app.test_generator.cancel_file(self.selected_file):
+            output_terminal(f"Info #181: Cancelling generation of {self.selected_file}", "yellow")
+
+    def render(self):
+        '''
+        Shows the new output of the selected file (runs in the Tk main loop, at most 'refresh_rate' times per second).
+
+        This method:
+        - Updates the list of files being generated
+        - Follows the newest file when the shown file is done (or none was selected yet)
+        - Appends only the new text; replaces the text if the shown part was trimmed from the buffer
+        - Removes the oldest characters from the text box beyond 'max_chars'
+        '''
+        files = self.preview.files()
+        if files != self.shown_files:
+            self.shown_files = files
+            self.combo_files.configure(values=files)
+        if files and self.selected_file not in files:
+            self.selected_file, self.offset = files[-1], None
+        if self.selected_file is None:
+            return
+        self.combo_files.set(self.selected_file)
+
+        text, replace, self.offset = self.preview.read(self.selected_file, self.offset)
+        if not text and not replace:
+            return
+
+        self.tb_preview.configure(state="normal")
+        if replace:
+            self.tb_preview.delete("1.0", "end")
+            self.shown_chars = 0
+        self.tb_preview.insert("end", text)
+        self.shown_chars += len(text)
+        if self.shown_chars > self.max_chars:
+            self.tb_preview.delete("1.0", f"1.0 + {self.shown_chars - self.max_chars} chars")
+            self.shown_chars = self.max_chars
+        self.tb_preview.see("end")
+        self.tb_preview.configure(state="disabled")
@@ -0,0 +1,166 @@
+import argparse # Command line options
+import concurrent.futures # Reprocess the files in parallel
+import json # Report
+import os # File handling and folder operations
+import time # Runtime of the whole run
+from helpers import output_terminal, extract_python_code, read_markdown_record # Print colored messages, extract code & read saved AI responses
+
+def test_path_for_markdown(md_path, output_folder=None):
+    '''
+    Returns the path of the test file belonging to a saved AI response.
+
+    'TestGenerator.save_files()' writes 'unit_test_<module>_<model>.md' next to
+    'unit_test_<module>_<model>.py'; archived files like '<module>.md' get the prefix 'unit_test_'.
+
+    Args:
+    - md_path (str): Path to the '.md' file.
+    - output_folder (str, optional): Folder for the test file (default: folder of the '.md' file).
+    '''
+    stem = os.path.splitext(os.path.basename(md_path))[0]
+    if not stem.startswith("unit_test_"):
+        stem = f"unit_test_{stem}"
+    return os.path.join(output_folder or os.path.dirname(md_path), f"{stem}.py")
+
+def reprocess_file(md_path, test_path, write=False):
+    '''
+    Runs extraction, validation & saving for one saved AI response (no model call).
+
+    This method:
+    - Reads the raw AI response from the '### Generated Output' section.
+    - Extracts the test code with the same function as 'TestGenerator.generate_test_for_file()'.
+    - Validates the code (code block found, compiles without syntax errors).
+    - Compares it with the existing test file and writes it if 'write' is set (an existing file only if the code is valid).
+
+    Args:
+    - md_path (str): Path to the '.md' file.
+    - test_path (str): Path of the test file to compare with / write.
+    - write (bool): Write the test file if it changed.
+
+    Return:
+    - dict: 'path', 'test_path', 'model', 'validation' (ok/no_code/syntax_error/no_output),
+      'change' (created/updated/unchanged/kept - an existing test file is kept if the new code failed the validation) and 'message'.
+    '''
+    result = {"path": md_path, "test_path": test_path, "model": "", "validation": "no_output", "change": "unchanged", "message": ""}
+    try:
+        record = read_markdown_record(md_path)
+    except (OSError, UnicodeDecodeError) as e:
+        result["message"] = str(e)
+        return result
+    if record is None:
+        result["message"] = "No '### Generated Output' section."
+        return result
+    result["model"] = record["model"]
+
+    # Extraction & validation
+    test_code = extract_python_code(record["response"])
+    if not test_code.strip():
+        result["validation"] = "no_code"
+        result["message"] = "No Python code block in the response."
+    else:
+        try:
+            compile(test_code, test_path, "exec")
+            result["validation"] = "ok"
+        except SyntaxError as e:
+            result["validation"] = "syntax_error"
+            result["message"] = f"Line {e.lineno}: {e.msg}"
+
+    # Compare with the existing test file
+    try:
+        with open(test_path, "r", encoding="utf-8") as test_file:
+            result["change"] = "unchanged" if test_file.read() == test_code else "updated"
+    except FileNotFoundError:
+        result["change"] = "created"
+    except (OSError, UnicodeDecodeError):
+        result["change"] = "updated"
+
+    # Never replace an existing test file with code that failed the validation
+    if result["change"] == "updated" and result["validation"] != "ok":
+        result["change"] = "kept"
+
+    # Save test file (a new one as 'TestGenerator.generate_tests_for_folder()' does, also when the validation failed)
+    if write and result["change"] in ("created", "updated"):
+        os.makedirs(os.path.dirname(test_path) or ".", exist_ok=True)
+        with open(test_path, "w", encoding="utf-8") as test_file:
+            test_file.write(test_code)
+    return result
+
+def reprocess_tree(results_root, output_root=None, in_place=False, max_workers=None):
+    '''
+    Reprocesses all saved AI responses below a folder in parallel.
+
+    Extraction is pure Python work, so the files are processed in a process pool
+    (chunked, so thousands of small files do not cost one round trip each).
+
+    Args:
+    - results_root (str): Folder with '.md' files (e.g. 'Testcodes' or a 'Tests' folder).
+    - output_root (str, optional): Write the test files into this folder (same subfolders as 'results_root').
+    - in_place (bool): Write the test files next to the '.md' files.
+    - max_workers (int, optional): Number of worker processes.
+
+    Return:
+    - list: One result of 'reprocess_file()' per '.md' file, sorted by path.
+    '''
+    jobs = []
+    for dirpath, dirnames, files in os.walk(results_root):
+        dirnames.sort()
+        for file in sorted(files):
+            if file.endswith(".md"):
+                md_path = os.path.join(dirpath, file)
+                output_folder = os.path.join(output_root, os.path.relpath(dirpath, results_root)) if output_root else None
+                jobs.append((md_path, test_path_for_markdown(md_path, output_folder)))
+
+    if not jobs:
+        return []
+
+    write = bool(output_root) or in_place
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [reprocess_file(md_path, test_path, write) for md_path, test_path in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            reprocess_file, [md_path for md_path, _ in jobs], [test_path for _, test_path in jobs], [write] * len(jobs),
+            chunksize=chunksize,
+        ))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run extraction, validation & saving from saved AI responses (no model calls).")
+    parser.add_argument("--results", default="Testcodes", help="Folder with '.md' files written by the tool")
+    parser.add_argument("--output", default=None, help="Write the test files into this folder")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite the test files next to the '.md' files")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--json", default=None, help="Save the report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = reprocess_tree(args.results, args.output, args.in_place, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if not results:
+        output_terminal(f"Warning #130-No '.md' files found in {args.results}.", "bg_yellow")
+        raise SystemExit(1)
+
+    for result in results:
+        if result["validation"] != "ok":
+            output_terminal(f"Warning #131-{result['path']}: {result['validation']} {result['message']}", "yellow")
+
+    def count(key, value):
+        return sum(1 for result in results if result[key] == value)
+
+    written = bool(args.output) or args.in_place
+    output_terminal(
+        f"Info #130: {len(results)} responses reprocessed in {elapsed:.2f}s - valid: {count('validation', 'ok')}, "
+        f"no code: {count('validation', 'no_code')}, syntax errors: {count('validation', 'syntax_error')}, "
+        f"no output: {count('validation', 'no_output')}", "blue",
+    )
+    output_terminal(
+        f"Info #131: Test files {'' if written else 'that would be '}created: {count('change', 'created')}, "
+        f"updated: {count('change', 'updated')}, unchanged: {count('change', 'unchanged')}, "
+        f"kept (invalid code): {count('change', 'kept')}", "blue",
+    )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2, ensure_ascii=False)
+        output_terminal(f"Info #132: Report saved: {args.json}", "yellow")
@@ -0,0 +1,188 @@
+import ast # Complexity of a source file
+import fnmatch # Include & exclude patterns
+import os # File handling and folder operations
+import re # '.gitignore' patterns
+
+# Folders that never contain code to be tested (name -> reason)
+SKIPPED_FOLDERS = {
+    "venv": "virtual environment", ".venv": "virtual environment", "env": "virtual environment",
+    "site-packages": "installed packages", "dist-packages": "installed packages", "node_modules": "installed packages",
+    "migrations": "migrations",
+    "__pycache__": "cache folder", ".genunit_cache": "cache folder", ".mypy_cache": "cache folder", ".pytest_cache": "cache folder",
+    ".git": "version control", ".hg": "version control", ".svn": "version control",
+    ".tox": "build folder", ".nox": "build folder", "build": "build folder", "dist": "build folder",
+}
+GENERATED_MARKERS = ("@generated", "do not edit", "auto-generated", "autogenerated", "generated by") # Checked in the comments of the first lines
+DECISION_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith, ast.BoolOp, ast.IfExp, ast.comprehension, ast.ExceptHandler)
+
+def gitignore_regex(pattern):
+    '''
+    Translates a '.gitignore' pattern into a regular expression for paths relative to the '.gitignore' folder.
+
+    Supports '*', '?', '[...]', '**', a leading '/' (anchored) and patterns containing '/' (anchored).
+    '''
+    anchored = pattern.startswith("/") or "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+        elif pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+        elif pattern[index] == "*":
+            regex += "[^/]*"
+            index += 1
+        elif pattern[index] == "?":
+            regex += "[^/]"
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 1:]:
+            end = pattern.index("]", index + 1)
+            regex += "[" + pattern[index + 1:end].replace("!", "^", 1) + "]"
+            index = end + 1
+        else:
+            regex += re.escape(pattern[index])
+            index += 1
+    return re.compile(("" if anchored else "(?:.*/)?") + regex + r"\Z")
+
+def complexity(tree):
+    ''' Returns the number of functions, classes and decision points (if, loops, try, boolean operators, ...) of a module. '''
+    return sum(1 for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef) + DECISION_NODES))
+
+class SourceSelector:
+    '''
+    Decides which Python files are sent to the AI model.
+
+    Every skipped file or folder gets a reason, so the user can see why it was left out.
+    Path rules (folders, patterns, '.gitignore') are checked while the folder is scanned,
+    so skipped folders are never descended; content rules (size, empty '__init__.py',
+    generated code, complexity) are checked for the remaining files.
+    '''
+    def __init__(self, include_globs=None, exclude_globs=None, excluded_folders=None, use_gitignore=True, min_complexity=0, max_size=None):
+        '''
+        Initializes the SourceSelector class.
+
+        Args:
+        - include_globs (list, optional): Only files matching one of these patterns (e.g. 'src/**/*.py').
+        - exclude_globs (list, optional): Skip files & folders matching one of these patterns (e.g. '*_pb2.py').
+        - excluded_folders (list, optional): Folders to skip.
+        - use_gitignore (bool): Skip files & folders ignored by '.gitignore' files inside the scanned folder.
+        - min_complexity (int): Skip files with fewer functions, classes & decision points (0 = off).
+        - max_size (int, optional): Skip files larger than this many bytes.
+
+        A pattern without '/' is matched against the file name, otherwise against the path relative to the scanned folder.
+        '''
+        self.include_globs = list(include_globs or [])
+        self.exclude_globs = list(exclude_globs or [])
+        self.excluded_folders = {os.path.normcase(os.path.abspath(folder)) for folder in excluded_folders or [] if folder}
+        self.use_gitignore = use_gitignore
+        self.min_complexity = min_complexity
+        self.max_size = max_size
+
+    # Path rules
+    def folder_rules(self, folder_path, rel_path, entry_names, rules):
+        ''' Returns the '.gitignore' rules valid inside a folder (the parent rules plus its own '.gitignore'). '''
+        if not self.use_gitignore or ".gitignore" not in entry_names:
+            return rules
+        own_rules = []
+        try:
+            with open(os.path.join(folder_path, ".gitignore"), "r", encoding="utf-8", errors="replace") as gitignore_file:
+                for line in gitignore_file:
+                    line = line.rstrip("\n").rstrip()
+                    if not line or line.startswith("#"):
+                        continue
+                    negate = line.startswith("!")
+                    line = line[1:] if negate else line
+                    own_rules.append((rel_path, gitignore_regex(line), negate, line.endswith("/")))
+        except OSError:
+            return rules
+        return rules + tuple(own_rules)
+
+    def is_ignored(self, rel_path, is_folder, rules):
+        ''' Returns True if the last matching '.gitignore' rule ignores the path. '''
+        ignored = False
+        for base, regex, negate, folder_only in rules:
+            if folder_only and not is_folder:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                path = rel_path[len(base) + 1:]
+            else:
+                path = rel_path
+            if regex.match(path):
+                ignored = not negate
+        return ignored
+
+    def matches(self, patterns, name, rel_path):
+        ''' Returns the first pattern matching the file name or the relative path. '''
+        for pattern in patterns:
+            if fnmatch.fnmatch(rel_path if "/" in pattern else name, pattern):
+                return pattern
+        return None
+
+    def skip_folder(self, folder_path, name, rel_path, rules):
+        ''' Returns the reason for skipping a folder (None = descend). '''
+        if os.path.normcase(os.path.abspath(folder_path)) in self.excluded_folders:
+            return "excluded folder"
+        if rel_path == "Tests":
+            return "output folder"
+        if name in SKIPPED_FOLDERS:
+            return SKIPPED_FOLDERS[name]
+        if os.path.exists(os.path.join(folder_path, "pyvenv.cfg")):
+            return "virtual environment"
+        if rules and self.is_ignored(rel_path, True, rules):
+            return "ignored by .gitignore"
+        pattern = self.matches(self.exclude_globs, name, rel_path)
+        if pattern:
+            return f"excluded by pattern '{pattern}'"
+        return None
+
+    def skip_file(self, name, rel_path, rules):
+        ''' Returns the reason for skipping a Python file by its path (None = candidate). '''
+        if name.startswith("unit_test_"):
+            return "generated test file"
+        if rules and self.is_ignored(rel_path, False, rules):
+            return "ignored by .gitignore"
+        if self.include_globs and not self.matches(self.include_globs, name, rel_path):
+            return "not matched by include patterns"
+        pattern = self.matches(self.exclude_globs, name, rel_path)
+        if pattern:
+            return f"excluded by pattern '{pattern}'"
+        return None
+
+    # Content rules
+    def skip_content(self, file_path):
+        ''' Returns the reason for skipping a Python file by its content (None = generate tests). '''
+        try:
+            size = os.path.getsize(file_path)
+            if self.max_size and size > self.max_size:
+                return f"too large ({size} > {self.max_size} bytes)"
+            if size == 0:
+                return "empty file"
+            with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+                code_text = file.read()
+        except OSError as e:
+            return f"not readable ({e.strerror})"
+
+        head = "\n".join(line for line in code_text.splitlines()[:5] if line.lstrip().startswith("#")).lower()
+        if any(marker in head for marker in GENERATED_MARKERS):
+            return "generated code"
+
+        is_init = os.path.basename(file_path) == "__init__.py"
+        if not is_init and not self.min_complexity:
+            return None
+        try:
+            tree = ast.parse(code_text)
+        except (SyntaxError, ValueError):
+            return None # Cannot be judged, the model gets it
+
+        if is_init and all(isinstance(node, (ast.Expr, ast.Import, ast.ImportFrom, ast.Pass)) and (not isinstance(node, ast.Expr) or isinstance(node.value, ast.Constant)) for node in tree.body):
+            return "empty __init__.py"
+        if self.min_complexity:
+            score = complexity(tree)
+            if score < self.min_complexity:
+                return f"too simple (complexity {score} < {self.min_complexity})"
+        return None
@@ -0,0 +1,137 @@
+import argparse # Command line options
+import json # Startup times of 'main.py', results & baseline
+import os # File handling and folder operations
+import statistics # Median of the runs
+import subprocess # Start the GUI & measure imports in fresh interpreters
+import sys # Python interpreter
+import time # Launch time
+from helpers import output_terminal # Print colored messages to the terminal
+
+REGRESSION_METRICS = ("first_paint_ms", "ready_ms") # Lower is better; import times are compared per module as well
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+def measure_startup(timeout=60):
+    '''
+    Starts 'main.py' in benchmark mode and measures how long the window takes to appear.
+
+    The GUI records absolute times and closes itself once it is drawn and the test generation logic is connected.
+
+    Return:
+    - dict: 'imported_ms' (GUI modules imported), 'first_paint_ms' (window drawn) & 'ready_ms' (Generate usable),
+      each in milliseconds since the process was launched ('error' if the GUI could not be started).
+    '''
+    environment = {**os.environ, "GENUNIT_STARTUP_BENCHMARK": "1"}
+    launched = time.time()
+    try:
+        result = subprocess.run([sys.executable, MAIN_SCRIPT], capture_output=True, text=True, timeout=timeout, env=environment, cwd=os.path.dirname(MAIN_SCRIPT))
+    except subprocess.TimeoutExpired:
+        return {"error": f"no window after {timeout}s"}
+
+    for line in result.stdout.splitlines():
+        if line.startswith("GENUNIT_STARTUP "):
+            times = json.loads(line[len("GENUNIT_STARTUP "):])
+            return {f"{name}_ms": round((value - launched) * 1000, 1) for name, value in times.items()}
+    error_lines = result.stderr.strip().splitlines()
+    return {"error": error_lines[-1] if error_lines else f"exit code {result.returncode}"}
+
+def measure_imports(module, top=10):
+    '''
+    Measures the import time of a module with 'python -X importtime' in a fresh interpreter.
+
+    Return:
+    - dict: 'total_ms' (cumulative import time) and the 'top' modules with the highest own import time.
+    '''
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, cwd=os.path.dirname(MAIN_SCRIPT))
+    if result.returncode != 0:
+        error_lines = result.stderr.strip().splitlines()
+        return {"error": error_lines[-1] if error_lines else f"exit code {result.returncode}"}
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        entries.append((name, int(own), int(cumulative)))
+    total = next((cumulative for name, _, cumulative in entries if name == module), 0)
+    slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+    return {"total_ms": round(total / 1000, 1), "slowest": [{"module": name, "self_ms": round(own / 1000, 1), "cumulative_ms": round(cumulative / 1000, 1)} for name, own, cumulative in slowest]}
+
+def compare_with_baseline(report, baseline, tolerance):
+    '''
+    Compares the startup times and import times with a stored baseline.
+
+    Return:
+    - list: Messages of all metrics that are slower than the baseline by more than 'tolerance' (share).
+    '''
+    pairs = [(metric, baseline.get("startup", {}).get(metric), report["startup"].get(metric)) for metric in REGRESSION_METRICS]
+    pairs += [(f"import {module}", baseline.get("imports", {}).get(module, {}).get("total_ms"), imports.get("total_ms")) for module, imports in report["imports"].items()]
+
+    regressions = []
+    for metric, old, new in pairs:
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if change > tolerance:
+            regressions.append(f"{metric}: {old} -> {new} ms ({change * 100:+.1f}%)")
+    return regressions
+
+def main():
+    '''
+    Runs the startup benchmark and writes the JSON report.
+
+    This method:
+    - Starts the GUI several times and keeps the median of the time to first paint & until Generate is usable.
+    - Measures the import time of the given modules with 'python -X importtime'.
+    - Optionally stores the results as baseline or compares them with the baseline.
+    '''
+    parser = argparse.ArgumentParser(description="Startup benchmark of the GUI (time to first paint & import times).")
+    parser.add_argument("--runs", type=int, default=5, help="Number of GUI starts")
+    parser.add_argument("--modules", default="gui,core", help="Comma-separated modules for 'python -X importtime'")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to report per module")
+    parser.add_argument("--no-gui", action="store_true", help="Only measure the imports (e.g. without a display)")
+    parser.add_argument("--output", default="startup_results.json", help="JSON report")
+    parser.add_argument("--baseline", default=os.path.join("benchmarks", "startup_baseline.json"), help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed deterioration against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    startup = {}
+    if not args.no_gui:
+        runs = []
+        for run in range(args.runs):
+            result = measure_startup()
+            if "error" in result:
+                output_terminal(f"Error #175: GUI could not be started - {result['error']}", "bg_red")
+                startup = {"error": result["error"]}
+                break
+            output_terminal(f"Info #175: Run {run + 1}/{args.runs}: {json.dumps(result)}", "blue")
+            runs.append(result)
+        if runs:
+            startup = {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+
+    imports = {}
+    for module in args.modules.split(","):
+        imports[module] = measure_imports(module, args.top)
+        output_terminal(f"Info #176: import {module}: {imports[module].get('total_ms', imports[module].get('error'))} ms", "blue")
+
+    report = {"created": time.strftime("%Y-%m-%d %H:%M:%S"), "python": sys.version.split()[0], "runs": args.runs, "startup": startup, "imports": imports}
+    with open(args.output, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    output_terminal(f"Info #177: Startup report saved: {args.output}", "yellow")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        output_terminal(f"Info #178: Baseline saved: {args.baseline}", "yellow")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_with_baseline(report, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            output_terminal(f"Warning #175: Regression: {regression}", "bg_yellow")
+        if regressions:
+            raise SystemExit(1)
+        output_terminal("Info #179: No regressions against the baseline.", "green")
+
+if __name__ == "__main__":
+    main()
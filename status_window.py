@@ -0,0 +1,176 @@
+import os # File names relative to the selected folder
+import customtkinter as ctk # GUI framework
+from file_status import STATES # States of a file
+from ui_bus import UIUpdateBus # Capped refresh rate of the table
+
+COLUMNS = (("file", "File", 300), ("state", "State", 90), ("tokens", "Tokens", 70), ("tokens_per_second", "Tokens/s", 70), ("elapsed", "Elapsed", 70))
+STATE_COLORS = {"queued": "grey", "streaming": "orange", "validating": "#3B8ED0", "done": "green", "failed": "red", "cancelled": "grey"}
+
+class StatusTableWindow(ctk.CTkToplevel):
+    '''
+    Window with the state of every file of the current run.
+
+    The table is virtualized: only 'visible_rows' rows of labels exist and show the part of the
+    (filtered & sorted) file list at the scroll position, so runs with thousands of files do not
+    create thousands of widgets. Changes of the 'FileStatusTracker' are rendered at most
+    'refresh_rate' times per second.
+    '''
+    def __init__(self, app, tracker, visible_rows=20, refresh_rate=5):
+        '''
+        Initializes the StatusTableWindow class.
+
+        Parameters:
+        - app (GenUnitApp): The main window.
+        - tracker (FileStatusTracker): States of the files of the run.
+        - visible_rows (int): Number of table rows shown at once.
+        - refresh_rate (int): Maximum number of renders per second.
+        '''
+        super().__init__(app)
+        self.app = app
+        self.tracker = tracker
+        self.visible_rows = visible_rows
+        self.render_bus = UIUpdateBus(self, frame_rate=refresh_rate)
+
+        self.sort_column = None # None = order of the run
+        self.sort_descending = False
+        self.state_filter = "all"
+        self.first_row = 0 # Index of the first shown row
+        self.row_count = 0 # Rows after filtering
+        self.shown_texts = {} # (row, column) -> shown text, only changed labels are updated
+
+        self.title("File Status [GenUnit]")
+        self.geometry("680x560")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        # Filter & summary
+        frame_filter = ctk.CTkFrame(self)
+        frame_filter.pack(padx=10, pady=(10, 0), fill="x")
+        self.filter_buttons = ctk.CTkSegmentedButton(frame_filter, values=["all", *STATES], command=self.set_filter)
+        self.filter_buttons.set("all")
+        self.filter_buttons.pack(side="top", anchor="w", padx=5, pady=4)
+        self.summary_label = ctk.CTkLabel(frame_filter, text="", font=("Arial", 12))
+        self.summary_label.pack(side="top", anchor="w", padx=5)
+
+        # Table: header buttons sort, a fixed pool of labels shows the visible rows
+        frame_table = ctk.CTkFrame(self)
+        frame_table.pack(padx=10, pady=10, fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(frame_table, command=self.on_scroll)
+        self.scrollbar.grid(row=0, column=len(COLUMNS), rowspan=visible_rows + 1, sticky="ns")
+
+        self.header_buttons = {}
+        for column, (key, title, width) in enumerate(COLUMNS):
+            button = ctk.CTkButton(frame_table, text=title, width=width, height=24, fg_color="grey", command=lambda key=key: self.sort_by(key))
+            button.grid(row=0, column=column, padx=1, pady=(0, 2), sticky="w")
+            self.header_buttons[key] = button
+
+        self.cells = []
+        for row in range(visible_rows):
+            cells = []
+            for column, (key, _, width) in enumerate(COLUMNS):
+                label = ctk.CTkLabel(frame_table, text="", width=width, height=20, anchor="w", font=("Courier", 11))
+                label.grid(row=row + 1, column=column, padx=1, sticky="w")
+                cells.append(label)
+            self.cells.append(cells)
+
+        for widget in (self, frame_table):
+            widget.bind("<MouseWheel>", lambda event: self.scroll_rows(-3 if event.delta > 0 else 3))
+            widget.bind("<Button-4>", lambda event: self.scroll_rows(-3)) # Linux
+            widget.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+    def show(self):
+        ''' Shows the window. '''
+        self.deiconify()
+        self.lift()
+        self.render()
+
+    def destroy(self):
+        ''' Stops the render bus before the window is destroyed. '''
+        self.render_bus.close()
+        super().destroy()
+
+    def schedule_render(self):
+        ''' Requests a render (can be called from any thread, coalesced to 'refresh_rate'). '''
+        self.render_bus.post(self.render, key="render")
+
+    # Sorting, filtering & scrolling
+    def sort_by(self, column):
+        ''' Sorts by a column (clicking the same column again reverses the order). '''
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, column in ("tokens", "tokens_per_second", "elapsed")
+        self.render()
+
+    def set_filter(self, state):
+        ''' Shows only the files in a state ('all' = every file). '''
+        self.state_filter = state
+        self.first_row = 0
+        self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        ''' Handles the scrollbar ('moveto' with a fraction or 'scroll' by units/pages). '''
+        if action == "moveto":
+            self.first_row = int(float(amount) * self.row_count)
+            self.render()
+        else:
+            self.scroll_rows(int(amount) * (self.visible_rows if unit == "pages" else 1))
+
+    def scroll_rows(self, rows):
+        ''' Scrolls by a number of rows. '''
+        self.first_row += rows
+        self.render()
+
+    # Rendering
+    def render(self):
+        '''
+        Shows the visible part of the table (runs in the Tk main loop).
+
+        This method:
+        - Takes a snapshot of the tracker, filters it by state and sorts it
+        - Fills the label pool with the rows at the scroll position (only changed labels are updated)
+        - Updates the scrollbar and the number of files per state
+        '''
+        if not self.winfo_viewable():
+            return
+
+        rows = self.tracker.rows()
+        if self.state_filter != "all":
+            rows = [row for row in rows if row[1] == self.state_filter]
+        if self.sort_column:
+            index = [key for key, _, _ in COLUMNS].index(self.sort_column)
+            rows.sort(key=lambda row: row[index], reverse=self.sort_descending)
+
+        self.row_count = len(rows)
+        self.first_row = max(0, min(self.first_row, self.row_count - self.visible_rows))
+        visible = rows[self.first_row:self.first_row + self.visible_rows]
+        for row_index, cells in enumerate(self.cells):
+            row = visible[row_index] if row_index < len(visible) else None
+            texts = self.row_texts(row)
+            for column, label in enumerate(cells):
+                if self.shown_texts.get((row_index, column)) != texts[column]:
+                    self.shown_texts[(row_index, column)] = texts[column]
+                    label.configure(text=texts[column])
+            state = row[1] if row else None
+            if self.shown_texts.get((row_index, "color")) != state:
+                self.shown_texts[(row_index, "color")] = state
+                cells[1].configure(text_color=STATE_COLORS.get(state, "grey"))
+
+        if self.row_count:
+            self.scrollbar.set(self.first_row / self.row_count, (self.first_row + len(visible)) / self.row_count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        counts = self.tracker.counts()
+        self.summary_label.configure(text=" | ".join(f"{state}: {counts[state]}" for state in STATES if counts[state]))
+
+    def row_texts(self, row):
+        ''' Returns the texts of the columns of a row (empty for rows without a file). '''
+        if row is None:
+            return ("",) * len(COLUMNS)
+        file, state, tokens, tokens_per_second, elapsed = row
+        return (
+            os.path.relpath(file, self.app.folder_path) if self.app.folder_path else os.path.basename(file),
+            state,
+            str(tokens) if tokens else "",
+            f"{tokens_per_second:.1f}" if tokens_per_second else "",
+            f"{elapsed:.1f}s" if elapsed else "",
+        )
@@ -0,0 +1,76 @@
+import threading # Chunks arrive from the worker threads
+
+class StreamPreview:
+    '''
+    Collects the streamed model output of the files being generated, for the live preview.
+
+    Only the last 'max_chars' characters of every file are kept, so long outputs never grow
+    the buffer (or the preview text box) without limit. The worker threads call 'start()',
+    'append()' and 'finish()'; the GUI reads the new text with 'read()' at its own refresh rate.
+    '''
+    def __init__(self, max_chars=20000, on_update=None):
+        '''
+        Initializes the StreamPreview class.
+
+        Args:
+        - max_chars (int): Characters kept per file.
+        - on_update (callable, optional): Called with the file name when text arrives or files start/finish (from the worker threads).
+        '''
+        self.max_chars = max_chars
+        self.on_update = on_update
+        self.lock = threading.Lock()
+        self.buffers = {} # File -> [kept text, total characters received]
+        self.in_flight = [] # Files being generated, in start order
+
+    def start(self, filename):
+        ''' Registers a file whose output is streamed from now on. '''
+        with self.lock:
+            self.buffers[filename] = ["", 0]
+            if filename not in self.in_flight:
+                self.in_flight.append(filename)
+        self.notify(filename)
+
+    def append(self, filename, text):
+        ''' Adds a streamed chunk of a file. '''
+        with self.lock:
+            buffer = self.buffers.setdefault(filename, ["", 0])
+            buffer[0] += text
+            buffer[1] += len(text)
+            if len(buffer[0]) > 2 * self.max_chars: # Trim rarely, so appending stays cheap
+                buffer[0] = buffer[0][-self.max_chars:]
+        self.notify(filename)
+
+    def finish(self, filename):
+        ''' Removes a file when its generation is done (its text stays readable until it is started again). '''
+        with self.lock:
+            if filename in self.in_flight:
+                self.in_flight.remove(filename)
+        self.notify(filename)
+
+    def files(self):
+        ''' Returns the files being generated, in start order. '''
+        with self.lock:
+            return list(self.in_flight)
+
+    def read(self, filename, offset=None):
+        '''
+        Returns the text of a file received after 'offset'.
+
+        Args:
+        - filename (str): The file.
+        - offset (int, optional): Number of characters already shown (None = nothing shown yet).
+
+        Return:
+        - Tuple (str, bool, int): New text, True if it replaces the shown text (the shown part was trimmed or the file restarted), new offset.
+        '''
+        with self.lock:
+            text, total = self.buffers.get(filename, ("", 0))
+        text = text[-self.max_chars:]
+        if offset is None or offset > total or total - offset > len(text):
+            return text, True, total
+        return text[len(text) - (total - offset):], False, total
+
+    def notify(self, filename):
+        ''' Calls 'on_update' if it is set. '''
+        if self.on_update:
+            self.on_update(filename)
@@ -0,0 +1,162 @@
+import collections # Token counts of the last seconds
+import json # Persisted rates per model
+import os # File sizes, handling of the cache file
+import threading # Tokens are reported by the worker threads
+import time # Token rate & elapsed time
+
+class ThroughputEstimator:
+    '''
+    Estimates the remaining time of a generation run from measured token rates.
+
+    The number of output tokens of a file is predicted from its size ('tokens_per_byte' of the model,
+    refined with every finished file). The remaining time is the predicted tokens of the outstanding
+    files (minus the tokens they already streamed) divided by the aggregate tokens per second of the
+    last 'window' seconds, so it follows the real throughput of all workers together.
+
+    The rates of the last run of every model are stored in '<cache_dir>/throughput.json' and used
+    as starting values, so the first estimate is sensible before the first file is finished.
+    '''
+    def __init__(self, cache_dir=".genunit_cache", window=15.0, default_tokens_per_byte=0.35, prior_bytes=20000):
+        '''
+        Initializes the ThroughputEstimator class.
+
+        Args:
+        - cache_dir (str): Folder of the persisted rates.
+        - window (float): Seconds over which the aggregate tokens per second are measured.
+        - default_tokens_per_byte (float): Output tokens per byte of source code for models without stored rates.
+        - prior_bytes (int): Weight of the starting value of 'tokens_per_byte' (in bytes of finished files).
+        '''
+        self.cache_path = os.path.join(cache_dir, "throughput.json")
+        self.window = window
+        self.default_tokens_per_byte = default_tokens_per_byte
+        self.prior_bytes = prior_bytes
+        self.lock = threading.Lock()
+        self.start(None, [])
+
+    # Run
+    def start(self, model_name, files):
+        '''
+        Starts a new run.
+
+        Args:
+        - model_name (str): The model of the run (selects the stored rates).
+        - files (list): The files of the run.
+        '''
+        rates = self.load().get(model_name, {}) if model_name else {}
+        sizes = {}
+        for file in files:
+            try:
+                sizes[file] = os.path.getsize(file)
+            except OSError:
+                sizes[file] = 0
+        with self.lock:
+            self.model_name = model_name
+            self.sizes = sizes
+            self.streamed = dict.fromkeys(files, 0) # Outstanding file -> tokens streamed so far
+            self.prior_tokens_per_byte = rates.get("tokens_per_byte", self.default_tokens_per_byte)
+            self.prior_tokens_per_second = rates.get("tokens_per_second")
+            self.finished_tokens = 0 # Tokens & bytes of the files done so far
+            self.finished_bytes = 0
+            self.finished_files = 0
+            self.total_tokens = 0
+            self.buckets = collections.deque() # [second, tokens] of the last 'window' seconds
+            self.started_at = time.perf_counter()
+
+    def add_tokens(self, filename, count=1):
+        ''' Counts streamed tokens of a file. '''
+        second = int(time.perf_counter())
+        with self.lock:
+            if filename in self.streamed:
+                self.streamed[filename] += count
+            self.total_tokens += count
+            if self.buckets and self.buckets[-1][0] == second:
+                self.buckets[-1][1] += count
+            else:
+                self.buckets.append([second, count])
+
+    def finish(self, filename, state):
+        ''' Removes a finished file; the tokens of a 'done' file refine 'tokens_per_byte'. '''
+        with self.lock:
+            tokens = self.streamed.pop(filename, None)
+            if tokens is None:
+                return
+            self.finished_files += 1
+            if state == "done" and tokens:
+                self.finished_tokens += tokens
+                self.finished_bytes += self.sizes.get(filename, 0)
+
+    # Estimates
+    def tokens_per_byte(self):
+        ''' Returns the output tokens per byte of source code (stored value, refined with the finished files). '''
+        return (self.prior_tokens_per_byte * self.prior_bytes + self.finished_tokens) / (self.prior_bytes + self.finished_bytes)
+
+    def tokens_per_second(self):
+        ''' Returns the aggregate tokens per second of the last 'window' seconds (stored value until tokens arrive). '''
+        now = time.perf_counter()
+        with self.lock:
+            while self.buckets and self.buckets[0][0] < now - self.window:
+                self.buckets.popleft()
+            tokens = sum(count for _, count in self.buckets)
+            span = min(self.window, now - self.started_at)
+        if tokens and span >= 1.0:
+            return tokens / span
+        return self.prior_tokens_per_second or 0.0
+
+    def files_per_minute(self):
+        ''' Returns the finished files per minute since the start of the run. '''
+        elapsed = max(time.perf_counter() - self.started_at, 1.0) # No extreme rates in the first second
+        return self.finished_files * 60 / elapsed
+
+    def remaining_tokens(self):
+        ''' Returns the predicted tokens the outstanding files still have to stream. '''
+        with self.lock:
+            ratio = self.tokens_per_byte()
+            return sum(max(self.sizes.get(file, 0) * ratio - tokens, 0) for file, tokens in self.streamed.items())
+
+    def progress(self):
+        ''' Returns the finished part of the predicted work (0.0 - 1.0), so large files weigh more than small ones. '''
+        remaining = self.remaining_tokens()
+        with self.lock:
+            done = self.total_tokens
+        return done / (done + remaining) if done + remaining else 0.0
+
+    def eta(self):
+        ''' Returns the predicted remaining seconds (None while no token rate is known). '''
+        remaining = self.remaining_tokens()
+        if not remaining:
+            return 0.0
+        tokens_per_second = self.tokens_per_second()
+        return remaining / tokens_per_second if tokens_per_second else None
+
+    def summary(self):
+        ''' Returns the estimates as text, e.g. 'ETA 3m 12s | 45.2 tokens/s | 6.1 files/min'. '''
+        eta = self.eta()
+        if eta is None:
+            eta_text = "ETA estimating..."
+        else:
+            minutes, seconds = divmod(int(eta), 60)
+            hours, minutes = divmod(minutes, 60)
+            eta_text = f"ETA {hours}h {minutes:02d}m" if hours else f"ETA {minutes}m {seconds:02d}s"
+        return f"{eta_text} | {self.tokens_per_second():.1f} tokens/s | {self.files_per_minute():.1f} files/min"
+
+    # Persisted rates
+    def load(self):
+        ''' Returns the stored rates per model (empty if nothing was stored yet). '''
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                return dict(json.load(cache_file))
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self):
+        ''' Stores the rates of the run for its model (written to a temporary file first, so a crash never leaves a broken file). '''
+        elapsed = time.perf_counter() - self.started_at
+        if not self.model_name or not self.finished_bytes or elapsed <= 0:
+            return
+        rates = self.load()
+        rates[self.model_name] = {"tokens_per_byte": self.tokens_per_byte(), "tokens_per_second": self.total_tokens / elapsed}
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(rates, cache_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.cache_path)
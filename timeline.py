@@ -0,0 +1,194 @@
+import json # Chrome trace-event file
+import os # Folder of the trace file
+import threading # Stages are reported by the worker threads
+import time # Start & end of the stages
+
+STAGES = ("queue", "prompt_eval", "streaming", "extraction", "validation", "saving")
+
+class RunTimeline:
+    '''
+    Records when every file of a generation run is in which stage, on which lane.
+
+    Every thread that works on files (the workers of the 'ThreadPoolExecutor' and the thread collecting
+    the results) gets its own lane. A file waits in the 'queue' from the start of the run until a worker
+    takes it, then passes 'prompt_eval' (file read & request sent until the first token, including loading the model),
+    'streaming' and 'extraction' on the worker's lane, and 'validation' (merging the tests) & 'saving'
+    on the lane of the collecting thread.
+
+    'start_stage()' ends the current stage of a file and starts the next one, so the pipeline only
+    reports the transitions. The timeline is exported as Chrome trace-event JSON
+    (open in 'chrome://tracing' or https://ui.perfetto.dev).
+    '''
+    def __init__(self, on_change=None):
+        '''
+        Initializes the RunTimeline class.
+
+        Args:
+        - on_change (callable, optional): Called without arguments after every stage change (from the worker threads).
+        '''
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        self.reset([])
+
+    def reset(self, files, lane_name="Results"):
+        ''' Starts a new run: all files are queued from now on, the calling thread (collecting the results) gets the first lane. '''
+        with self.lock:
+            self.started_at = time.perf_counter()
+            self.finished_at = None
+            self.lanes = {} # Thread id -> lane number
+            self.lane_names = []
+            self.events = [] # (lane, file, stage, start, end) in seconds since the start of the run
+            self.open_stages = {} # File -> (lane, stage, start)
+            self.queued = {file: 0.0 for file in files} # File -> start of its queue wait
+            self.file_count = len(files)
+            self.lane(lane_name)
+        self.notify()
+
+    def lane(self, name=None):
+        ''' Returns the lane of the calling thread (a new lane for a thread not seen before). '''
+        thread_id = threading.get_ident()
+        if thread_id not in self.lanes:
+            self.lanes[thread_id] = len(self.lane_names)
+            self.lane_names.append(name or f"Worker {len(self.lane_names)}") # Lane 0 is the collecting thread
+        return self.lanes[thread_id]
+
+    def start_stage(self, filename, stage, lane_name=None):
+        '''
+        Ends the current stage of a file and starts the next one on the lane of the calling thread.
+
+        Args:
+        - filename (str): The file.
+        - stage (str): The new stage (see 'STAGES').
+        - lane_name (str, optional): Name of the lane if the calling thread gets a new one (default: 'Worker <n>').
+        '''
+        now = time.perf_counter() - self.started_at
+        with self.lock:
+            lane = self.lane(lane_name)
+            self.close(filename, now)
+            queued_at = self.queued.pop(filename, None)
+            if queued_at is not None:
+                self.events.append((lane, filename, "queue", queued_at, now))
+            self.open_stages[filename] = (lane, stage, now)
+        self.notify()
+
+    def end_stage(self, filename):
+        ''' Ends the current stage of a file. '''
+        now = time.perf_counter() - self.started_at
+        with self.lock:
+            self.close(filename, now)
+        self.notify()
+
+    def close(self, filename, now):
+        ''' Moves the open stage of a file to the events (lock must be held). '''
+        open_stage = self.open_stages.pop(filename, None)
+        if open_stage:
+            lane, stage, start = open_stage
+            self.events.append((lane, filename, stage, start, now))
+
+    def finish(self):
+        ''' Ends the run (open stages end now). '''
+        now = time.perf_counter() - self.started_at
+        with self.lock:
+            for filename in list(self.open_stages):
+                self.close(filename, now)
+            self.finished_at = now
+        self.notify()
+
+    # Snapshots
+    def elapsed(self):
+        ''' Returns the seconds since the start of the run (its duration once it is finished). '''
+        return self.finished_at if self.finished_at is not None else time.perf_counter() - self.started_at
+
+    def snapshot(self):
+        '''
+        Returns all stages, including the open ones (they end now).
+
+        Return:
+        - Tuple (list, list): Lane names, (lane, file, stage, start, end) of every stage.
+        '''
+        now = self.elapsed()
+        with self.lock:
+            events = list(self.events)
+            events.extend((lane, file, stage, start, now) for file, (lane, stage, start) in self.open_stages.items())
+            return list(self.lane_names), events
+
+    def segments(self, width):
+        '''
+        Returns the stages scaled to a width in pixels, merged per pixel.
+
+        Every pixel of a lane shows the stage that covers most of it, and neighbouring pixels with the
+        same stage are one segment, so a lane never needs more than 'width' rectangles, however many
+        files the run has. The queue wait is not part of a lane (it overlaps the files before it).
+
+        Return:
+        - Tuple (list, list): Lane names, per lane a list of (first pixel, last pixel + 1, stage, file).
+        '''
+        lane_names, events = self.snapshot()
+        scale = width / max(self.elapsed(), 1e-9)
+        pixels = [[None] * width for _ in lane_names] # Per pixel: (covered part, stage, file)
+        for lane, file, stage, start, end in events:
+            if stage == "queue":
+                continue
+            first, last = int(start * scale), min(int(end * scale), width - 1)
+            for pixel in range(first, last + 1):
+                covered = min(end * scale, pixel + 1) - max(start * scale, pixel)
+                current = pixels[lane][pixel]
+                if current is None or covered > current[0]:
+                    pixels[lane][pixel] = (covered, stage, file)
+
+        lanes = []
+        for lane_pixels in pixels:
+            segments = []
+            for pixel, value in enumerate(lane_pixels):
+                if value is None:
+                    continue
+                if segments and segments[-1][1] == pixel and segments[-1][2] == value[1]:
+                    segments[-1][1] = pixel + 1
+                else:
+                    segments.append([pixel, pixel + 1, value[1], value[2]])
+            lanes.append([tuple(segment) for segment in segments])
+        return lane_names, lanes
+
+    def utilization(self):
+        ''' Returns the busy part of every lane (0.0 - 1.0, without queue waits), to spot idle workers. '''
+        lane_names, events = self.snapshot()
+        elapsed = self.elapsed()
+        busy = [0.0] * len(lane_names)
+        for lane, _, stage, start, end in events:
+            if stage != "queue":
+                busy[lane] += end - start
+        return [min(time_busy / elapsed, 1.0) if elapsed > 0 else 0.0 for time_busy in busy]
+
+    # Export
+    def to_chrome_trace(self):
+        '''
+        Converts the timeline to Chrome trace-event format.
+
+        Every lane is a thread, every stage a complete event ('X') with the file as argument;
+        the queue waits are async events ('b'/'e'), so they do not overlap the stages of the lanes.
+
+        Return:
+        - dict: The trace ('traceEvents', times in microseconds since the start of the run).
+        '''
+        lane_names, events = self.snapshot()
+        trace = [{"ph": "M", "name": "process_name", "pid": 1, "tid": 0, "args": {"name": "GenUnit run"}}]
+        trace.extend({"ph": "M", "name": "thread_name", "pid": 1, "tid": lane, "args": {"name": name}} for lane, name in enumerate(lane_names))
+        for index, (lane, file, stage, start, end) in enumerate(events):
+            if stage == "queue":
+                common = {"name": "queue", "cat": "queue", "id": index, "pid": 1, "tid": lane, "args": {"file": file}}
+                trace.append({**common, "ph": "b", "ts": start * 1e6})
+                trace.append({**common, "ph": "e", "ts": end * 1e6})
+            else:
+                trace.append({"ph": "X", "name": stage, "cat": "stage", "pid": 1, "tid": lane, "ts": start * 1e6, "dur": (end - start) * 1e6, "args": {"file": file}})
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        ''' Writes the timeline as Chrome trace-event JSON. '''
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+    def notify(self):
+        ''' Calls 'on_change' if it is set. '''
+        if self.on_change:
+            self.on_change()
@@ -0,0 +1,137 @@
+import customtkinter as ctk # GUI framework
+from tkinter import filedialog # Choose the file of the exported trace
+from helpers import output_terminal # Terminal logging
+from timeline import STAGES # Stages of a file
+from ui_bus import UIUpdateBus # Capped refresh rate of the timeline
+
+STAGE_COLORS = {"queue": "#555555", "prompt_eval": "#E0A030", "streaming": "#3B8ED0", "extraction": "#9060C0", "validation": "#D05050", "saving": "#40A060"}
+LANE_HEIGHT = 22
+NAME_WIDTH = 110 # Lane names & utilization left of the bars
+AXIS_HEIGHT = 20
+
+class TimelineWindow(ctk.CTkToplevel):
+    '''
+    Window with the timeline of the current (or last) run: one lane per worker, one bar per stage of a file.
+
+    Long idle gaps, a single large file stretching the end of the run or a model reload stalling all
+    lanes at once ('prompt_eval') are visible at a glance. The bars are merged per pixel
+    ('RunTimeline.segments()'), so runs with thousands of files draw at most one rectangle per pixel
+    and lane; the window is redrawn at most 'refresh_rate' times per second while the run is going.
+    '''
+    def __init__(self, app, timeline, refresh_rate=2):
+        '''
+        Initializes the TimelineWindow class.
+
+        Parameters:
+        - app (GenUnitApp): The main window.
+        - timeline (RunTimeline): Stages of the files of the run.
+        - refresh_rate (int): Maximum number of renders per second.
+        '''
+        super().__init__(app)
+        self.app = app
+        self.timeline = timeline
+        self.refresh_rate = refresh_rate
+        self.render_bus = UIUpdateBus(self, frame_rate=refresh_rate)
+        self.lanes = [] # Shown segments per lane (for the file under the mouse)
+        self.tick_job = None
+
+        self.title("Timeline [GenUnit]")
+        self.geometry("900x420")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        frame_top = ctk.CTkFrame(self)
+        frame_top.pack(padx=10, pady=(10, 0), fill="x")
+        self.summary_label = ctk.CTkLabel(frame_top, text="", font=("Arial", 12))
+        self.summary_label.pack(side="left", padx=5)
+        self.btn_export = ctk.CTkButton(frame_top, text="Export Trace", command=self.export_trace, fg_color="grey", width=100)
+        self.btn_export.pack(side="right", padx=5, pady=4)
+
+        self.canvas = ctk.CTkCanvas(self, background="#1d1e1e", highlightthickness=0)
+        self.canvas.pack(padx=10, pady=10, fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
+        self.canvas.bind("<Motion>", self.show_file)
+
+        # Legend & file under the mouse
+        frame_legend = ctk.CTkFrame(self)
+        frame_legend.pack(padx=10, pady=(0, 10), fill="x")
+        for stage in STAGES[1:]:
+            ctk.CTkLabel(frame_legend, text=f"■ {stage}", text_color=STAGE_COLORS[stage], font=("Arial", 11)).pack(side="left", padx=6)
+        self.file_label = ctk.CTkLabel(frame_legend, text="", font=("Arial", 11))
+        self.file_label.pack(side="right", padx=6)
+
+    def show(self):
+        ''' Shows the window and redraws it while a run is going. '''
+        self.deiconify()
+        self.lift()
+        self.render()
+        self.start_ticking()
+
+    def destroy(self):
+        ''' Stops the render bus & the redraw timer before the window is destroyed. '''
+        if self.tick_job is not None:
+            self.after_cancel(self.tick_job)
+        self.render_bus.close()
+        super().destroy()
+
+    def schedule_render(self):
+        ''' Requests a render (can be called from any thread, coalesced to 'refresh_rate'). '''
+        self.render_bus.post(self.render, key="render")
+
+    def start_ticking(self):
+        ''' Starts the redraw timer (at the start of a run; does nothing if it is already running). '''
+        if self.tick_job is None:
+            self.tick()
+
+    def tick(self):
+        ''' Redraws the window while a run is going, so the open stages keep growing. '''
+        self.tick_job = None
+        if self.app.is_generating_tests and self.winfo_viewable():
+            self.render()
+            self.tick_job = self.after(int(1000 / self.refresh_rate), self.tick)
+
+    def render(self):
+        '''
+        Draws the lanes (runs in the Tk main loop).
+
+        This method:
+        - Draws a time axis and, per lane, its name with the busy part of the run
+        - Draws the merged segments of every lane in the color of their stage
+        - Shows the number of lanes & files and the duration of the run
+        '''
+        if not self.winfo_viewable():
+            return
+        width = max(self.canvas.winfo_width() - NAME_WIDTH - 10, 10)
+        lane_names, self.lanes = self.timeline.segments(width)
+        utilization = self.timeline.utilization()
+        elapsed = self.timeline.elapsed()
+
+        self.canvas.delete("all")
+        for tick in range(5):
+            x = NAME_WIDTH + tick * width / 4
+            self.canvas.create_line(x, AXIS_HEIGHT - 4, x, AXIS_HEIGHT + len(lane_names) * LANE_HEIGHT, fill="#444444")
+            self.canvas.create_text(x, 8, text=f"{elapsed * tick / 4:.1f}s", fill="grey", font=("Arial", 9))
+        for lane, (name, segments) in enumerate(zip(lane_names, self.lanes)):
+            y = AXIS_HEIGHT + lane * LANE_HEIGHT
+            self.canvas.create_text(5, y + LANE_HEIGHT / 2, text=f"{name} {utilization[lane]:.0%}", anchor="w", fill="white", font=("Arial", 10))
+            for first, last, stage, _ in segments:
+                self.canvas.create_rectangle(NAME_WIDTH + first, y + 3, NAME_WIDTH + last, y + LANE_HEIGHT - 3, fill=STAGE_COLORS[stage], width=0)
+
+        self.summary_label.configure(text=f"{len(lane_names)} lanes | {self.timeline.file_count} files | {elapsed:.1f}s")
+
+    def show_file(self, event):
+        ''' Shows the file & stage under the mouse. '''
+        lane, x = int((event.y - AXIS_HEIGHT) // LANE_HEIGHT), event.x - NAME_WIDTH
+        text = ""
+        if 0 <= lane < len(self.lanes):
+            for first, last, stage, file in self.lanes[lane]:
+                if first <= x < last:
+                    text = f"{stage}: {file}"
+                    break
+        self.file_label.configure(text=text)
+
+    def export_trace(self):
+        ''' Saves the timeline as Chrome trace-event JSON. '''
+        path = filedialog.asksaveasfilename(title="Export Timeline", defaultextension=".json", filetypes=[("Chrome Trace", "*.json")])
+        if path:
+            self.timeline.save(path)
+            output_terminal(f"Info #186: Timeline saved (open in chrome://tracing or ui.perfetto.dev): {path}", "yellow")
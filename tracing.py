@@ -0,0 +1,198 @@
+import contextlib # Span context manager (and a shared no-op span when tracing is off)
+import io # Text report of the cProfile statistics
+import json # Span file (Chrome trace-event format with a summary)
+import os # Folder of the span & profile files
+import threading # Spans are recorded by the worker threads
+import time # Start & end of the spans
+
+SPANS = ("discovery", "file_read", "prompt_build", "request_submit", "first_token", "streaming", "extraction", "save_raw", "save", "log_write")
+MODEL_SPANS = ("first_token", "streaming") # Time spent waiting for the model
+NO_SPAN = contextlib.nullcontext() # Returned by 'TestGenerator.span()' when tracing is off
+
+class Tracer:
+    '''
+    Records how long every stage of the pipeline takes (spans), per file and thread.
+
+    Spans are aggregated by name (count, total & maximum), so the summary stays small for any
+    number of files; the single spans are kept up to 'max_spans' for the trace file.
+    With tracing off the pipeline gets 'NO_SPAN' instead, so the overhead is a single check per span.
+    '''
+    def __init__(self, max_spans=200000):
+        '''
+        Initializes the Tracer class.
+
+        Args:
+        - max_spans (int): Single spans kept for the trace file (the summary counts all).
+        '''
+        self.max_spans = max_spans
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        ''' Removes all spans (start of a new run). '''
+        with self.lock:
+            self.started_at = time.perf_counter()
+            self.first_start = None # Start of the first & end of the last span (duration of the run)
+            self.last_end = None
+            self.spans = [] # (name, file, thread id, start, end)
+            self.stats = {} # Name -> [count, total seconds, maximum seconds]
+
+    @contextlib.contextmanager
+    def span(self, name, filename=None):
+        ''' Records the time of the enclosed block as a span. '''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), filename)
+
+    def add(self, name, start, end, filename=None):
+        ''' Records a span measured with 'time.perf_counter()'. '''
+        duration = end - start
+        with self.lock:
+            stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+            if len(self.spans) < self.max_spans:
+                self.spans.append((name, filename, threading.get_ident(), start, end))
+
+    def summary(self):
+        '''
+        Returns the aggregated spans.
+
+        Return:
+        - dict: Per span name 'count', 'total' (s), 'mean' & 'max' (ms); 'wall' (s from the first to the last span) and
+          'non_model' (s of all spans except waiting for the model, summed over the threads).
+        '''
+        with self.lock:
+            stats = {name: list(values) for name, values in self.stats.items()}
+            wall = self.last_end - self.first_start if self.first_start is not None else 0.0
+        summary = {
+            name: {"count": count, "total": total, "mean": total / count * 1000, "max": maximum * 1000}
+            for name, (count, total, maximum) in sorted(stats.items(), key=lambda item: SPANS.index(item[0]) if item[0] in SPANS else len(SPANS))
+        }
+        return {
+            "spans": summary,
+            "wall": wall,
+            "non_model": sum(values["total"] for name, values in summary.items() if name not in MODEL_SPANS),
+        }
+
+    def save(self, path):
+        ''' Writes the spans as Chrome trace-event JSON (one track per thread) with the summary in 'otherData'. '''
+        with self.lock:
+            spans = list(self.spans)
+        threads = {}
+        events = []
+        for name, filename, thread_id, start, end in spans:
+            tid = threads.setdefault(thread_id, len(threads))
+            events.append({"ph": "X", "name": name, "cat": "span", "pid": 1, "tid": tid, "ts": (start - self.started_at) * 1e6, "dur": (end - start) * 1e6, "args": {"file": filename} if filename else {}})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}, trace_file)
+
+class RunProfiler:
+    '''
+    Opt-in profiling of a generation run: 'cprofile' (CPU time per function) or 'tracemalloc' (memory per line).
+
+    cProfile only sees the thread that enables it, so every worker call is wrapped ('wrap()') and runs
+    under the profile of its thread; the statistics of all threads are merged when the run stops.
+    From Python 3.12 on, cProfile is process-wide; the wrapped calls are then covered by the profile
+    of the collecting thread.
+    '''
+    def __init__(self, mode):
+        '''
+        Initializes the RunProfiler class.
+
+        Args:
+        - mode (str): 'cprofile' or 'tracemalloc'.
+        '''
+        if mode not in ("cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown profiler '{mode}' (use 'cprofile' or 'tracemalloc')")
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.profiles = [] # cProfile.Profile of every profiled thread
+
+    def start(self):
+        ''' Starts profiling (in the thread collecting the results). '''
+        if self.mode == "tracemalloc":
+            import tracemalloc # Deferred: only needed when profiling
+            tracemalloc.start(25)
+        else:
+            self.profiles = []
+            self.local = threading.local()
+            self.run_profile = self.thread_profile()
+            if self.run_profile:
+                self.run_profile.enable()
+
+    def thread_profile(self):
+        ''' Returns the cProfile profile of the calling thread (None if a process-wide profile already covers it). '''
+        profile = getattr(self.local, "profile", False)
+        if profile is False:
+            import cProfile # Deferred: only needed when profiling
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                profile.disable()
+                with self.lock:
+                    self.profiles.append(profile)
+            except ValueError: # Python 3.12+: only one active profile, it already covers this thread
+                profile = None
+            self.local.profile = profile
+        return profile
+
+    def wrap(self, function):
+        ''' Returns 'function' running under the cProfile profile of its thread (tracemalloc needs no wrapping). '''
+        if self.mode != "cprofile":
+            return function
+
+        def profiled(*args, **kwargs):
+            profile = self.thread_profile()
+            if profile:
+                profile.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if profile:
+                    profile.disable()
+        return profiled
+
+    def stop(self, path):
+        '''
+        Stops profiling and writes the result.
+
+        Args:
+        - path (str): File name without extension: '<path>.prof' (load with 'pstats' or snakeviz) & '<path>.txt' for
+          cProfile, '<path>.txt' (largest allocations by line) for tracemalloc.
+
+        Return:
+        - list: The written files.
+        '''
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self.mode == "tracemalloc":
+            import tracemalloc # Deferred: only needed when profiling
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(f"{path}.txt", "w", encoding="utf-8") as report:
+                report.write(f"Current: {current / 1e6:.1f} MB, peak: {peak / 1e6:.1f} MB\n\n")
+                for statistic in snapshot.statistics("lineno")[:40]:
+                    report.write(f"{statistic}\n")
+            return [f"{path}.txt"]
+
+        import pstats # Deferred: only needed when profiling
+        if self.run_profile:
+            self.run_profile.disable()
+        with self.lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(f"{path}.prof")
+        text = io.StringIO()
+        pstats.Stats(f"{path}.prof", stream=text).sort_stats("cumulative").print_stats(40)
+        with open(f"{path}.txt", "w", encoding="utf-8") as report:
+            report.write(text.getvalue())
+        return [f"{path}.prof", f"{path}.txt"]
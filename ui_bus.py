@@ -0,0 +1,70 @@
+import queue # Thread-safe event queue
+from helpers import output_terminal # Report failing updates
+
+class UIUpdateBus:
+    '''
+    Passes UI updates from worker threads to the Tk main loop.
+
+    Tk is not thread-safe, so worker threads only 'post()' updates into a queue.
+    The main loop drains the queue with 'after()' at a fixed frame rate:
+    - Updates with a 'key' (progress, status, ...) are coalesced, only the latest one per frame is applied.
+    - Updates without a key (e.g. completion callbacks) are all applied, in the order they were posted.
+    The bus must be created in the main thread, which starts the 'after()' poll; worker threads never
+    touch Tk. A failing update is reported and does not stop the updates after it.
+    '''
+    def __init__(self, root, frame_rate=30):
+        '''
+        Initializes the UIUpdateBus class.
+
+        Args:
+        - root (tkinter.Misc): Widget whose 'after()' runs the updates in the main loop.
+        - frame_rate (int): Maximum number of frames per second.
+        '''
+        self.root = root
+        self.interval = max(1, int(1000 / frame_rate))
+        self.queue = queue.SimpleQueue()
+        self.closed = False
+        self.poll_job = self.root.after(self.interval, self.drain)
+
+    def post(self, callback, *args, key=None):
+        '''
+        Queues an update; can be called from any thread.
+
+        Args:
+        - callback (callable): Function run in the main loop.
+        - *args: Arguments of the function.
+        - key (str, optional): Updates with the same key are coalesced (only the latest is applied per frame).
+        '''
+        if not self.closed:
+            self.queue.put((key, callback, args))
+
+    def drain(self):
+        ''' Applies the queued updates and schedules the next frame (runs in the main loop). '''
+        self.poll_job = None
+        if self.closed:
+            return
+        updates = []
+        while True:
+            try:
+                updates.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Coalesce: only the last update per key, the order of all updates is kept
+        last_index = {key: index for index, (key, _, _) in enumerate(updates) if key is not None}
+        for index, (key, callback, args) in enumerate(updates):
+            if key is None or last_index[key] == index:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    output_terminal(f"Error #194: UI update '{getattr(callback, '__name__', callback)}' failed - {e}", "bg_red")
+
+        if not self.closed:
+            self.poll_job = self.root.after(self.interval, self.drain)
+
+    def close(self):
+        ''' Stops applying updates (e.g. when the window is closed; runs in the main loop). '''
+        self.closed = True
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
@@ -0,0 +1,460 @@
+import argparse # Command line options
+import concurrent.futures # Regenerate tests in the background
+import ctypes # Access the Linux 'inotify' API
+import ctypes.util # Find the C library
+import hashlib # Detect saves without changes
+import os # File handling and folder operations
+import select # Wait for 'inotify' events with a timeout
+import struct # Parse 'inotify' events
+import sys # Platform check
+import threading # Cancel running generations
+import time # Debouncing
+from datetime import datetime # For timestamps in logs
+from core import TestGenerator # Import the test generation logic
+from headless import HeadlessApp, load_prompt # Run without the GUI
+from helpers import output_terminal # Print colored messages to the terminal
+from merge_tests import save_snapshot # Source the regenerated tests are up to date with
+from source_selection import SourceSelector # Decide which files are sent to the model
+
+# inotify flags (see 'man 7 inotify')
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII") # Watch descriptor, mask, cookie, name length
+
+def file_hash(path):
+    ''' Returns the hash of a file's text (None if it cannot be read). '''
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            return hashlib.sha256(file.read().encode("utf-8")).hexdigest()
+    except OSError:
+        return None
+
+class InotifyWatcher:
+    '''
+    Reports changes in the watched folders through the Linux 'inotify' API (no polling).
+
+    'read()' returns (path, kind) events; kind is 'file' (a file was written or moved in),
+    'folder' (a folder was created or moved in), 'deleted' or 'overflow' (events were lost).
+    '''
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.folders = {} # Watch descriptor -> folder
+
+    def add_folder(self, folder_path):
+        ''' Watches a folder (not its subfolders). '''
+        watch_descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(folder_path), WATCH_MASK)
+        if watch_descriptor < 0:
+            output_terminal(f"Warning #150-Cannot watch {folder_path}: {os.strerror(ctypes.get_errno())}", "bg_yellow")
+            return
+        self.folders[watch_descriptor] = folder_path
+
+    def add_file(self, file_path):
+        ''' Files are reported through their folder. '''
+
+    def read(self, timeout):
+        ''' Waits up to 'timeout' seconds and returns the events. '''
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            watch_descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append((None, "overflow"))
+                continue
+            if mask & IN_IGNORED: # Folder was deleted or unmounted
+                self.folders.pop(watch_descriptor, None)
+                continue
+            folder = self.folders.get(watch_descriptor)
+            if folder is None or not name:
+                continue
+
+            path = os.path.join(folder, os.fsdecode(name))
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append((path, "deleted"))
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    events.append((path, "folder"))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO): # A created file is reported when it is closed
+                events.append((path, "file"))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    '''
+    Reports changes by comparing modification times (fallback without 'inotify').
+
+    Only the known files and folders are checked with 'os.stat()'; a folder is only
+    listed again when its own modification time changed (a file or folder was added).
+    Returns the same events as 'InotifyWatcher'.
+    '''
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.files = {} # File -> (modification time, size)
+        self.folders = {} # Folder -> modification time
+        self.last_poll = time.monotonic()
+
+    def signature(self, path):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def add_folder(self, folder_path):
+        signature = self.signature(folder_path)
+        if signature:
+            self.folders[folder_path] = signature[0]
+
+    def add_file(self, file_path):
+        signature = self.signature(file_path)
+        if signature:
+            self.files[file_path] = signature
+
+    def read(self, timeout):
+        ''' Waits up to 'timeout' seconds (until the next poll) and returns the events. '''
+        remaining = self.interval - (time.monotonic() - self.last_poll)
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            if remaining > timeout:
+                return []
+        self.last_poll = time.monotonic()
+
+        events = []
+        for folder, modified in list(self.folders.items()):
+            signature = self.signature(folder)
+            if signature is None:
+                del self.folders[folder]
+            elif signature[0] != modified:
+                self.folders[folder] = signature[0]
+                try:
+                    with os.scandir(folder) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False) and entry.path not in self.folders:
+                                events.append((entry.path, "folder"))
+                            elif entry.name.endswith(".py") and entry.path not in self.files:
+                                self.add_file(entry.path)
+                                events.append((entry.path, "file"))
+                except OSError:
+                    pass
+
+        for path, known in list(self.files.items()):
+            signature = self.signature(path)
+            if signature is None:
+                del self.files[path]
+                events.append((path, "deleted"))
+            elif signature != known:
+                self.files[path] = signature
+                events.append((path, "file"))
+        return events
+
+    def close(self):
+        pass
+
+class WatchSession:
+    '''
+    Regenerates unit tests in the background while the sources are edited.
+
+    This class:
+    - Discovers the files once with 'TestGenerator.get_python_files()' and then only reacts to events.
+    - Debounces saves; a file is regenerated when it did not change for 'debounce' seconds
+      and its content differs from the one the tests were generated for.
+    - Cancels the running generation of a file when the file changes again.
+    - Keeps the model loaded between events ('keep_alive' & a periodic warm-up request).
+    '''
+    def __init__(self, test_generator, model_name, prompt_text, folder_path, excluded_folder_path=None,
+                 debounce=0.5, max_workers=2, use_inotify=True, poll_interval=1.0, create_log=True, warm_interval=600):
+        '''
+        Initializes the WatchSession class.
+
+        Args:
+        - test_generator (TestGenerator): Generator used for the tests (its 'gui' provides the settings).
+        - model_name (str): The AI model used.
+        - prompt_text (str): Prompt for the test generation.
+        - folder_path (str): Folder to watch.
+        - excluded_folder_path (str, optional): Subfolder to skip.
+        - debounce (float): Seconds without changes before a file is regenerated.
+        - max_workers (int): Number of parallel generations.
+        - use_inotify (bool): Use 'inotify' where available (otherwise polling).
+        - poll_interval (float): Seconds between two polls.
+        - create_log (bool): Write the regenerations to the log file.
+        - warm_interval (float): Seconds without requests before the model is loaded again.
+        '''
+        self.test_generator = test_generator
+        self.model_name = model_name
+        self.prompt_text = prompt_text
+        self.folder_path = folder_path
+        self.excluded_folder_path = excluded_folder_path
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.poll_interval = poll_interval
+        self.create_log = create_log
+        self.warm_interval = warm_interval
+
+        self.tests_folder = os.path.join(folder_path, "Tests")
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self.lock = threading.RLock()
+        self.stop_event = threading.Event()
+        self.watcher = None
+        self.log_file = None
+
+        self.pending = {} # File -> time of the last change
+        self.hashes = {} # File -> hash of the content the tests are up to date with
+        self.running = {} # File -> (future, cancel event, content hash)
+        self.last_request = 0.0
+        self.warm_future = None # Running warm-up request
+        self.generated = 0
+        self.cancelled = 0
+
+    def start(self):
+        ''' Discovers the files, starts watching and loads the model. '''
+        os.makedirs(self.tests_folder, exist_ok=True)
+        py_files = self.test_generator.get_python_files(self.folder_path, self.excluded_folder_path) or []
+
+        try:
+            self.watcher = InotifyWatcher() if self.use_inotify else PollingWatcher(self.poll_interval)
+        except OSError:
+            self.watcher = PollingWatcher(self.poll_interval)
+        for folder in list(self.test_generator.scanned_folders):
+            self.watcher.add_folder(folder)
+        for file in py_files:
+            self.hashes[file] = file_hash(file)
+            self.watcher.add_file(file)
+
+        if self.create_log:
+            log_file_path = os.path.join(self.tests_folder, f"unit_test_log_file-{self.test_generator.format_model_name(self.model_name)}.log")
+            self.log_file = open(log_file_path, "a", encoding="utf-8")
+            self.log_file.write(f"\n--- Watch Mode Started ---\nModel: {self.model_name}\nDate: {datetime.now().strftime('%Y-%m-%d')}\n")
+            self.log_file.write(f"Start Time: {datetime.now().strftime('%H:%M:%S')}\nFolder: {self.folder_path}\n\n")
+            self.log_file.flush()
+
+        output_terminal(f"Info #150: Watching {len(self.test_generator.scanned_folders)} folders with {type(self.watcher).__name__} (Ctrl+C to stop).", "blue")
+        self.warm_up()
+
+    def warm_up(self):
+        '''
+        Loads the model (empty request), so the next regeneration does not wait for the model load.
+
+        The request runs in the thread pool, so file events are still handled while the model loads.
+        '''
+        self.last_request = time.monotonic()
+        generate = getattr(self.test_generator.model_client, "generate", None)
+        if generate is None or (self.warm_future and not self.warm_future.done()):
+            return
+        self.warm_future = self.executor.submit(self.load_model, generate)
+
+    def load_model(self, generate):
+        ''' Sends the empty request loading the model (runs in the thread pool). '''
+        try:
+            generate(model=self.model_name, prompt="", keep_alive=self.test_generator.keep_alive)
+        except Exception as e:
+            output_terminal(f"Warning #151-Could not load the model: {e}", "bg_yellow")
+
+    def run(self):
+        ''' Handles events until 'stop()' is called or Ctrl+C is pressed. '''
+        try:
+            while not self.stop_event.is_set():
+                for path, kind in self.watcher.read(timeout=min(self.debounce, 0.2)):
+                    self.handle_event(path, kind)
+                self.dispatch_ready()
+                if not self.running and time.monotonic() - self.last_request > self.warm_interval:
+                    self.warm_up()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def handle_event(self, path, kind):
+        ''' Marks changed files for regeneration (debounced) and watches new folders. '''
+        now = time.monotonic()
+        if kind == "overflow": # Events were lost, check all known files
+            with self.lock:
+                files = list(self.hashes)
+            for file in files:
+                self.pending[file] = now
+        elif kind == "folder":
+            self.add_folder(path)
+        elif kind == "deleted":
+            self.pending.pop(path, None)
+            with self.lock:
+                self.hashes.pop(path, None)
+            self.cancel(path)
+            self.test_generator.scanned_folders.pop(path, None)
+        elif path.endswith(".py"):
+            self.pending[path] = now
+
+    def add_folder(self, folder_path):
+        ''' Watches a new folder (if the selection rules allow it) and queues its Python files. '''
+        context = self.test_generator.scanned_folders.get(os.path.dirname(folder_path))
+        if context is None or folder_path in self.test_generator.scanned_folders:
+            return
+        parent_rel_path, rules = context
+        name = os.path.basename(folder_path)
+        rel_path = f"{parent_rel_path}/{name}" if parent_rel_path else name
+        selector = self.test_generator.source_selector
+        if selector.skip_folder(folder_path, name, rel_path, rules):
+            return
+
+        try:
+            with os.scandir(folder_path) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return
+        self.test_generator.scanned_folders[folder_path] = (rel_path, selector.folder_rules(folder_path, rel_path, {entry.name for entry in entries}, rules))
+        self.watcher.add_folder(folder_path)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self.add_folder(entry.path)
+            elif entry.name.endswith(".py"):
+                self.watcher.add_file(entry.path)
+                self.pending[entry.path] = time.monotonic()
+
+    def dispatch_ready(self):
+        ''' Schedules the files that did not change for 'debounce' seconds. '''
+        now = time.monotonic()
+        for path, changed in list(self.pending.items()):
+            if now - changed >= self.debounce:
+                del self.pending[path]
+                self.schedule(path)
+
+    def schedule(self, path):
+        ''' Queues the regeneration of a file, cancelling a running generation for older content. '''
+        context = self.test_generator.scanned_folders.get(os.path.dirname(path))
+        if context is None or not os.path.isfile(path):
+            return
+        rel_folder, rules = context
+        name = os.path.basename(path)
+        selector = self.test_generator.source_selector
+        reason = selector.skip_file(name, f"{rel_folder}/{name}" if rel_folder else name, rules) or selector.skip_content(path)
+        if reason:
+            output_terminal(f"Info #152: Skipped {path} ({reason})", "blue")
+            return
+
+        content_hash = file_hash(path)
+        with self.lock:
+            running = self.running.get(path)
+            if running and running[2] == content_hash:
+                return # Already generating for this content
+            if running:
+                self.cancel(path)
+            if content_hash == self.hashes.get(path):
+                return # Saved without changes
+            cancel_event = threading.Event()
+            future = self.executor.submit(self.regenerate, path, content_hash, cancel_event)
+            self.running[path] = (future, cancel_event, content_hash)
+
+    def cancel(self, path):
+        ''' Cancels the queued or running generation of a file. '''
+        with self.lock:
+            running = self.running.pop(path, None)
+        if running:
+            running[1].set()
+            running[0].cancel()
+            self.cancelled += 1
+
+    def regenerate(self, path, content_hash, cancel_event):
+        ''' Generates & saves the tests of one file (runs in the thread pool). '''
+        try:
+            prompt_text = self.test_generator.prompt_for_file(self.prompt_text, path)
+            test_code, generated_output, code_text = self.test_generator.generate_test_for_file(self.model_name, prompt_text, path, cancel_event)
+            if cancel_event.is_set():
+                return
+            if test_code is None:
+                output_terminal(f"Error #150: Failed to regenerate test for {path}", "bg_red")
+                self.write_log(f"ERROR: generating test for {path}")
+                return
+
+            test_filename = self.test_generator.save_files(path, self.model_name, self.tests_folder, prompt_text, code_text, generated_output)
+            with open(test_filename, "w", encoding="utf-8") as test_file:
+                test_file.write(test_code)
+            save_snapshot(self.tests_folder, path, code_text)
+
+            with self.lock:
+                self.hashes[path] = content_hash
+                self.generated += 1
+            self.write_log(f"✔ Completed: {path} at {datetime.now().strftime('%H:%M:%S')}")
+            output_terminal(f"Info #153: Tests regenerated for {path}", "yellow")
+        finally:
+            self.last_request = time.monotonic()
+            with self.lock:
+                if path in self.running and self.running[path][1] is cancel_event:
+                    del self.running[path]
+
+    def write_log(self, line):
+        with self.lock:
+            if self.log_file:
+                self.log_file.write(line + "\n")
+                self.log_file.flush()
+
+    def close(self):
+        ''' Cancels running generations, stops watching and closes the log. '''
+        for path in list(self.running):
+            self.cancel(path)
+        self.executor.shutdown(wait=True)
+        if self.watcher:
+            self.watcher.close()
+        if self.log_file:
+            self.log_file.write(f"\n--- Watch Mode Stopped ---\nEnd Time: {datetime.now().strftime('%H:%M:%S')}\n")
+            self.log_file.write(f"Regenerated: {self.generated}, Cancelled: {self.cancelled}\n\n")
+            self.log_file.close()
+            self.log_file = None
+        output_terminal(f"Info #154: Watch mode stopped ({self.generated} regenerated, {self.cancelled} cancelled).", "blue")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate unit tests in the background when sources change.")
+    parser.add_argument("--folder", required=True, help="Folder with the Python files")
+    parser.add_argument("--model", required=True, help="Ollama model name")
+    parser.add_argument("--prompt-file", default=None, help="Prompt file (default: prompt.{txt,md,doc} in the folder)")
+    parser.add_argument("--exclude", action="append", default=[], help="Subfolder to skip (repeatable)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of parallel generations")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Seconds without changes before a file is regenerated")
+    parser.add_argument("--poll", action="store_true", help="Use polling instead of inotify")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between two polls")
+    parser.add_argument("--keep-alive", default="30m", help="How long Ollama keeps the model loaded, e.g. '30m'")
+    parser.add_argument("--no-markdown", action="store_true", help="Do not save the raw AI response")
+    parser.add_argument("--no-log", action="store_true", help="Do not write a log file")
+    args = parser.parse_args()
+
+    prompt = load_prompt(args.folder, args.prompt_file)
+    if prompt is None:
+        output_terminal("Error #2-No prompt selected.", "bg_red")
+        raise SystemExit(2)
+
+    app = HeadlessApp(args.folder, prompt, save_raw=not args.no_markdown, create_log=not args.no_log, quiet=True)
+    test_generator = TestGenerator(app)
+    test_generator.keep_alive = args.keep_alive
+    test_generator.source_selector = SourceSelector(excluded_folders=args.exclude)
+
+    session = WatchSession(
+        test_generator, args.model, prompt, args.folder, debounce=args.debounce, max_workers=args.workers,
+        use_inotify=not args.poll, poll_interval=args.poll_interval, create_log=not args.no_log,
+    )
+    session.start()
+    session.run()